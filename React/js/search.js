@@ -12,22 +12,28 @@ if (!grid) {
   searchNews(keyword.trim());
 }
 
-async function searchNews(keyword) {
+// 한 번에 보여줄 검색 결과 수 (다음 페이지는 next_cursor로 이어서 요청)
+const PAGE_SIZE = 20;
+
+async function searchNews(keyword, cursor = null) {
   const API_BASE = "https://ainewsapi.duckdns.org";
 
   try {
-    const res = await fetch(`${API_BASE}/search?q=${encodeURIComponent(keyword)}`);
+    let url = `${API_BASE}/search?q=${encodeURIComponent(keyword)}&limit=${PAGE_SIZE}`;
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+
+    const res = await fetch(url);
     if (!res.ok) throw new Error(`검색 API 오류: ${res.status}`);
 
     const data = await res.json();
     const articles = Array.isArray(data?.results) ? data.results : [];
 
-    if (articles.length === 0) {
+    if (!cursor && articles.length === 0) {
       grid.innerHTML = "<p>검색 결과가 없습니다.</p>";
       return;
     }
 
-    grid.innerHTML = "";
+    if (!cursor) grid.innerHTML = "";
 
     const canUseCard = typeof window.createNewsCard === "function";
 
@@ -63,10 +69,62 @@ async function searchNews(keyword) {
         grid.appendChild(div);
       }
     });
+
+    renderMoreError(false);
+    renderMoreButton(keyword, data?.next_cursor);
   } catch (err) {
     console.error("검색 실패:", err);
-    grid.innerHTML = "<p>검색 중 오류가 발생했습니다.</p>";
+    if (!cursor) {
+      grid.innerHTML = "<p>검색 중 오류가 발생했습니다.</p>";
+      return;
+    }
+    // 다음 페이지 실패: 이미 보여준 결과는 그대로 두고 아래에 오류만 표시, "더 보기"로 다시 시도
+    renderMoreError(true);
+    renderMoreButton(keyword, cursor);
+  }
+}
+
+// 다음 페이지 오류 문구: 결과 목록 바로 아래 ("더 보기" 버튼 위)
+function renderMoreError(show) {
+  let note = document.getElementById("searchMoreError");
+
+  if (!show) {
+    if (note) note.remove();
+    return;
   }
+
+  if (!note) {
+    note = document.createElement("p");
+    note.id = "searchMoreError";
+    note.className = "search-more-error";
+    note.textContent = "다음 결과를 불러오지 못했습니다. 다시 시도해 주세요.";
+    grid.insertAdjacentElement("afterend", note);
+  }
+}
+
+// "더 보기" 버튼: 다음 페이지가 있을 때만 결과 목록 아래에 표시
+function renderMoreButton(keyword, nextCursor) {
+  let btn = document.getElementById("searchMoreBtn");
+
+  if (!nextCursor) {
+    if (btn) btn.remove();
+    return;
+  }
+
+  if (!btn) {
+    btn = document.createElement("button");
+    btn.id = "searchMoreBtn";
+    btn.type = "button";
+    btn.className = "search-more-btn";
+    btn.textContent = "더 보기";
+    (document.getElementById("searchMoreError") || grid).insertAdjacentElement("afterend", btn);
+  }
+
+  btn.disabled = false;
+  btn.onclick = () => {
+    btn.disabled = true;
+    searchNews(keyword, nextCursor);
+  };
 }
 
 function escapeHtml(s) {
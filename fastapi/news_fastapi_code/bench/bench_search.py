@@ -0,0 +1,207 @@
+# bench_search.py
+# /search 쿼리 before/after 벤치마크 (LIKE 전체 스캔 vs FULLTEXT ngram)
+# - 별도 벤치 DB(BENCH_DB_NAME)에 news_articles / news_ai_meta를 만들고 가짜 기사 N개 시드
+# - LIKE(SEARCH_SQL) 측정 → sql/005 인덱스 생성(이미 있으면 건너뜀) → FULLTEXT(FULLTEXT_SEARCH_SQL) 측정
+# - 검색어별 p50/p95, 결과 수, 전체 매칭 집합이 LIKE와 같은지 출력
+# ※ 운영 DB가 아니라 벤치 전용 DB에 만듦 (DB_HOST/DB_USER/DB_PASSWORD 는 .env 와 같이 사용)
+#
+# 실행: python fastapi/news_fastapi_code/bench/bench_search.py --rows 50000 --repeat 20
+import os
+import sys
+import time
+import re
+import random
+import argparse
+
+import pymysql
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+BENCH_DB = os.getenv("BENCH_DB_NAME", "news_search_bench")
+_BIND_RE = re.compile(r":(\w+)")
+_FT_INDEX_RE = re.compile(r"ALTER TABLE (\w+)\s+ADD FULLTEXT INDEX (\w+)", re.IGNORECASE)
+
+WORDS = [
+    "인공지능", "오픈AI", "엔비디아", "반도체", "생성형", "모델", "데이터센터", "로봇", "자율주행", "클라우드",
+    "스타트업", "투자", "규제", "정부", "플랫폼", "검색", "에이전트", "추론", "학습", "칩",
+    "삼성전자", "네이버", "카카오", "구글", "메타", "마이크로소프트", "애플", "LLM", "GPU", "API",
+    "발표", "공개", "출시", "협력", "계약", "연구", "성능", "서비스", "시장", "전망",
+]
+QUERIES = ["인공지능", "엔비디아 반도체", "자율주행", "LLM", "AI", "데이터센터", "에이전트", "없는검색어", "칩"]
+
+
+def connect(database=None):
+    return pymysql.connect(
+        host=os.getenv("DB_HOST"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=database,
+        charset="utf8mb4",
+        autocommit=True,
+    )
+
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def seed(conn, rows: int):
+    rng = random.Random(42)
+    cur = conn.cursor()
+    cur.execute("DROP TABLE IF EXISTS news_ai_meta")
+    cur.execute("DROP TABLE IF EXISTS news_articles")
+    cur.execute("""
+        CREATE TABLE news_articles (
+          id BIGINT PRIMARY KEY AUTO_INCREMENT,
+          url VARCHAR(500) NOT NULL,
+          title VARCHAR(500) NOT NULL,
+          category VARCHAR(100),
+          article_date DATETIME,
+          is_summarized TINYINT NOT NULL DEFAULT 1
+        ) DEFAULT CHARSET=utf8mb4
+    """)
+    cur.execute("""
+        CREATE TABLE news_ai_meta (
+          id BIGINT PRIMARY KEY AUTO_INCREMENT,
+          article_id BIGINT NOT NULL,
+          summary TEXT,
+          topic VARCHAR(100),
+          keywords VARCHAR(500),
+          created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+          UNIQUE KEY uq_news_ai_meta_article_id (article_id)
+        ) DEFAULT CHARSET=utf8mb4
+    """)
+
+    batch = 1000
+    for start in range(0, rows, batch):
+        n = min(batch, rows - start)
+        articles = [
+            (f"https://bench/{start + i}", sentence(rng, 6), "AI", f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+            for i in range(n)
+        ]
+        cur.executemany(
+            "INSERT INTO news_articles (url, title, category, article_date) VALUES (%s, %s, %s, %s)",
+            articles
+        )
+        first_id = cur.lastrowid
+        metas = [
+            (first_id + i, sentence(rng, 60), "AI", ", ".join(rng.sample(WORDS, 5)))
+            for i in range(n)
+        ]
+        cur.executemany(
+            "INSERT INTO news_ai_meta (article_id, summary, topic, keywords) VALUES (%s, %s, %s, %s)",
+            metas
+        )
+    cur.close()
+
+
+def create_fulltext_indexes(conn):
+    """
+    sql/005 실행 (불용어 OFF 포함), 이미 있는 인덱스의 ALTER는 건너뜀 → --skip-seed로 다시 돌려도 됨
+    """
+    path = os.path.join(HERE, "..", "..", "..", "sql", "005_search_fulltext_ngram.sql")
+    with open(path, encoding="utf-8") as f:
+        statements = [s.strip() for s in f.read().split(";")]
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT table_name, index_name FROM information_schema.statistics WHERE table_schema = DATABASE()"
+    )
+    existing = {(t.lower(), i.lower()) for t, i in cur.fetchall()}
+    for stmt in statements:
+        sql = "\n".join(l for l in stmt.splitlines() if not l.strip().startswith("--")).strip()
+        if not sql:
+            continue
+        m = _FT_INDEX_RE.search(sql)
+        if m and (m.group(1).lower(), m.group(2).lower()) in existing:
+            print(f"  인덱스 이미 있음: {m.group(1)}.{m.group(2)}")
+            continue
+        cur.execute(sql)
+    cur.close()
+
+
+def to_pymysql(sql: str) -> str:
+    # sqlalchemy :name → pymysql %(name)s
+    return _BIND_RE.sub(r"%(\1)s", sql)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def measure(conn, sql, params, repeat):
+    cur = conn.cursor()
+    times = []
+    count = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        cur.execute(sql, params)
+        count = len(cur.fetchall())
+        times.append(time.perf_counter() - t0)
+    cur.close()
+    return percentile(times, 50) * 1000, percentile(times, 95) * 1000, count
+
+
+def matched_ids(conn, sql, params) -> set:
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    ids = {row[0] for row in cur.fetchall()}
+    cur.close()
+    return ids
+
+
+def run(rows, repeat, skip_seed):
+    # crud의 SQL을 그대로 사용 (첫 페이지 100건)
+    from crud import SEARCH_LIMIT, _search_sql
+
+    def query_for(q, mode, limit=SEARCH_LIMIT):
+        sql, params, used = _search_sql(q, mode, limit)
+        return to_pymysql(sql), params, used
+
+    admin = connect()
+    admin.cursor().execute(f"CREATE DATABASE IF NOT EXISTS `{BENCH_DB}` DEFAULT CHARSET utf8mb4")
+    admin.close()
+
+    conn = connect(BENCH_DB)
+    if not skip_seed:
+        t0 = time.perf_counter()
+        seed(conn, rows)
+        print(f"시드 완료: {rows}개 ({time.perf_counter() - t0:.1f}s)")
+
+    before = {q: measure(conn, *query_for(q, "like")[:2], repeat) for q in QUERIES}
+
+    t0 = time.perf_counter()
+    create_fulltext_indexes(conn)
+    print(f"FULLTEXT 인덱스 생성: {time.perf_counter() - t0:.1f}s")
+
+    after = {}
+    same = {}
+    for q in QUERIES:
+        sql, params, used = query_for(q, "fulltext")
+        after[q] = measure(conn, sql, params, repeat) + (used,)
+        # 순위는 다르므로(관련도순) 전체 매칭 기사 집합으로 비교
+        like_ids = matched_ids(conn, *query_for(q, "like", rows)[:2])
+        ft_ids = matched_ids(conn, *query_for(q, "fulltext", rows)[:2])
+        same[q] = "yes" if like_ids == ft_ids else f"no (LIKE {len(like_ids)} / FT {len(ft_ids)})"
+    conn.close()
+
+    print("\n" + "=" * 100)
+    print(f"{'query':<16}{'LIKE p50':>10}{'p95':>9}{'rows':>6}   {'FULLTEXT p50':>13}{'p95':>9}{'rows':>6}  "
+          f"{'path':<9}same set")
+    for q in QUERIES:
+        b, a = before[q], after[q]
+        print(f"{q:<16}{b[0]:>9.1f}ms{b[1]:>7.1f}ms{b[2]:>6}   {a[0]:>12.1f}ms{a[1]:>7.1f}ms{a[2]:>6}  "
+              f"{a[3]:<9}{same[q]}")
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50000)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--skip-seed", action="store_true", help="이미 시드된 벤치 DB 재사용 (없는 인덱스만 만듦)")
+    args = ap.parse_args()
+    run(args.rows, args.repeat, args.skip_seed)
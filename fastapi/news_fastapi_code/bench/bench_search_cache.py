@@ -0,0 +1,77 @@
+# bench_search_cache.py
+# 검색 결과 캐시(search_cache.py) 벤치마크 (DB 없이 실행)
+# - 인기 검색어 쏠림(Zipf) 요청 N개, 검색 1번 = --search-ms 만큼 걸리는 가짜 DB 검색
+# - 요청 중간중간 새 요약 추가(데이터 버전 증가) → 무효화 포함 히트율 / 평균 응답 시간 비교
+# - 인스턴스 2개가 FakeSharedCache를 공유하는 경우도 같이 측정
+#
+# 실행: python fastapi/news_fastapi_code/bench/bench_search_cache.py --requests 5000 --search-ms 20
+import os
+import sys
+import time
+import random
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_search import WORDS  # noqa: E402
+from search_cache import SearchCache, DataVersion, FakeSharedCache  # noqa: E402
+
+
+def zipf_queries(n, rng):
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    return rng.choices(WORDS, weights=weights, k=n)
+
+
+def run(mode, queries, search_ms, new_summary_every):
+    version = [0]
+    searches = [0]
+
+    def fake_search(q):
+        searches[0] += 1
+        time.sleep(search_ms / 1000)
+        return f'{{"query": "{q}", "version": {version[0]}}}'.encode("utf-8")
+
+    if mode == "none":
+        caches = None
+    else:
+        shared = FakeSharedCache() if mode == "shared" else None
+        # version TTL 0 → 버전 증가가 바로 반영되는 최악 조건
+        caches = [SearchCache(DataVersion(lambda: version[0], ttl=0), shared=shared, ttl=300)
+                  for _ in range(2 if mode == "shared" else 1)]
+
+    t0 = time.perf_counter()
+    for i, q in enumerate(queries):
+        if new_summary_every and i and i % new_summary_every == 0:
+            version[0] += 1
+        if caches is None:
+            fake_search(q)
+        else:
+            # shared 모드: 요청을 두 인스턴스에 번갈아 배분
+            cache = caches[i % len(caches)]
+            cache.get_or_build(q, "index", lambda: fake_search(q))
+    elapsed = time.perf_counter() - t0
+
+    result = {
+        "mode": mode,
+        "requests": len(queries),
+        "db_searches": searches[0],
+        "avg_ms": round(elapsed / len(queries) * 1000, 3),
+    }
+    if caches:
+        hits = sum(c.stats()["hits"] + c.stats()["shared_hits"] for c in caches)
+        result["hit_rate"] = round(hits / len(queries), 3)
+    return result
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=5000)
+    ap.add_argument("--search-ms", type=float, default=20)
+    ap.add_argument("--new-summary-every", type=int, default=500, help="요청 N개마다 새 요약 1건 (0=없음)")
+    args = ap.parse_args()
+
+    queries = zipf_queries(args.requests, random.Random(7))
+    for mode in ("none", "local", "shared"):
+        print(run(mode, queries, args.search_ms, args.new_summary_every))
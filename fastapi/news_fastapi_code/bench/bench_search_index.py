@@ -0,0 +1,107 @@
+# bench_search_index.py
+# 메모리 역색인(search_index.py) 벤치마크 (DB 없이 실행)
+# - bench_search.py와 같은 방식으로 가짜 기사 N개 생성 → 색인 생성 시간 / posting 크기
+# - 검색어별 색인 검색 p50/p95 vs 같은 데이터를 파이썬으로 전체 LIKE 스캔 (DB 전체 스캔 대신 비교용)
+# - 색인 결과(부분 문자열 검증 후)가 LIKE 스캔 결과와 같은지도 확인
+#
+# 실행: python fastapi/news_fastapi_code/bench/bench_search_index.py --rows 50000 --repeat 20
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_search import WORDS, QUERIES, sentence, percentile  # noqa: E402
+from search_index import InvertedIndex, load_new_rows, query_terms  # noqa: E402
+
+
+def make_rows(n: int) -> list:
+    rng = random.Random(42)
+    base = datetime(2025, 1, 1)
+    return [
+        {
+            "meta_id": i + 1,
+            "article_id": i + 1,
+            "title": sentence(rng, 6),
+            "article_date": base + timedelta(minutes=rng.randint(0, 500000)),
+            "summary": sentence(rng, 60),
+            "keywords": ", ".join(rng.sample(WORDS, 5)),
+        }
+        for i in range(n)
+    ]
+
+
+def like_scan(rows, q, limit=100):
+    # SEARCH_SQL 과 같은 조건 / 정렬 (article_date DESC, id DESC)
+    q = q.lower()
+    hits = [
+        r for r in rows
+        if any(q in (r[k] or "").lower() for k in ("title", "summary", "keywords"))
+    ]
+    hits.sort(key=lambda r: (r["article_date"], r["article_id"]), reverse=True)
+    return [r["article_id"] for r in hits[:limit]]
+
+
+def index_search(idx, by_id, q, limit=100):
+    # crud.search_index 와 같은 흐름 (행 조회 대신 by_id)
+    terms = query_terms(q)
+    ranked = idx.search(terms, limit=limit)
+    out, start = [], 0
+    lq = q.lower()
+    while len(out) < limit and start < len(ranked):
+        for _, _, i in ranked[start:start + limit]:
+            r = by_id[i]
+            if any(lq in (r[k] or "").lower() for k in ("title", "summary", "keywords")):
+                out.append(i)
+        start += limit
+        if start == len(ranked) == limit and len(out) < limit:
+            ranked = idx.search(terms)
+    return out[:limit]
+
+
+def timed(fn, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return percentile(times, 50) * 1000, percentile(times, 95) * 1000, result
+
+
+def run(n, repeat):
+    rows = make_rows(n)
+    by_id = {r["article_id"]: r for r in rows}
+
+    idx = InvertedIndex()
+    t0 = time.perf_counter()
+    load_new_rows(idx, lambda after, limit: rows[after:after + limit])
+    build_sec = time.perf_counter() - t0
+    stats = idx.stats()
+    print(f"색인 생성: {n}건 {build_sec:.2f}s / terms={stats['terms']} "
+          f"postings={stats['postings']} ({stats['posting_bytes'] / 1024 / 1024:.1f} MiB)")
+
+    print("\n" + "=" * 82)
+    print(f"{'query':<16}{'scan p50':>10}{'p95':>9}{'rows':>6}   {'index p50':>10}{'p95':>9}{'rows':>6}  same set")
+    for q in QUERIES:
+        if not query_terms(q):
+            print(f"{q:<16}  (색인 term 없음 → crud에서 DB 검색)")
+            continue
+        s50, s95, scan = timed(lambda: like_scan(rows, q), max(1, repeat // 5))
+        i50, i95, hit = timed(lambda: index_search(idx, by_id, q), repeat)
+        # 순위는 다르므로(제목 우선) 전체 매칭 집합으로 비교
+        same = "yes" if set(like_scan(rows, q, n)) == set(index_search(idx, by_id, q, n)) else "no"
+        print(f"{q:<16}{s50:>8.1f}ms{s95:>7.1f}ms{len(scan):>6}   {i50:>8.2f}ms{i95:>7.2f}ms{len(hit):>6}  {same}")
+    print("=" * 82)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,125 @@
+# load_test_search.py
+# /search 부하 테스트: 동기 엔진(DB_ASYNC=0) vs 비동기 엔진(DB_ASYNC=1)
+# - 로컬 MySQL 8 (예: docker run -d -p 3307:3306 -e MYSQL_ROOT_PASSWORD=bench mysql:8.0)에
+#   bench_search.py 와 같은 가짜 기사를 시드한 벤치 DB(BENCH_DB_NAME) 사용
+#   ※ sql/005의 WITH PARSER ngram은 MySQL 전용 (MariaDB에는 ngram 파서가 없어서 인덱스 생성 실패)
+# - 모드별로 uvicorn을 띄우고 동시 클라이언트 50/200/500 으로 --duration 초 동안 요청
+# - 캐시/메모리 색인은 끄고(SEARCH_CACHE_ENABLED=0, SEARCH_MODE=fulltext) 매 요청 DB를 타게 함
+# - 처리량(req/s), p50/p95, 오류 수 출력
+# ※ 필요 패키지: uvicorn, httpx, aiomysql (비동기 드라이버)
+# ※ 아직 측정 기록 없음: 동기/비동기 p50·p95·처리량 비교는 MySQL 8 환경에서 이 스크립트를 돌려서 확인해야 함
+#
+# 실행: DB_HOST=127.0.0.1 DB_PORT=3307 DB_USER=root DB_PASSWORD=bench \
+#       python fastapi/news_fastapi_code/bench/load_test_search.py --rows 50000 --duration 20
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from bench_search import BENCH_DB, QUERIES, connect, seed, create_fulltext_indexes, percentile  # noqa: E402
+
+CONCURRENCY = (50, 200, 500)
+
+
+def start_app(port: int, db_async: bool, pool_size: int, max_overflow: int):
+    env = dict(
+        os.environ,
+        DB_NAME=BENCH_DB,
+        DB_ASYNC="1" if db_async else "0",
+        DB_POOL_SIZE=str(pool_size),
+        DB_MAX_OVERFLOW=str(max_overflow),
+        SEARCH_MODE="fulltext",
+        SEARCH_CACHE_ENABLED="0",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=APP_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(f"{base_url}/docs", timeout=1)
+            return proc, base_url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn 기동 실패")
+
+
+async def drive(base_url: str, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(seed_no: int):
+            nonlocal errors
+            rng = random.Random(seed_no)
+            while time.monotonic() < stop_at:
+                t0 = time.perf_counter()
+                try:
+                    res = await client.get("/search", params={"q": rng.choice(QUERIES)})
+                    if res.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+
+    return {
+        "clients": concurrency,
+        "requests": len(latencies),
+        "req_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "errors": errors,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50000)
+    ap.add_argument("--skip-seed", action="store_true")
+    ap.add_argument("--duration", type=float, default=20)
+    ap.add_argument("--pool-size", type=int, default=20)
+    ap.add_argument("--max-overflow", type=int, default=20)
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+
+    if not args.skip_seed:
+        admin = connect()
+        admin.cursor().execute(f"CREATE DATABASE IF NOT EXISTS `{BENCH_DB}` DEFAULT CHARSET utf8mb4")
+        admin.close()
+        conn = connect(BENCH_DB)
+        seed(conn, args.rows)
+        create_fulltext_indexes(conn)
+        conn.close()
+        print(f"시드 완료: {args.rows}개")
+
+    for db_async in (False, True):
+        proc, base_url = start_app(args.port, db_async, args.pool_size, args.max_overflow)
+        try:
+            label = "async" if db_async else "sync"
+            for concurrency in CONCURRENCY:
+                result = asyncio.run(drive(base_url, concurrency, args.duration))
+                print({"engine": label, **result})
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
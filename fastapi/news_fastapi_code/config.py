@@ -5,3 +5,39 @@ DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_PORT = int(os.getenv("DB_PORT", 3306))
+
+# 커넥션 풀 (동기/비동기 엔진 공통)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# 1이면 /search가 비동기 엔진(SQLAlchemy asyncio)으로 DB 조회 → 요청 스레드풀을 거치지 않음
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1"
+DB_ASYNC_DRIVER = os.getenv("DB_ASYNC_DRIVER", "aiomysql")  # aiomysql / asyncmy
+
+# 검색 방식: index (메모리 역색인, search_index.py) / fulltext (MATCH ... AGAINST, sql/005 인덱스 필요) / like (기존 전체 스캔)
+# index 모드에서 색인이 아직 준비 안 됐거나 색인으로 못 찾는 검색어(한글 1글자)는 fulltext로 처리
+# fulltext: sql/005 인덱스가 없으면(MATCH 1191 오류) 자동으로 like로 전환 → 마이그레이션 전에도 /search는 동작
+SEARCH_MODE = os.getenv("SEARCH_MODE", "index")
+# ngram_token_size 보다 짧은 단어가 있는 검색어는 FULLTEXT로 못 찾으므로 LIKE 사용
+FULLTEXT_MIN_QUERY_LEN = int(os.getenv("FULLTEXT_MIN_QUERY_LEN", "2"))
+
+# 메모리 역색인 갱신 주기(초) / 한 번에 읽는 행 수 / 늦게 커밋된 행을 잡기 위해 다시 읽는 news_ai_meta.id 범위
+SEARCH_INDEX_REFRESH_SEC = float(os.getenv("SEARCH_INDEX_REFRESH_SEC", "60"))
+SEARCH_INDEX_CHUNK = int(os.getenv("SEARCH_INDEX_CHUNK", "5000"))
+SEARCH_INDEX_OVERLAP = int(os.getenv("SEARCH_INDEX_OVERLAP", "200"))
+# 재요약 반영: news_ai_meta.updated_at(sql/007) 워터마크보다 이 초만큼 앞에서부터 다시 읽음
+SEARCH_INDEX_UPDATE_OVERLAP_SEC = float(os.getenv("SEARCH_INDEX_UPDATE_OVERLAP_SEC", "5"))
+
+# 검색 결과 캐시 (search_cache.py)
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "1") == "1"
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1000"))           # 프로세스 내 LRU 항목 수
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "300"))            # 데이터가 안 바뀌어도 이 시간 지나면 다시 조회
+SEARCH_CACHE_VERSION_TTL = float(os.getenv("SEARCH_CACHE_VERSION_TTL", "2"))  # max(news_ai_meta.id) 확인 주기
+SEARCH_CACHE_BACKEND = os.getenv("SEARCH_CACHE_BACKEND", "local")         # local / redis / fake
+SEARCH_CACHE_REDIS_URL = os.getenv("SEARCH_CACHE_REDIS_URL", "redis://localhost:6379/0")
+SEARCH_CACHE_MAX_AGE = int(os.getenv("SEARCH_CACHE_MAX_AGE", "30"))       # 브라우저/CDN Cache-Control max-age
+
+# /search 페이지네이션 / NDJSON 내보내기 (format=ndjson)
+SEARCH_PAGE_MAX = int(os.getenv("SEARCH_PAGE_MAX", "100"))        # limit 최댓값
+SEARCH_EXPORT_PAGE = int(os.getenv("SEARCH_EXPORT_PAGE", "500"))  # 내보내기 때 DB 한 번에 읽는 행 수
+SEARCH_EXPORT_MAX = int(os.getenv("SEARCH_EXPORT_MAX", "5000"))   # 내보내기 최대 행 수
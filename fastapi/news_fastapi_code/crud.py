@@ -1,7 +1,26 @@
 # crud.py
-from sqlalchemy import text
-from db import engine
+import json
+import base64
 
+from sqlalchemy import text, bindparam
+from sqlalchemy.exc import DBAPIError
+from db import engine, async_engine
+from config import SEARCH_MODE, FULLTEXT_MIN_QUERY_LEN
+from search_index import index, query_terms
+
+SEARCH_LIMIT = 100
+
+
+class CursorError(ValueError):
+    """
+    잘못됐거나 이어갈 수 없는 커서 (API에서 400)
+    """
+
+
+# 커서 페이지네이션: 정렬 키 (sort_rank, sort_date, id) 보다 뒤 순위만
+# - LIKE: article_date DESC, id DESC (sort_rank는 항상 0) → sql/006 인덱스 순서대로 읽다가 limit+1건에서 멈춤
+# - FULLTEXT: relevance DESC, article_date DESC, id DESC
+# - 다음 페이지 유무 확인용으로 limit+1건 조회
 SEARCH_SQL = """
 SELECT
   a.id AS article_id,
@@ -11,7 +30,9 @@ SELECT
   DATE(m.created_at) AS asset_date,
   a.url,
   m.summary,
-  m.keywords
+  m.keywords,
+  0 AS sort_rank,
+  a.article_date AS sort_date
 FROM news_articles a
 JOIN news_ai_meta m ON m.article_id = a.id
 WHERE a.is_summarized = 1
@@ -20,16 +41,430 @@ WHERE a.is_summarized = 1
     OR LOWER(COALESCE(m.summary, '')) LIKE LOWER(:q)
     OR LOWER(COALESCE(m.keywords, '')) LIKE LOWER(:q)
   )
+  {keyset}
 ORDER BY a.article_date DESC, a.id DESC
-LIMIT 100
+LIMIT :limit
+"""
+
+LIKE_KEYSET = "AND (a.article_date < :c_date OR (a.article_date = :c_date AND a.id < :c_id))"
+
+# FULLTEXT(ngram) 검색 (sql/005_search_fulltext_ngram.sql)
+# - 제목 / 요약+키워드 인덱스를 각각 MATCH 해서 UNION ALL → 기사별 점수 합산
+#   (JOIN 뒤에 OR로 묶으면 인덱스를 못 타서 테이블별로 따로 찾음)
+# - 관련도 높은 순, 같으면 최신순
+FULLTEXT_SEARCH_SQL = """
+SELECT
+  a.id AS article_id,
+  a.title,
+  a.category,
+  DATE(a.article_date) AS article_date,
+  DATE(m.created_at) AS asset_date,
+  a.url,
+  m.summary,
+  m.keywords,
+  r.relevance AS sort_rank,
+  a.article_date AS sort_date
+FROM (
+  SELECT hit_id, SUM(score) AS relevance
+  FROM (
+    SELECT t.id AS hit_id, MATCH(t.title) AGAINST (:q IN BOOLEAN MODE) AS score
+    FROM news_articles t
+    WHERE MATCH(t.title) AGAINST (:q IN BOOLEAN MODE)
+    UNION ALL
+    SELECT s.article_id AS hit_id, MATCH(s.summary, s.keywords) AGAINST (:q IN BOOLEAN MODE) AS score
+    FROM news_ai_meta s
+    WHERE MATCH(s.summary, s.keywords) AGAINST (:q IN BOOLEAN MODE)
+  ) hits
+  GROUP BY hit_id
+) r
+JOIN news_articles a ON a.id = r.hit_id
+JOIN news_ai_meta m ON m.article_id = a.id
+WHERE a.is_summarized = 1
+  {keyset}
+ORDER BY r.relevance DESC, a.article_date DESC, a.id DESC
+LIMIT :limit
+"""
+
+FULLTEXT_KEYSET = (
+    "AND (r.relevance < :c_rank OR (r.relevance = :c_rank AND "
+    "(a.article_date < :c_date OR (a.article_date = :c_date AND a.id < :c_id))))"
+)
+
+
+def fulltext_query(query: str) -> str:
+    """
+    검색어 → BOOLEAN MODE 구문 검색어 ("..." 로 감싸서 ngram이 연속으로 나오는 경우만 매칭 = LIKE와 같은 부분 문자열 의미)
+    """
+    return '"' + query.replace('"', " ").strip() + '"'
+
+
+def use_fulltext(query: str, mode: str = None) -> bool:
+    """
+    FULLTEXT로 찾을 수 있는 검색어인지
+    단어마다 ngram 길이 이상이어야 함 ("a b" 처럼 짧은 단어가 하나라도 있으면 그 단어는 ngram이 없어서 못 찾음)
+    """
+    mode = mode or SEARCH_MODE
+    if mode != "fulltext" or not fulltext_available():
+        return False
+    words = query.replace('"', " ").split()
+    return bool(words) and all(len(w) >= FULLTEXT_MIN_QUERY_LEN for w in words)
+
+
+# sql/005 인덱스가 없는 DB(마이그레이션 전)에서는 MATCH가 1191 오류 → 한 번 확인되면 이후 LIKE로
+_ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+_fulltext_state = {"available": True}
+
+
+def fulltext_available() -> bool:
+    return _fulltext_state["available"]
+
+
+def _is_missing_fulltext_index(e: DBAPIError) -> bool:
+    args = getattr(e.orig, "args", None) or (None,)
+    return args[0] == _ER_FT_MATCHING_KEY_NOT_FOUND
+
+
+def _disable_fulltext(e: DBAPIError):
+    _fulltext_state["available"] = False
+    print(f"[Search] ⚠️ FULLTEXT 인덱스 없음 (sql/005 미적용) → LIKE 검색으로 전환: {e.orig}")
+
+
+# =========================
+# 커서
+# =========================
+def encode_cursor(mode: str, key) -> str:
+    """
+    마지막 행의 정렬 키 → 불투명 커서 문자열 (base64url JSON)
+    mode: 키를 만든 검색 경로 (index / fulltext / like) → 다음 페이지도 같은 경로로
+    """
+    raw = json.dumps({"m": mode, "k": list(key)}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    커서 → (mode, 정렬 키), 형식이 틀리면 CursorError
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        mode, key = data["m"], data["k"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise CursorError(f"잘못된 커서: {e}")
+    if mode not in ("index", "fulltext", "like") or not isinstance(key, list) or len(key) != 3:
+        raise CursorError("잘못된 커서")
+    return mode, key
+
+
+def _search_sql(query: str, mode: str, limit: int, after=None):
+    """
+    검색 SQL / 파라미터 / 실제 사용한 경로 (fulltext 모드라도 1글자 단어가 있거나 인덱스가 없으면 like)
+    """
+    if mode == "fulltext" and after is not None and not fulltext_available():
+        # FULLTEXT 정렬 키(관련도)로 만든 커서는 LIKE 순서로 이어갈 수 없음
+        raise CursorError("FULLTEXT 검색을 사용할 수 없어 커서를 이어갈 수 없습니다. 처음부터 다시 검색해 주세요.")
+    if use_fulltext(query, mode):
+        sql, keyset, params, used = FULLTEXT_SEARCH_SQL, FULLTEXT_KEYSET, {"q": fulltext_query(query)}, "fulltext"
+    else:
+        sql, keyset, params, used = SEARCH_SQL, LIKE_KEYSET, {"q": f"%{query}%"}, "like"
+
+    params["limit"] = limit + 1
+    if after is None:
+        keyset = ""
+    else:
+        params.update(c_rank=after[0], c_date=after[1], c_id=after[2])
+    return sql.format(keyset=keyset), params, used
+
+
+def _sql_page(rows, limit: int, used: str):
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(used, (last["sort_rank"], str(last["sort_date"]), last["article_id"]))
+    return list(rows[:limit]), next_cursor
+
+
+# 메모리 역색인(search_index.py) 로드용: news_ai_meta.id 워터마크 이후 요약 완료 기사
+INDEX_ROWS_SQL = """
+SELECT
+  m.id AS meta_id,
+  a.id AS article_id,
+  a.title,
+  a.article_date,
+  m.summary,
+  m.keywords,
+  m.updated_at
+FROM news_ai_meta m
+JOIN news_articles a ON a.id = m.article_id
+WHERE a.is_summarized = 1
+  AND m.id > :after
+ORDER BY m.id
+LIMIT :limit
+"""
+
+# sql/007 적용 전(updated_at 없음, 1054 오류)에는 NULL → 색인 updated_watermark가 없어 재요약 반영(load_updated_rows)은 건너뜀
+INDEX_ROWS_FALLBACK_SQL = """
+SELECT
+  m.id AS meta_id,
+  a.id AS article_id,
+  a.title,
+  a.article_date,
+  m.summary,
+  m.keywords,
+  NULL AS updated_at
+FROM news_ai_meta m
+JOIN news_articles a ON a.id = m.article_id
+WHERE a.is_summarized = 1
+  AND m.id > :after
+ORDER BY m.id
+LIMIT :limit
 """
-def search_articles(query: str):
-    q = f"%{query}%"
+_index_rows_state = {"sql": INDEX_ROWS_SQL}
 
+# 재요약 반영용: (updated_at, id) 워터마크 이후 바뀐 행 (sql/007 인덱스 순서)
+INDEX_UPDATED_ROWS_SQL = """
+SELECT
+  m.id AS meta_id,
+  a.id AS article_id,
+  a.title,
+  a.article_date,
+  m.summary,
+  m.keywords,
+  m.updated_at
+FROM news_ai_meta m
+JOIN news_articles a ON a.id = m.article_id
+WHERE a.is_summarized = 1
+  AND (m.updated_at > :after_at OR (m.updated_at = :after_at AND m.id > :after_id))
+ORDER BY m.updated_at, m.id
+LIMIT :limit
+"""
+
+# 색인 검색 결과 상위 N개만 실제 행 조회
+ARTICLES_BY_IDS_SQL = text("""
+SELECT
+  a.id AS article_id,
+  a.title,
+  a.category,
+  DATE(a.article_date) AS article_date,
+  DATE(m.created_at) AS asset_date,
+  a.url,
+  m.summary,
+  m.keywords
+FROM news_articles a
+JOIN news_ai_meta m ON m.article_id = a.id
+WHERE a.id IN :ids
+  AND a.is_summarized = 1
+""").bindparams(bindparam("ids", expanding=True))
+
+
+def fetch_index_rows(after: int, limit: int):
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                text(_index_rows_state["sql"]),
+                {"after": after, "limit": limit}
+            ).mappings().all()
+    except DBAPIError as e:
+        if _index_rows_state["sql"] == INDEX_ROWS_FALLBACK_SQL or not _is_bad_field(e):
+            raise
+        print(f"[Index] ⚠️ news_ai_meta.updated_at 없음 (sql/007 미적용) → 재요약 반영 없이 색인: {e.orig}")
+        _index_rows_state["sql"] = INDEX_ROWS_FALLBACK_SQL
+        return fetch_index_rows(after, limit)
+
+
+def fetch_updated_index_rows(after_at, after_id: int, limit: int):
     with engine.connect() as conn:
-        rows = conn.execute(
-            text(SEARCH_SQL),
-            {"q": q}
+        return conn.execute(
+            text(INDEX_UPDATED_ROWS_SQL),
+            {"after_at": after_at, "after_id": after_id, "limit": limit}
         ).mappings().all()
 
-    return rows
\ No newline at end of file
+
+def fetch_articles_by_ids(ids) -> list:
+    """
+    기사 id 목록 → 행 목록 (ids 순서 유지)
+    """
+    if not ids:
+        return []
+    with engine.connect() as conn:
+        rows = conn.execute(ARTICLES_BY_IDS_SQL, {"ids": list(ids)}).mappings().all()
+    by_id = {row["article_id"]: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def _matches(row, query: str) -> bool:
+    # SEARCH_SQL 의 LOWER(...) LIKE LOWER('%q%') 와 같은 조건
+    q = query.lower()
+    return any(q in (row[k] or "").lower() for k in ("title", "summary", "keywords"))
+
+
+def _index_usable(query: str, after_mode: str) -> bool:
+    if after_mode == "index" and not index.ready:
+        # 색인 커서는 색인으로만 이어갈 수 있음 (재시작 직후 색인 로드 전 등)
+        raise CursorError("검색 색인 준비 중이라 커서를 이어갈 수 없습니다. 처음부터 다시 검색해 주세요.")
+    return index.ready and bool(query_terms(query))
+
+
+def _index_page(results, limit: int):
+    page = results[:limit]
+    next_cursor = encode_cursor("index", page[-1][1]) if len(results) > limit else None
+    return [row for row, _ in page], next_cursor
+
+
+def search_index(query: str, limit: int = SEARCH_LIMIT, after=None):
+    """
+    메모리 역색인으로 한 페이지 검색 → (행 목록, next_cursor)
+    bigram 교집합은 부분 문자열보다 넓게 잡힐 수 있어서 조회한 행을 LIKE 조건으로 다시 거르고,
+    모자라면 다음 순위 id를 이어서 조회
+    """
+    terms = query_terms(query)
+    want = limit + 1
+    keys = index.search(terms, limit=want, after=after)
+    results = []
+    start = 0
+    while len(results) < want and start < len(keys):
+        chunk = keys[start:start + want]
+        key_by_id = {k[2]: k for k in chunk}
+        rows = fetch_articles_by_ids([k[2] for k in chunk])
+        results.extend((row, key_by_id[row["article_id"]]) for row in rows if _matches(row, query))
+        start += want
+        if start == len(keys) == want and len(results) < want:
+            # 처음엔 상위 limit+1개만 뽑았으므로 나머지 순위가 필요할 때만 전체 정렬
+            keys = index.search(terms, after=after)
+    return _index_page(results, limit)
+
+
+# 검색 결과 캐시용 데이터 버전 (PK / sql/007 인덱스 끝값이라 인덱스만 읽음)
+# - MAX(id): 새 요약 / MAX(updated_at): 재요약(id 그대로 ON DUPLICATE KEY UPDATE)
+DATA_VERSION_SQL = "SELECT COALESCE(MAX(id), 0), MAX(updated_at) FROM news_ai_meta"
+# sql/007 적용 전(updated_at 없음, 1054 오류)에는 MAX(id)만
+DATA_VERSION_FALLBACK_SQL = "SELECT COALESCE(MAX(id), 0), NULL FROM news_ai_meta"
+_ER_BAD_FIELD_ERROR = 1054
+_data_version_state = {"sql": DATA_VERSION_SQL}
+
+
+def _format_version(row) -> str:
+    """
+    (max id, max updated_at) + 메모리 색인 워터마크 2개
+    (색인 모드에서는 DB에 새 요약 / 재요약이 보여도 색인에 반영되기 전까지 결과가 같으므로 둘 다 키에 포함)
+    """
+    max_id, max_updated = row
+    updated_mark = index.updated_watermark[0] if index.updated_watermark else None
+    return f"{max_id}.{max_updated}.{index.watermark}.{updated_mark}"
+
+
+def _is_bad_field(e: DBAPIError) -> bool:
+    args = getattr(e.orig, "args", None) or (None,)
+    return args[0] == _ER_BAD_FIELD_ERROR
+
+
+def data_version() -> str:
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(text(_data_version_state["sql"])).one()
+    except DBAPIError as e:
+        if _data_version_state["sql"] == DATA_VERSION_FALLBACK_SQL or not _is_bad_field(e):
+            raise
+        print(f"[Search] ⚠️ news_ai_meta.updated_at 없음 (sql/007 미적용) → 캐시 버전은 MAX(id)만 사용: {e.orig}")
+        _data_version_state["sql"] = DATA_VERSION_FALLBACK_SQL
+        return data_version()
+    return _format_version(row)
+
+
+def search_articles(query: str, limit: int = SEARCH_LIMIT, cursor: str = None, mode: str = None):
+    """
+    한 페이지 검색 → (행 목록, next_cursor) / 마지막 페이지면 next_cursor=None
+    mode: "index" / "fulltext" / "like" (없으면 SEARCH_MODE, 커서가 있으면 커서를 만든 경로)
+    index: 색인이 준비 안 됐거나 term이 없는 검색어는 fulltext로
+    ngram 길이보다 짧은 단어(1글자)가 있는 검색어나 sql/005 인덱스가 없는 DB는 LIKE
+    잘못된 커서는 CursorError
+    """
+    after_mode, after = decode_cursor(cursor) if cursor else (None, None)
+    mode = after_mode or mode or SEARCH_MODE
+
+    if mode == "index":
+        if _index_usable(query, after_mode):
+            return search_index(query, limit, after)
+        mode = "fulltext"
+
+    sql, params, used = _search_sql(query, mode, limit, after)
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text(sql),
+                params
+            ).mappings().all()
+    except DBAPIError as e:
+        if used != "fulltext" or not _is_missing_fulltext_index(e):
+            raise
+        _disable_fulltext(e)
+        return search_articles(query, limit, cursor, mode)
+
+    return _sql_page(rows, limit, used)
+
+
+# =========================
+# 비동기 버전 (DB_ASYNC=1, db.async_engine)
+# - 위 함수들과 같은 SQL / 같은 결과, DB 호출만 await
+# =========================
+async def async_fetch_articles_by_ids(ids) -> list:
+    if not ids:
+        return []
+    async with async_engine.connect() as conn:
+        result = await conn.execute(ARTICLES_BY_IDS_SQL, {"ids": list(ids)})
+        rows = result.mappings().all()
+    by_id = {row["article_id"]: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+async def async_search_index(query: str, limit: int = SEARCH_LIMIT, after=None):
+    terms = query_terms(query)
+    want = limit + 1
+    keys = index.search(terms, limit=want, after=after)
+    results = []
+    start = 0
+    while len(results) < want and start < len(keys):
+        chunk = keys[start:start + want]
+        key_by_id = {k[2]: k for k in chunk}
+        rows = await async_fetch_articles_by_ids([k[2] for k in chunk])
+        results.extend((row, key_by_id[row["article_id"]]) for row in rows if _matches(row, query))
+        start += want
+        if start == len(keys) == want and len(results) < want:
+            keys = index.search(terms, after=after)
+    return _index_page(results, limit)
+
+
+async def async_data_version() -> str:
+    try:
+        async with async_engine.connect() as conn:
+            row = (await conn.execute(text(_data_version_state["sql"]))).one()
+    except DBAPIError as e:
+        if _data_version_state["sql"] == DATA_VERSION_FALLBACK_SQL or not _is_bad_field(e):
+            raise
+        print(f"[Search] ⚠️ news_ai_meta.updated_at 없음 (sql/007 미적용) → 캐시 버전은 MAX(id)만 사용: {e.orig}")
+        _data_version_state["sql"] = DATA_VERSION_FALLBACK_SQL
+        return await async_data_version()
+    return _format_version(row)
+
+
+async def async_search_articles(query: str, limit: int = SEARCH_LIMIT, cursor: str = None, mode: str = None):
+    after_mode, after = decode_cursor(cursor) if cursor else (None, None)
+    mode = after_mode or mode or SEARCH_MODE
+
+    if mode == "index":
+        if _index_usable(query, after_mode):
+            return await async_search_index(query, limit, after)
+        mode = "fulltext"
+
+    sql, params, used = _search_sql(query, mode, limit, after)
+    try:
+        async with async_engine.connect() as conn:
+            result = await conn.execute(text(sql), params)
+            rows = result.mappings().all()
+    except DBAPIError as e:
+        if used != "fulltext" or not _is_missing_fulltext_index(e):
+            raise
+        _disable_fulltext(e)
+        return await async_search_articles(query, limit, cursor, mode)
+
+    return _sql_page(rows, limit, used)
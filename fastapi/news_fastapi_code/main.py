@@ -1,9 +1,25 @@
 # main.py
-from fastapi import FastAPI, Query
+import json
+from typing import Literal, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
-from schemas import SearchResponse
-from crud import search_articles
+from schemas import Article, SearchResponse
+from crud import (
+    SEARCH_LIMIT, CursorError, decode_cursor,
+    search_articles, async_search_articles, fetch_index_rows, fetch_updated_index_rows,
+    data_version, async_data_version,
+)
+from config import (
+    SEARCH_MODE, SEARCH_CACHE_ENABLED, SEARCH_CACHE_MAX_AGE, DB_ASYNC,
+    SEARCH_PAGE_MAX, SEARCH_EXPORT_PAGE, SEARCH_EXPORT_MAX,
+)
+from search_index import index, IndexRefresher
+from search_cache import SearchCache, DataVersion, shared_backend_from_env, make_etag
 
 app = FastAPI(
     title="News Search API",
@@ -24,18 +40,175 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# =========================
+# 메모리 검색 색인 (SEARCH_MODE=index)
+# =========================
+refresher = IndexRefresher(index, fetch_index_rows, fetch_updated_index_rows)
+
+
+@app.on_event("startup")
+def start_search_index():
+    if SEARCH_MODE == "index":
+        refresher.start()
+
+
+@app.on_event("shutdown")
+def stop_search_index():
+    refresher.stop()
+
+
+# =========================
+# 검색 결과 캐시 (SEARCH_CACHE_ENABLED=1)
+# =========================
+search_cache = SearchCache(
+    DataVersion(data_version, afetch=async_data_version),
+    shared=shared_backend_from_env(),
+) if SEARCH_CACHE_ENABLED else None
+
+
+def to_json(q: str, limit: int, cursor: str, page) -> bytes:
+    """
+    (행 목록, next_cursor) → SearchResponse 검증 → query 필드를 뺀 JSON bytes (캐시에 그대로 저장)
+    캐시 키는 대소문자를 무시하므로 검색어 echo는 요청마다 with_query로 붙임
+    """
+    rows, next_cursor = page
+    payload = jsonable_encoder(SearchResponse(
+        query=q, count=len(rows), limit=limit, cursor=cursor, next_cursor=next_cursor, results=rows,
+    ))
+    del payload["query"]
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def with_query(q: str, body: bytes) -> bytes:
+    # '{"count": ...}' → '{"query": q, "count": ...}'
+    return b'{"query": ' + json.dumps(q, ensure_ascii=False).encode("utf-8") + b", " + body[1:]
+
+
+def render_search(q: str, limit: int, cursor: str) -> bytes:
+    def build():
+        return to_json(q, limit, cursor, search_articles(q, limit, cursor))
+
+    if search_cache is None:
+        return build()
+    return search_cache.get_or_build(q, SEARCH_MODE, build, extra=f"{limit}|{cursor or ''}")
+
+
+async def render_search_async(q: str, limit: int, cursor: str) -> bytes:
+    async def build():
+        return to_json(q, limit, cursor, await async_search_articles(q, limit, cursor))
+
+    if search_cache is None:
+        return await build()
+    return await search_cache.get_or_build_async(q, SEARCH_MODE, build, extra=f"{limit}|{cursor or ''}")
+
+
+# =========================
+# NDJSON 내보내기 (format=ndjson)
+# - 커서로 SEARCH_EXPORT_PAGE 건씩 읽어서 한 줄에 기사 1건씩 바로 전송 (전체를 메모리에 모으지 않음)
+# - 첫 페이지는 응답 시작 전에 조회 → 잘못된 커서 / DB 오류는 200 대신 400 / 500
+# - 200을 보낸 뒤 다음 페이지에서 실패하면 마지막 줄에 {"error": ...} 를 보내고 끝냄 (잘린 걸 알 수 있게)
+# =========================
+def ndjson_line(row) -> bytes:
+    return (json.dumps(jsonable_encoder(Article(**dict(row))), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def ndjson_error(e: Exception, sent: int) -> bytes:
+    # DB 오류 내용은 로그에만 남기고 클라이언트에는 일반 문구
+    print(f"[Search] ❌ 내보내기 중단 ({sent}건 전송 후): {e}")
+    message = str(e) if isinstance(e, CursorError) else "내보내기 중 오류가 발생했습니다."
+    return (json.dumps({"error": message, "sent": sent}, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def export_page_size(sent: int) -> int:
+    return min(SEARCH_EXPORT_PAGE, SEARCH_EXPORT_MAX - sent)
+
+
+def iter_export(q: str, first):
+    """
+    first: 응답 전에 미리 조회한 첫 페이지 (행 목록, next_cursor)
+    """
+    rows, cursor = first
+    sent = 0
+    while True:
+        for row in rows:
+            yield ndjson_line(row)
+        sent += len(rows)
+        if not cursor or sent >= SEARCH_EXPORT_MAX:
+            break
+        try:
+            rows, cursor = search_articles(q, export_page_size(sent), cursor)
+        except Exception as e:
+            yield ndjson_error(e, sent)
+            return
+
+
+async def aiter_export(q: str, first):
+    rows, cursor = first
+    sent = 0
+    while True:
+        for row in rows:
+            yield ndjson_line(row)
+        sent += len(rows)
+        if not cursor or sent >= SEARCH_EXPORT_MAX:
+            break
+        try:
+            rows, cursor = await async_search_articles(q, export_page_size(sent), cursor)
+        except Exception as e:
+            yield ndjson_error(e, sent)
+            return
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+
 # =========================
 # Search API
+# - DB_ASYNC=1: 비동기 엔진으로 이벤트 루프에서 바로 처리
+# - DB_ASYNC=0: 기존 동기 엔진, 스레드풀에서 실행
 # =========================
 @app.get("/search", response_model=SearchResponse)
-def search(
-    q: str = Query(..., description="검색어", min_length=1, max_length=50)
+async def search(
+    request: Request,
+    q: str = Query(..., description="검색어", min_length=1, max_length=50),
+    limit: int = Query(SEARCH_LIMIT, description="페이지 크기", ge=1, le=SEARCH_PAGE_MAX),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor", max_length=512),
+    fmt: Literal["json", "ndjson"] = Query("json", alias="format", description="ndjson: 전체 결과 스트리밍"),
 ):
+    # 검색/응답은 입력 검색어 그대로 (캐시 키만 SearchCache.key에서 정규화)
     q = q.strip()
-    results = search_articles(q)
+    try:
+        if cursor:
+            decode_cursor(cursor)
+
+        if fmt == "ndjson":
+            if DB_ASYNC:
+                first = await async_search_articles(q, export_page_size(0), cursor)
+                rows = aiter_export(q, first)
+            else:
+                first = await run_in_threadpool(search_articles, q, export_page_size(0), cursor)
+                rows = iter_export(q, first)
+            return StreamingResponse(rows, media_type="application/x-ndjson")
+
+        if DB_ASYNC:
+            body = await render_search_async(q, limit, cursor)
+        else:
+            body = await run_in_threadpool(render_search, q, limit, cursor)
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    body = with_query(q, body)
+
+    etag = make_etag(body)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={SEARCH_CACHE_MAX_AGE}",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
 
-    return {
-        "query": q,
-        "count": len(results),
-        "results": results
-    }
\ No newline at end of file
+    return Response(content=body, media_type="application/json", headers=headers)
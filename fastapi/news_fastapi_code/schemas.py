@@ -18,4 +18,7 @@ class Article(BaseModel):
 class SearchResponse(BaseModel):
     query: str
     count: int
+    limit: int
+    cursor: Optional[str] = None        # 이번 페이지를 요청한 커서 (첫 페이지는 null)
+    next_cursor: Optional[str] = None   # 다음 페이지 요청용, 마지막 페이지면 null
     results: List[Article]
@@ -0,0 +1,299 @@
+# search_cache.py
+# /search 결과 캐시
+# - 키: 정규화한 검색어(키에만 사용, 검색/응답은 원래 검색어) + 검색 모드 + 데이터 버전
+#   데이터 버전 = max(news_ai_meta.id) + max(updated_at) (+ 메모리 색인 워터마크)
+#   → 새 요약 / 재요약이 들어오면 키가 바뀌어서 자동 무효화 (옛 버전 항목은 TTL / LRU로 자연히 빠짐)
+# - 값: 직렬화한 응답 JSON(bytes, query 필드 제외) → 캐시 히트면 DB 조회와 응답 검증/직렬화 모두 생략
+# - 1단계: 프로세스 내 LRU + TTL / 2단계(선택): 공유 캐시 (redis, 워커·인스턴스 간 공유)
+#   공유 캐시는 CacheBackend 인터페이스만 맞추면 교체 가능, 로컬 확인용 FakeSharedCache 포함
+#   비동기 경로(DB_ASYNC=1)는 aget/aset 사용 → redis는 redis.asyncio 클라이언트로 이벤트 루프를 막지 않음
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from config import (
+    SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL, SEARCH_CACHE_VERSION_TTL,
+    SEARCH_CACHE_BACKEND, SEARCH_CACHE_REDIS_URL,
+)
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 검색어: 대소문자 차이는 같은 검색어로 (모든 검색 경로가 대소문자 구분 없음 → 결과도 같음)
+    중간 공백은 LIKE 결과가 달라지므로 그대로 둠
+    """
+    return (query or "").strip().lower()
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+# ---------------------------------------------------------
+# 캐시 저장소
+# ---------------------------------------------------------
+class CacheBackend:
+    """
+    캐시 저장소 인터페이스 (값은 bytes)
+    """
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    # 비동기 경로용: 기본은 메모리 저장소라 그대로 호출 (네트워크 저장소는 재정의)
+    async def aget(self, key: str):
+        return self.get(key)
+
+    async def aset(self, key: str, value: bytes, ttl: float):
+        self.set(key, value, ttl)
+
+
+class LocalLRUCache(CacheBackend):
+    """
+    프로세스 내 LRU + TTL
+    """
+
+    def __init__(self, maxsize: int = SEARCH_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key → (만료 시각, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class RedisCache(CacheBackend):
+    """
+    공유 캐시 (SEARCH_CACHE_BACKEND=redis)
+    동기 경로는 redis.Redis, 비동기 경로는 redis.asyncio.Redis (같은 URL / 타임아웃)
+    """
+
+    def __init__(self, url: str = SEARCH_CACHE_REDIS_URL, prefix: str = "news:search:"):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("SEARCH_CACHE_BACKEND=redis 를 쓰려면 redis 패키지(4.2 이상)가 필요합니다.")
+        options = {"socket_timeout": 0.2, "socket_connect_timeout": 0.2}
+        self.client = redis.Redis.from_url(url, **options)
+        self.async_client = redis.asyncio.Redis.from_url(url, **options)
+        self.prefix = prefix
+
+    def get(self, key: str):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def aget(self, key: str):
+        return await self.async_client.get(self.prefix + key)
+
+    async def aset(self, key: str, value: bytes, ttl: float):
+        await self.async_client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+
+class FakeSharedCache(CacheBackend):
+    """
+    공유 캐시 흉내 (SEARCH_CACHE_BACKEND=fake) - redis 없이 로컬 실행 / 벤치마크용
+    여러 SearchCache가 같은 인스턴스를 넘겨받으면 인스턴스 간 공유와 같은 동작
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+        self.gets = 0
+        self.sets = 0
+
+    def get(self, key: str):
+        with self._lock:
+            self.gets += 1
+            item = self._data.get(key)
+            if item is None or item[0] <= time.monotonic():
+                self._data.pop(key, None)
+                return None
+            return item[1]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self.sets += 1
+            self._data[key] = (time.monotonic() + ttl, bytes(value))
+
+
+def shared_backend_from_env():
+    if SEARCH_CACHE_BACKEND == "redis":
+        return RedisCache()
+    if SEARCH_CACHE_BACKEND == "fake":
+        return FakeSharedCache()
+    return None
+
+
+# ---------------------------------------------------------
+# 데이터 버전
+# ---------------------------------------------------------
+class DataVersion:
+    """
+    fetch()로 얻은 데이터 버전을 ttl초 동안 재사용 (요청마다 DB에 가지 않도록)
+    afetch: 비동기 엔진용 (await afetch()), aget()에서 사용
+    """
+
+    def __init__(self, fetch, ttl: float = SEARCH_CACHE_VERSION_TTL, afetch=None):
+        self.fetch = fetch
+        self.afetch = afetch
+        self.ttl = ttl
+        self._value = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        with self._lock:
+            now = time.monotonic()
+            if self._value is None or now - self._checked_at >= self.ttl:
+                self._value = str(self.fetch())
+                self._checked_at = now
+            return self._value
+
+    async def aget(self) -> str:
+        # 이벤트 루프 한 스레드에서만 호출 → 락 없음 (동시에 만료되면 조회가 몇 번 겹칠 뿐)
+        now = time.monotonic()
+        if self._value is None or now - self._checked_at >= self.ttl:
+            self._value = str(await self.afetch())
+            self._checked_at = now
+        return self._value
+
+
+# ---------------------------------------------------------
+# 검색 결과 캐시
+# ---------------------------------------------------------
+class SearchCache:
+    def __init__(self, version: DataVersion, local: CacheBackend = None, shared: CacheBackend = None,
+                 ttl: float = SEARCH_CACHE_TTL):
+        self.version = version
+        self.local = local if local is not None else LocalLRUCache()
+        self.shared = shared
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "shared_hits": 0, "misses": 0, "shared_errors": 0}
+
+    def key(self, query: str, mode: str, version: str = None, extra: str = "") -> str:
+        """
+        extra: 검색어 외에 결과를 바꾸는 값 (limit / cursor 등, 대소문자 그대로)
+        """
+        if version is None:
+            version = self.version.get()
+        return f"{version}|{mode}|{normalize_query(query)}|{extra}"
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _local_hit(self, key: str):
+        value = self.local.get(key)
+        if value is not None:
+            self._count("hits")
+        return value
+
+    def _finish_get(self, key: str, value):
+        # 공유 캐시에서 찾았으면 로컬에도 넣음, 못 찾았으면 miss
+        if value is None:
+            self._count("misses")
+            return None
+        self._count("shared_hits")
+        self.local.set(key, value, self.ttl)
+        return value
+
+    def _shared_error(self, action: str, e: Exception):
+        # 공유 캐시 장애는 검색 실패로 만들지 않음
+        print(f"[Cache] ⚠️ 공유 캐시 {action} 실패: {e}")
+        self._count("shared_errors")
+
+    def get(self, key: str):
+        value = self._local_hit(key)
+        if value is not None:
+            return value
+        if self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                self._shared_error("조회", e)
+        return self._finish_get(key, value)
+
+    def set(self, key: str, value: bytes):
+        self.local.set(key, value, self.ttl)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, self.ttl)
+            except Exception as e:
+                self._shared_error("저장", e)
+
+    async def aget(self, key: str):
+        """
+        get 비동기 버전: 공유 캐시를 await (이벤트 루프를 막지 않음)
+        """
+        value = self._local_hit(key)
+        if value is not None:
+            return value
+        if self.shared is not None:
+            try:
+                value = await self.shared.aget(key)
+            except Exception as e:
+                self._shared_error("조회", e)
+        return self._finish_get(key, value)
+
+    async def aset(self, key: str, value: bytes):
+        self.local.set(key, value, self.ttl)
+        if self.shared is not None:
+            try:
+                await self.shared.aset(key, value, self.ttl)
+            except Exception as e:
+                self._shared_error("저장", e)
+
+    def get_or_build(self, query: str, mode: str, build, extra: str = ""):
+        """
+        캐시에 있으면 그대로, 없으면 build() → bytes 저장 후 반환
+        """
+        key = self.key(query, mode, extra=extra)
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.set(key, value)
+        return value
+
+    async def get_or_build_async(self, query: str, mode: str, build, extra: str = ""):
+        """
+        get_or_build 비동기 버전: 데이터 버전 조회, 공유 캐시, build()를 모두 await
+        """
+        key = self.key(query, mode, await self.version.aget(), extra)
+        value = await self.aget(key)
+        if value is None:
+            value = await build()
+            await self.aset(key, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats["hits"] + stats["shared_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["shared_hits"]) / total, 3) if total else 0.0
+        return stats
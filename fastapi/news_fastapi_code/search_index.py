@@ -0,0 +1,289 @@
+# search_index.py
+# /search 용 메모리 역색인 (FastAPI 프로세스 안에서 유지)
+# - 한글 / 영문·숫자 모두 글자 bigram ("엔비디아" → 엔비, 비디, 디아 / "OpenAI" → op, pe, en, na, ai)
+#   → LIKE처럼 단어 중간도 찾음 ("AI"로 "OpenAI" 검색)
+# - 필드별(제목 / 요약+키워드) posting list = 정렬된 array('I') (기사 id)
+# - 시작할 때 전체 로드, 이후 news_ai_meta.id 워터마크보다 새 행을 주기적으로 추가
+#   + updated_at 워터마크 이후 바뀐 행(재요약)은 기존 posting을 지우고 다시 색인 (sql/007)
+# - 검색: posting list 교집합 → 점수(제목 > 요약/키워드) / 최신순으로 정렬한 기사 id(정렬 키)만 반환
+#   (실제 행 조회와 LIKE 같은 부분 문자열 검증은 crud에서 상위 N개만)
+# ※ DB 접근 없음 (rows 로더를 밖에서 받음) → 벤치마크/로컬에서 단독 실행 가능
+import re
+import time
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import timedelta
+
+from config import SEARCH_INDEX_REFRESH_SEC, SEARCH_INDEX_CHUNK, SEARCH_INDEX_OVERLAP, SEARCH_INDEX_UPDATE_OVERLAP_SEC
+
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+
+# ---------------------------------------------------------
+# 토큰화
+# ---------------------------------------------------------
+def tokenize(text: str) -> set:
+    """
+    색인용 term 집합 = 한글 / 영문·숫자 연속 구간별 글자 bigram (1글자 구간은 bigram이 없어서 제외)
+    검색어가 본문의 부분 문자열이면 검색어의 bigram은 모두 본문 bigram에 들어 있음 → 후보 누락 없음
+    """
+    terms = set()
+    for run in _TOKEN_RE.findall((text or "").lower()):
+        terms.update(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def query_terms(query: str) -> list:
+    """
+    검색어 → 찾을 term 목록
+    term이 없으면(1글자 검색어 등) 빈 목록 → 호출하는 쪽에서 DB 검색으로
+    """
+    return sorted(tokenize(query))
+
+
+# ---------------------------------------------------------
+# posting list 연산
+# ---------------------------------------------------------
+def _intersect_all(lists) -> set:
+    """
+    정렬된 id 배열들의 교집합
+    짧은 쪽부터 시작, 길이 차이가 크면 긴 배열에서 이분 탐색 / 비슷하면 set 교집합(C 루프)
+    """
+    if not lists or any(len(p) == 0 for p in lists):
+        return set()
+    lists = sorted(lists, key=len)
+    acc = set(lists[0])
+    for p in lists[1:]:
+        if len(acc) * 16 < len(p):
+            n = len(p)
+            acc = {x for x in acc if (i := bisect_left(p, x)) < n and p[i] == x}
+        else:
+            acc.intersection_update(p)
+        if not acc:
+            break
+    return acc
+
+
+def _insert_sorted(postings: array, article_id: int):
+    # id가 대부분 증가하는 순서로 들어오므로 보통은 append
+    if not postings or postings[-1] < article_id:
+        postings.append(article_id)
+        return
+    i = bisect_left(postings, article_id)
+    if i == len(postings) or postings[i] != article_id:
+        postings.insert(i, article_id)
+
+
+# ---------------------------------------------------------
+# 역색인
+# ---------------------------------------------------------
+class InvertedIndex:
+    def __init__(self):
+        self.title = {}   # term → array('I')
+        self.body = {}    # term → array('I')
+        self.dates = {}   # 기사 id → article_date (timestamp, 정렬용)
+        self.digests = {}  # 기사 id → 색인한 내용 해시 (다시 읽은 행이 바뀌었는지 확인)
+        self.watermark = 0  # 색인에 넣은 최대 news_ai_meta.id
+        self.updated_watermark = None  # 색인에 넣은 최대 (news_ai_meta.updated_at, id)
+        self.ready = False
+        self.built_at = None
+        self.refreshed_at = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.dates)
+
+    def add(self, row) -> bool:
+        """
+        row: meta_id, article_id, title, article_date, summary, keywords, updated_at
+        이미 있는 기사는 내용이 같으면 건너뛰고, 바뀌었으면(재요약) 기존 posting을 지우고 다시 색인
+        """
+        article_id = int(row["article_id"])
+        body = f"{row['summary'] or ''}\n{row['keywords'] or ''}"
+        date = row["article_date"]
+        digest = hash((row["title"] or "", body, date))
+
+        with self._lock:
+            self.watermark = max(self.watermark, int(row["meta_id"]))
+            updated_at = row.get("updated_at")
+            if updated_at is not None:
+                mark = (updated_at, int(row["meta_id"]))
+                if self.updated_watermark is None or mark > self.updated_watermark:
+                    self.updated_watermark = mark
+
+            old = self.digests.get(article_id)
+            if old == digest:
+                return False
+            if old is not None:
+                self._remove(article_id)
+
+            for term in tokenize(row["title"]):
+                _insert_sorted(self.title.setdefault(term, array("I")), article_id)
+            for term in tokenize(body):
+                _insert_sorted(self.body.setdefault(term, array("I")), article_id)
+
+            self.dates[article_id] = int(date.timestamp()) if date else 0
+            self.digests[article_id] = digest
+            return True
+
+    def _remove(self, article_id: int):
+        # 예전 term 목록은 안 들고 있으므로 모든 posting에서 이분 탐색 (재요약은 드물어서 충분)
+        for postings in (*self.title.values(), *self.body.values()):
+            i = bisect_left(postings, article_id)
+            if i < len(postings) and postings[i] == article_id:
+                del postings[i]
+
+    def search(self, terms, limit: int = None, after=None) -> list:
+        """
+        모든 term이 한 필드에 다 들어 있는 기사의 정렬 키 (점수, article_date, id) 목록, 큰 것부터
+        점수: 제목+본문(3) > 제목만(2) > 요약/키워드만(1) → 점수 구간별로 채우고 구간 안에서만 날짜 정렬
+        limit이 있으면 상위 limit개만 (heap), 없으면 전체 정렬
+        after: 이전 페이지 마지막 정렬 키 → 그보다 뒤 순위만 (커서 페이지네이션)
+        """
+        if not terms:
+            return []
+
+        with self._lock:
+            title_hits = _intersect_all([self.title.get(t, array("I")) for t in terms])
+            body_hits = _intersect_all([self.body.get(t, array("I")) for t in terms])
+            both = title_hits & body_hits
+            tiers = ((3, both), (2, title_hits - both), (1, body_hits - both))
+
+            dates = self.dates
+            key = lambda article_id: (dates[article_id], article_id)  # noqa: E731
+            ranked = []
+            for score, tier in tiers:
+                if after is not None:
+                    if score > after[0]:
+                        continue
+                    if score == after[0]:
+                        last = (after[1], after[2])
+                        tier = [i for i in tier if key(i) < last]
+
+                want = None if limit is None else limit - len(ranked)
+                if want == 0:
+                    break
+                if want is not None and want < len(tier):
+                    ids = heapq.nlargest(want, tier, key=key)
+                else:
+                    ids = sorted(tier, key=key, reverse=True)
+                ranked.extend((score, dates[i], i) for i in ids)
+
+        return ranked
+
+    def stats(self) -> dict:
+        with self._lock:
+            postings = sum(len(p) for p in self.title.values()) + sum(len(p) for p in self.body.values())
+            return {
+                "ready": self.ready,
+                "articles": len(self.dates),
+                "terms": len(self.title) + len(self.body),
+                "postings": postings,
+                "posting_bytes": postings * array("I").itemsize,
+                "watermark": self.watermark,
+                "updated_watermark": str(self.updated_watermark[0]) if self.updated_watermark else None,
+                "built_at": self.built_at,
+                "refreshed_at": self.refreshed_at,
+            }
+
+
+# ---------------------------------------------------------
+# 로드 / 주기적 갱신
+# ---------------------------------------------------------
+def load_new_rows(idx: InvertedIndex, fetch_rows, chunk: int = SEARCH_INDEX_CHUNK,
+                  overlap: int = SEARCH_INDEX_OVERLAP) -> int:
+    """
+    워터마크 이후 행을 chunk 단위로 전부 색인, 추가된 기사 수 반환
+    fetch_rows(after_meta_id, limit) → meta_id 오름차순 행 목록
+    overlap: 늦게 커밋된 트랜잭션(작은 id가 나중에 보이는 경우)을 잡으려고 워터마크보다 조금 앞에서 다시 읽음
+    """
+    added = 0
+    after = max(0, idx.watermark - overlap)
+    while True:
+        rows = fetch_rows(after, chunk)
+        for row in rows:
+            added += idx.add(row)
+        if len(rows) < chunk:
+            break
+        after = int(rows[-1]["meta_id"])
+    return added
+
+
+def load_updated_rows(idx: InvertedIndex, fetch_updated, chunk: int = SEARCH_INDEX_CHUNK,
+                      overlap_sec: float = SEARCH_INDEX_UPDATE_OVERLAP_SEC) -> int:
+    """
+    updated_at 워터마크 이후 바뀐 행(재요약 등)을 다시 색인, 실제로 내용이 바뀐 기사 수 반환
+    fetch_updated(after_updated_at, after_meta_id, limit) → (updated_at, meta_id) 오름차순 행 목록
+    overlap_sec: 늦게 커밋된 트랜잭션을 잡으려고 워터마크보다 조금 앞 시각부터 다시 읽음 (내용이 같으면 건너뜀)
+    """
+    if idx.updated_watermark is None:
+        return 0
+    changed = 0
+    after = (idx.updated_watermark[0] - timedelta(seconds=overlap_sec), 0)
+    while True:
+        rows = fetch_updated(after[0], after[1], chunk)
+        for row in rows:
+            changed += idx.add(row)
+        if len(rows) < chunk:
+            break
+        after = (rows[-1]["updated_at"], int(rows[-1]["meta_id"]))
+    return changed
+
+
+class IndexRefresher:
+    """
+    백그라운드 스레드: 처음 전체 로드 후 interval마다 새 행 추가 + 바뀐 행 다시 색인
+    """
+
+    def __init__(self, idx: InvertedIndex, fetch_rows, fetch_updated=None,
+                 interval: float = SEARCH_INDEX_REFRESH_SEC):
+        self.idx = idx
+        self.fetch_rows = fetch_rows
+        self.fetch_updated = fetch_updated
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def build(self):
+        t0 = time.perf_counter()
+        added = load_new_rows(self.idx, self.fetch_rows)
+        self.idx.ready = True
+        self.idx.built_at = self.idx.refreshed_at = time.time()
+        print(f"[Index] ✅ 검색 색인 생성: {added}건 ({time.perf_counter() - t0:.2f}s)")
+
+    def refresh(self):
+        added = load_new_rows(self.idx, self.fetch_rows)
+        if added:
+            print(f"[Index] ➕ 새 기사 {added}건 색인 (watermark={self.idx.watermark})")
+        if self.fetch_updated is not None:
+            changed = load_updated_rows(self.idx, self.fetch_updated)
+            if changed:
+                print(f"[Index] 🔄 바뀐 기사 {changed}건 다시 색인")
+        self.idx.refreshed_at = time.time()
+
+    def _run(self):
+        try:
+            self.build()
+        except Exception as e:
+            print(f"[Index] ❌ 색인 생성 실패 (DB 검색으로 동작): {e}")
+        while not self._stop.wait(self.interval):
+            try:
+                if self.idx.ready:
+                    self.refresh()
+                else:
+                    self.build()
+            except Exception as e:
+                print(f"[Index] ⚠️ 색인 갱신 실패: {e}")
+
+    def start(self):
+        # 색인 로드가 끝날 때까지는 ready=False → crud가 DB 검색 사용 (서버 기동은 막지 않음)
+        self._thread = threading.Thread(target=self._run, name="search-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+index = InvertedIndex()
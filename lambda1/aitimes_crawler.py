@@ -1,11 +1,124 @@
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from datetime import datetime
+import os
 import re
 import json
+import threading
+
+from http_cache import cache_from_env
+from html_backend import extract_list_hrefs, extract_article_parts
+from http_resilience import guard_from_env, CircuitOpenError
 
 BASE_URL = "https://www.aitimes.com"
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# 동시 크롤링 설정 (1이면 기존처럼 순차 실행)
+MAX_WORKERS = int(os.getenv("CRAWL_MAX_WORKERS", "8"))
+# 같은 호스트에 동시에 보낼 수 있는 최대 요청 수
+PER_HOST_LIMIT = int(os.getenv("CRAWL_PER_HOST_LIMIT", "4"))
+# HTML 파서 백엔드: "html.parser"(기본) 또는 "lxml"
+HTML_PARSER = os.getenv("CRAWL_HTML_PARSER", "html.parser")
+
+
+# ---------------------------------------------------------
+# HTTP 세션 (keep-alive 재사용)
+# ---------------------------------------------------------
+_session = None
+_session_lock = threading.Lock()
+_host_semaphores = {}
+_host_guards = {}
+
+# 응답 캐시 (CRAWL_CACHE_DIR 설정 시 사용, set_http_cache로 교체 가능)
+_http_cache = cache_from_env()
+
+
+def set_http_cache(cache):
+    """
+    크롤러가 사용할 응답 캐시 지정 (None이면 캐시 끔)
+    """
+    global _http_cache
+    _http_cache = cache
+
+
+def get_session():
+    """
+    모든 요청이 공유하는 requests.Session.
+    커넥션 풀을 재사용해서 매 요청마다 TCP/TLS 핸드셰이크를 하지 않게 함.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            s.headers.update(DEFAULT_HEADERS)
+            pool_size = max(MAX_WORKERS, PER_HOST_LIMIT, 1)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def _host_semaphore(url):
+    host = urlparse(url).netloc
+    with _session_lock:
+        sem = _host_semaphores.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(max(PER_HOST_LIMIT, 1))
+            _host_semaphores[host] = sem
+        return sem
+
+
+def _host_guard(url):
+    """
+    호스트별 rate limiter + 재시도 + 서킷 브레이커
+    """
+    host = urlparse(url).netloc
+    with _session_lock:
+        guard = _host_guards.get(host)
+        if guard is None:
+            guard = guard_from_env()
+            _host_guards[host] = guard
+        return guard
+
+
+def fetch_html(url):
+    """
+    URL의 HTML 문자열을 가져옴 (호스트별 동시 요청 수 제한 + 속도 제한 + 재시도)
+    캐시가 켜져 있으면 조건부 요청을 보내고 304면 저장된 본문을 돌려줌
+    재시도 후에도 실패하면 requests.RequestException / CircuitOpenError 발생
+    """
+    cache = _http_cache
+    cached = cache.get(url) if cache else None
+
+    if cache and cache.offline:
+        if cached is None:
+            print(f"⚠️ 오프라인 캐시에 없음: {url}")
+            return ""
+        return cached["body"]
+
+    headers = cache.conditional_headers(cached) if cached else None
+
+    res = _host_guard(url).request(
+        get_session(), url, headers=headers, slot=_host_semaphore(url)
+    )
+
+    if res.status_code == 304 and cached:
+        cache.touch(url)
+        return cached["body"]
+
+    text = res.text
+    if cache and res.status_code == 200:
+        cache.put(
+            url,
+            text,
+            etag=res.headers.get("ETag"),
+            last_modified=res.headers.get("Last-Modified"),
+        )
+    return text
 
 
 # ---------------------------------------------------------
@@ -23,14 +136,57 @@ def pretty_print_article(article):
     print("=" * 80 + "\n")
 
 
+# ---------------------------------------------------------
+# 전처리용 정규식 (모듈 로드 시 1번만 컴파일)
+# - 패턴 적용 순서는 기존과 동일하게 유지 (출력 100% 동일)
+# - 해당 문자열이 없으면 정규식 패스 자체를 건너뜀
+# - str.translate / 긴 alternation 은 CPython에서 오히려 느려서
+#   짧은 str.replace 체인과 리터럴로 시작하는 개별 패턴을 사용
+# ---------------------------------------------------------
+_INVISIBLE_CHARS = ("\u200b", "\ufeff", "\u2060", "\u180e")
+
+_DATE_RE = re.compile(r"\d{4}\.\d{2}\.\d{2} \d{2}:\d{2}")
+
+_TITLE_BRACKET_RE = re.compile(r"^\[[^\]]+\]\s*")
+_TITLE_EDGE_QUOTES_RE = re.compile(r'^"+|"+$')
+_MULTI_QUOTE_RE = re.compile(r'""+')
+
+# 서론/광고 문구 (읽어드립니다 계열)
+_READ_ALOUD_RE = re.compile(r"기사를\s*읽어드립니다\.?")
+_READ_ALOUD_AI_RE = re.compile(r"이\s*뉴스는\s*AI가\s*읽어드립니다\.?")
+_INTRO_RE = re.compile(r"AI타임스입니다\.?")
+_PHOTO_CREDIT_RE = re.compile(r"\(사진\s*=\s*[^)]+\)")
+_GRAPHIC_CREDIT_RE = re.compile(r"\(그래픽\s*=\s*[^)]+\)")
+
+_REPORTER_DOMAIN_RE = re.compile(r"[가-힣]{2,10}\s*[A-Za-z0-9._%+-]+\s*\.\s*[A-Za-z]{2,4}")
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+")
+_REPORTER_WORD_RE = re.compile(r"(기자|특파원)")
+_NEXT_NEWS_RE = re.compile(r"이어\s*\d+일\s*주요\s*뉴스입니다")
+
+_HTTP_URL_RE = re.compile(r"https?://\S+")
+_PIC_TWITTER_RE = re.compile(r"pic\.twitter\.com/\S+")
+_HANDLE_RE = re.compile(r"@[A-Za-z0-9_]+")
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s*(?=[가-힣A-Za-z0-9])")
+_MULTI_SPACE_RE = re.compile(r"\s\s+")
+_TRAILING_NAME_RE = re.compile(r"\n?[가-힣]{2,3}\s*$")
+
+_GARBAGE = ("저작권자 ©", "무단전재 및 재배포 금지", "관련기사", "추천기사", "△")
+
+
+def _replace_quotes(text):
+    return text.replace("“", "\"").replace("”", "\"").replace("‘", "'").replace("’", "'")
+
+
 # ---------------------------------------------------------
 # 유니코드 제거
 # ---------------------------------------------------------
 def clean_invisible_chars(text):
     if not text:
         return ""
-    for ch in ["\u200b", "\ufeff", "\u2060", "\u180e"]:
-        text = text.replace(ch, "")
+    for ch in _INVISIBLE_CHARS:
+        if ch in text:
+            text = text.replace(ch, "")
     return text.strip()
 
 
@@ -42,7 +198,7 @@ def extract_korean_date(text):
         return None
 
     text = text.replace("입력", "").strip()
-    match = re.search(r"\d{4}\.\d{2}\.\d{2} \d{2}:\d{2}", text)
+    match = _DATE_RE.search(text)
 
     if not match:
         return None
@@ -60,18 +216,18 @@ def clean_title(text):
     if not text:
         return ""
 
-    text = text.replace("“", "\"").replace("”", "\"")
-    text = text.replace("‘", "'").replace("’", "'")
+    text = _replace_quotes(text)
 
     # 앞쪽 [브라켓] 제거
-    text = re.sub(r"^\[[^\]]+\]\s*", "", text)
+    if text.startswith("["):
+        text = _TITLE_BRACKET_RE.sub("", text, count=1)
 
     # 제목 앞뒤의 과도한 따옴표 제거
-    text = re.sub(r'^"+', '', text)
-    text = re.sub(r'"+$', '', text)
+    text = _TITLE_EDGE_QUOTES_RE.sub("", text)
 
     # 내부 누적 따옴표 정리
-    text = re.sub(r'""+', '"', text)
+    if '""' in text:
+        text = _MULTI_QUOTE_RE.sub('"', text)
 
     return text.strip()
 
@@ -84,56 +240,56 @@ def clean_article_body(text):
         return ""
 
     # 1) 서론/광고 제거
-    remove_patterns = [
-        r"기사를\s*읽어드립니다\.?",
-        r"AI타임스입니다\.?",
-        r"이\s*뉴스는\s*AI가\s*읽어드립니다\.?",
-        r"\(사진\s*=\s*[^)]+\)",
-        r"\(그래픽\s*=\s*[^)]+\)",
-    ]
-    for p in remove_patterns:
-        text = re.sub(p, "", text)
+    if "읽어드립니다" in text:
+        text = _READ_ALOUD_RE.sub("", text)
+    if "AI타임스입니다" in text:
+        text = _INTRO_RE.sub("", text)
+    if "읽어드립니다" in text:
+        text = _READ_ALOUD_AI_RE.sub("", text)
+    if "(사진" in text:
+        text = _PHOTO_CREDIT_RE.sub("", text)
+    if "(그래픽" in text:
+        text = _GRAPHIC_CREDIT_RE.sub("", text)
 
     # 2) 기자 + 메일 제거
-    text = re.sub(r"[가-힣]{2,10}\s*[A-Za-z0-9._%+-]+\s*\.\s*[A-Za-z]{2,4}", "", text)
-    text = re.sub(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+", "", text)
-    text = re.sub(r"(기자|특파원)", "", text)
+    text = _REPORTER_DOMAIN_RE.sub("", text)
+    if "@" in text:
+        text = _EMAIL_RE.sub("", text)
+    text = _REPORTER_WORD_RE.sub("", text)
 
     # 3) 이어 XX일 주요 뉴스입니다 제거
-    text = re.split(r"이어\s*\d+일\s*주요\s*뉴스입니다", text)[0]
+    if "주요" in text:
+        text = _NEXT_NEWS_RE.split(text, maxsplit=1)[0]
 
     # 4) URL 제거
-    url_patterns = [
-        r"https?://\S+",
-        r"pic\.twitter\.com/\S+",
-        r"@[A-Za-z0-9_]+",
-    ]
-    for p in url_patterns:
-        text = re.sub(p, "", text)
+    if "://" in text:
+        text = _HTTP_URL_RE.sub("", text)
+    if "pic.twitter.com/" in text:
+        text = _PIC_TWITTER_RE.sub("", text)
+    if "@" in text:
+        text = _HANDLE_RE.sub("", text)
 
     # 5) 따옴표 정리
-    text = text.replace("“", "\"").replace("”", "\"")
-    text = text.replace("‘", "'").replace("’", "'")
-    text = re.sub(r'""+', '"', text)
+    text = _replace_quotes(text)
+    if '""' in text:
+        text = _MULTI_QUOTE_RE.sub('"', text)
 
     # 6) 문장 분리
-    text = re.sub(
-        r"(?<=[.!?])\s*(?=[가-힣A-Za-z0-9])",
-        "\n",
-        text
-    )
+    text = _SENTENCE_SPLIT_RE.sub("\n", text)
 
     # 7) 기타 제거
-    garbage = ["저작권자 ©", "무단전재 및 재배포 금지", "관련기사", "추천기사", "△"]
-    for g in garbage:
-        text = text.replace(g, "")
+    for g in _GARBAGE:
+        if g in text:
+            text = text.replace(g, "")
 
     # 8) 공백 정리
-    text = re.sub(r"\s{2,}", " ", text)
-    text = re.sub(r"\n\s+", "\n", text)
+    # (2칸 이상 공백을 먼저 합치므로 "\n + 공백" 조합은 더 이상 남지 않음)
+    text = _MULTI_SPACE_RE.sub(" ", text)
 
     # 9) 마지막 라인 기자명 제거
-    text = re.sub(r"\n?[가-힣]{2,3}\s*$", "", text).strip()
+    # $에 붙는 패턴이라 끝부분(공백 제외 마지막 3글자 + 줄바꿈)만 검사
+    tail_start = max(len(text.rstrip()) - 4, 0)
+    text = text[:tail_start] + _TRAILING_NAME_RE.sub("", text[tail_start:])
 
     return text.strip()
 
@@ -158,21 +314,48 @@ def is_valid_article_content(text):
 # ---------------------------------------------------------
 # 기사 URL 수집
 # ---------------------------------------------------------
-def get_article_urls(target_count=20):
+def get_article_urls(target_count=20, known_urls=None):
+    """
+    known_urls가 주어지면 증분 모드:
+    - 이미 DB에 있는 URL은 건너뜀
+    - 목록 페이지의 기사가 전부 이미 아는 URL이면 더 이상 페이지를 넘기지 않음
+    """
     urls = []
+    seen = set(known_urls) if known_urls is not None else None
     page = 1
 
     while len(urls) < target_count:
         list_url = f"{BASE_URL}/news/articleList.html?view_type=sm&page={page}"
-        res = requests.get(list_url, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(res.text, "html.parser")
+        try:
+            html = fetch_html(list_url)
+        except (requests.RequestException, CircuitOpenError) as e:
+            print(f"⚠️ 목록 페이지 {page} 요청 실패 → 수집 중단: {e}")
+            break
+
+        hrefs = extract_list_hrefs(html, backend=HTML_PARSER)
 
-        for a in soup.select(".altlist-subject a"):
-            href = a.get("href")
+        page_urls = []
+        for href in hrefs:
             if href and "articleView" in href:
-                urls.append(urljoin(BASE_URL, href))
+                page_urls.append(urljoin(BASE_URL, href))
+
+        if not page_urls:
+            print(f"📄 페이지 {page} → 기사 없음, 수집 종료")
+            break
+
+        if seen is None:
+            urls.extend(page_urls)
+        else:
+            new_urls = [u for u in page_urls if u not in seen]
+            seen.update(new_urls)
+            urls.extend(new_urls)
 
         print(f"📄 페이지 {page} → 누적 {len(urls)}개 URL 수집됨")
+
+        if seen is not None and not new_urls:
+            print(f"📄 페이지 {page} → 전부 이미 수집된 기사, 증분 수집 종료")
+            break
+
         page += 1
 
     return urls[:target_count]
@@ -182,25 +365,28 @@ def get_article_urls(target_count=20):
 # 상세 페이지 크롤링
 # ---------------------------------------------------------
 def parse_article(url):
-    res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-    soup = BeautifulSoup(res.text, "html.parser")
+    try:
+        html = fetch_html(url)
+    except (requests.RequestException, CircuitOpenError) as e:
+        print(f"⚠️ 요청 실패 → 제외: {url} ({e})")
+        return None
+    return parse_article_html(url, html)
 
-    category = clean_invisible_chars(
-        soup.select_one(".section").get_text(strip=True)
-    ) if soup.select_one(".section") else ""
 
-    title_raw = clean_invisible_chars(
-        soup.select_one(".heading").get_text(strip=True)
-    ) if soup.select_one(".heading") else ""
+def parse_article_html(url, html):
+    """
+    이미 받아온 HTML에서 기사 필드 추출 + 전처리
+    """
+    parts = extract_article_parts(html, backend=HTML_PARSER)
+
+    category = clean_invisible_chars(parts["category"])
+
+    title_raw = clean_invisible_chars(parts["title"])
     title = clean_title(title_raw)
 
-    date_tag = soup.select_one(".breadcrumbs li:nth-child(2)")
-    article_date = extract_korean_date(date_tag.get_text(strip=True)) if date_tag else None
+    article_date = extract_korean_date(parts["date"])
 
-    body_tag = soup.select_one("#article-view-content-div")
-    content_raw = clean_invisible_chars(
-        body_tag.get_text(" ", strip=True)
-    ) if body_tag else ""
+    content_raw = clean_invisible_chars(parts["body"])
     content = clean_article_body(content_raw)
 
     if not is_valid_article_content(content):
@@ -220,13 +406,47 @@ def parse_article(url):
 # ---------------------------------------------------------
 # 실행
 # ---------------------------------------------------------
-def crawl_articles(target_count: int = 200):
-    urls = get_article_urls(target_count=target_count)
-    articles = []
-
-    for u in urls:
-        art = parse_article(u)
-        if art:
-            articles.append(art)
-
-    return articles
+def iter_articles(target_count: int = 200, max_workers: int = None, known_urls=None):
+    """
+    기사를 하나씩 yield 하는 제너레이터 (전체 목록을 메모리에 쌓지 않음)
+    max_workers > 1 이면 스레드 풀로 상세 페이지를 동시에 가져옴.
+    결과 순서는 URL 목록 순서를 그대로 유지.
+    known_urls(이미 DB에 있는 URL 집합)를 주면 새 기사만 파싱함.
+    """
+    if max_workers is None:
+        max_workers = MAX_WORKERS
+
+    urls = get_article_urls(target_count=target_count, known_urls=known_urls)
+
+    if max_workers <= 1 or len(urls) <= 1:
+        for u in urls:
+            art = parse_article(u)
+            if art:
+                yield art
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # 진행 중인 작업은 최대 max_workers * 2개까지만 유지하고
+        # 앞에서부터 순서대로 완료를 기다렸다가 내보냄
+        pending = deque()
+        url_iter = iter(urls)
+
+        for u in url_iter:
+            pending.append(pool.submit(parse_article, u))
+            if len(pending) >= max_workers * 2:
+                break
+
+        while pending:
+            art = pending.popleft().result()
+            next_url = next(url_iter, None)
+            if next_url is not None:
+                pending.append(pool.submit(parse_article, next_url))
+            if art:
+                yield art
+
+
+def crawl_articles(target_count: int = 200, max_workers: int = None, known_urls=None):
+    """
+    iter_articles 결과를 리스트로 모아서 반환 (기존 호출부 호환용)
+    """
+    return list(iter_articles(target_count, max_workers=max_workers, known_urls=known_urls))
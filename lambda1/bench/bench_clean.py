@@ -0,0 +1,172 @@
+# bench_clean.py
+# 본문/제목 전처리 골든 출력 검증 + 속도 비교 (기존 구현 vs 현재 구현)
+#
+# 실행: python lambda1/bench/bench_clean.py [반복 횟수]
+import os
+import re
+import sys
+import json
+import time
+import random
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import aitimes_crawler as crawler  # noqa: E402
+
+GOLDEN_PATH = os.path.join(HERE, "clean_golden.json")
+
+
+# =========================================================
+# 기존(최적화 전) 구현 – 비교 기준용으로 그대로 보관
+# =========================================================
+def legacy_clean_invisible_chars(text):
+    if not text:
+        return ""
+    for ch in ["​", "﻿", "⁠", "᠎"]:
+        text = text.replace(ch, "")
+    return text.strip()
+
+
+def legacy_clean_title(text):
+    if not text:
+        return ""
+
+    text = text.replace("“", "\"").replace("”", "\"")
+    text = text.replace("‘", "'").replace("’", "'")
+    text = re.sub(r"^\[[^\]]+\]\s*", "", text)
+    text = re.sub(r'^"+', '', text)
+    text = re.sub(r'"+$', '', text)
+    text = re.sub(r'""+', '"', text)
+
+    return text.strip()
+
+
+def legacy_clean_article_body(text):
+    if not text:
+        return ""
+
+    remove_patterns = [
+        r"기사를\s*읽어드립니다\.?",
+        r"AI타임스입니다\.?",
+        r"이\s*뉴스는\s*AI가\s*읽어드립니다\.?",
+        r"\(사진\s*=\s*[^)]+\)",
+        r"\(그래픽\s*=\s*[^)]+\)",
+    ]
+    for p in remove_patterns:
+        text = re.sub(p, "", text)
+
+    text = re.sub(r"[가-힣]{2,10}\s*[A-Za-z0-9._%+-]+\s*\.\s*[A-Za-z]{2,4}", "", text)
+    text = re.sub(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+", "", text)
+    text = re.sub(r"(기자|특파원)", "", text)
+
+    text = re.split(r"이어\s*\d+일\s*주요\s*뉴스입니다", text)[0]
+
+    url_patterns = [
+        r"https?://\S+",
+        r"pic\.twitter\.com/\S+",
+        r"@[A-Za-z0-9_]+",
+    ]
+    for p in url_patterns:
+        text = re.sub(p, "", text)
+
+    text = text.replace("“", "\"").replace("”", "\"")
+    text = text.replace("‘", "'").replace("’", "'")
+    text = re.sub(r'""+', '"', text)
+
+    text = re.sub(
+        r"(?<=[.!?])\s*(?=[가-힣A-Za-z0-9])",
+        "\n",
+        text
+    )
+
+    garbage = ["저작권자 ©", "무단전재 및 재배포 금지", "관련기사", "추천기사", "△"]
+    for g in garbage:
+        text = text.replace(g, "")
+
+    text = re.sub(r"\s{2,}", " ", text)
+    text = re.sub(r"\n\s+", "\n", text)
+
+    text = re.sub(r"\n?[가-힣]{2,3}\s*$", "", text).strip()
+
+    return text.strip()
+
+
+# =========================================================
+# 검증
+# =========================================================
+def load_golden():
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_golden(golden):
+    failed = 0
+    for case in golden["body"]:
+        out = crawler.clean_article_body(crawler.clean_invisible_chars(case["input"]))
+        if out != case["expected"]:
+            failed += 1
+            print(f"❌ body 불일치: {case['input'][:40]!r}")
+    for case in golden["title"]:
+        out = crawler.clean_title(crawler.clean_invisible_chars(case["input"]))
+        if out != case["expected"]:
+            failed += 1
+            print(f"❌ title 불일치: {case['input']!r}")
+    return failed
+
+
+def random_bodies(golden, n, seed=0):
+    """
+    골든 입력을 문장 단위로 섞어서 실제 기사 길이(수천 자)의 본문 생성
+    """
+    rng = random.Random(seed)
+    pieces = []
+    for case in golden["body"]:
+        pieces.extend(p for p in re.split(r"(?<=[.!?])\s+", case["input"]) if p)
+
+    bodies = []
+    for _ in range(n):
+        k = rng.randint(10, 40)
+        bodies.append(" ".join(rng.choice(pieces) for _ in range(k)))
+    return bodies
+
+
+def check_random(bodies):
+    failed = 0
+    for b in bodies:
+        expected = legacy_clean_article_body(legacy_clean_invisible_chars(b))
+        if crawler.clean_article_body(crawler.clean_invisible_chars(b)) != expected:
+            failed += 1
+    return failed
+
+
+# =========================================================
+# 속도 측정
+# =========================================================
+def bench(fn_invisible, fn_body, bodies, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for b in bodies:
+            fn_body(fn_invisible(b))
+    elapsed = time.perf_counter() - start
+    return len(bodies) * repeat / elapsed
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    golden = load_golden()
+    golden_failed = check_golden(golden)
+    print(f"골든 출력 검증: {'OK' if golden_failed == 0 else f'{golden_failed}건 불일치'}")
+
+    bodies = random_bodies(golden, 500)
+    random_failed = check_random(bodies)
+    print(f"랜덤 본문 {len(bodies)}개 기존 구현과 비교: "
+          f"{'OK' if random_failed == 0 else f'{random_failed}건 불일치'}")
+
+    before = bench(legacy_clean_invisible_chars, legacy_clean_article_body, bodies, repeat)
+    after = bench(crawler.clean_invisible_chars, crawler.clean_article_body, bodies, repeat)
+    print(f"기존 구현: {before:,.0f} articles/sec")
+    print(f"현재 구현: {after:,.0f} articles/sec  (x{after / before:.2f})")
+
+    sys.exit(1 if golden_failed or random_failed else 0)
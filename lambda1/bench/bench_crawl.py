@@ -0,0 +1,132 @@
+# bench_crawl.py
+# 네트워크 없이 crawl_articles 전체 과정을 측정하는 벤치마크
+# - replay_server.py를 별도 프로세스로 띄우고 BASE_URL을 거기로 돌림
+# - pages/sec, 페이지별 응답 p50/p95, 파싱 vs 전처리 CPU 시간, peak RSS 출력
+#
+# 실행: python lambda1/bench/bench_crawl.py --workers 8 --latency-ms 80 --target 40
+import os
+import sys
+import time
+import json
+import argparse
+import resource
+import threading
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+# 로컬 서버 상대로는 속도 제한/캐시가 측정을 왜곡하므로 끔 (import 전에 설정)
+os.environ.setdefault("CRAWL_RATE", "10000")
+os.environ.setdefault("CRAWL_MAX_RATE", "10000")
+os.environ.pop("CRAWL_CACHE_DIR", None)
+
+
+class Timer:
+    """
+    함수 호출별 CPU 시간(스레드 기준) / 경과 시간 누적
+    """
+
+    def __init__(self):
+        self.cpu = 0.0
+        self.wall = []
+        self._lock = threading.Lock()
+
+    def wrap(self, fn, record_wall=False):
+        def wrapped(*args, **kwargs):
+            c0 = time.thread_time()
+            w0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                cpu = time.thread_time() - c0
+                wall = time.perf_counter() - w0
+                with self._lock:
+                    self.cpu += cpu
+                    if record_wall:
+                        self.wall.append(wall)
+        return wrapped
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def start_replay_server(latency_ms, jitter_ms):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "replay_server.py"),
+         "--latency-ms", str(latency_ms), "--jitter-ms", str(jitter_ms)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    base_url = proc.stdout.readline().strip()
+    return proc, base_url
+
+
+def run(target, workers, latency_ms, jitter_ms, parser):
+    os.environ["CRAWL_HTML_PARSER"] = parser
+    import aitimes_crawler as crawler
+
+    proc, base_url = start_replay_server(latency_ms, jitter_ms)
+    try:
+        crawler.BASE_URL = base_url
+
+        fetch = Timer()
+        parse = Timer()
+        clean = Timer()
+        crawler.fetch_html = fetch.wrap(crawler.fetch_html, record_wall=True)
+        crawler.extract_list_hrefs = parse.wrap(crawler.extract_list_hrefs)
+        crawler.extract_article_parts = parse.wrap(crawler.extract_article_parts)
+        for name in ("clean_invisible_chars", "clean_title", "clean_article_body"):
+            setattr(crawler, name, clean.wrap(getattr(crawler, name)))
+
+        cpu0 = time.process_time()
+        t0 = time.perf_counter()
+        articles = crawler.crawl_articles(target_count=target, max_workers=workers)
+        elapsed = time.perf_counter() - t0
+        cpu_total = time.process_time() - cpu0
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    pages = len(fetch.wall)
+    return {
+        "parser": parser,
+        "workers": workers,
+        "latency_ms": latency_ms,
+        "articles": len(articles),
+        "pages": pages,
+        "elapsed_sec": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(fetch.wall, 50) * 1000, 1),
+        "p95_ms": round(percentile(fetch.wall, 95) * 1000, 1),
+        "cpu_total_sec": round(cpu_total, 3),
+        "cpu_parse_sec": round(parse.cpu, 3),
+        "cpu_clean_sec": round(clean.cpu, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--target", type=int, default=40)
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--latency-ms", type=float, default=50)
+    ap.add_argument("--jitter-ms", type=float, default=0)
+    ap.add_argument("--parser", default="html.parser")
+    ap.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = ap.parse_args()
+
+    result = run(args.target, args.workers, args.latency_ms, args.jitter_ms, args.parser)
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print("\n" + "=" * 60)
+        for k, v in result.items():
+            print(f"{k:>15}: {v}")
+        print("=" * 60)
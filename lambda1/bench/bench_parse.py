@@ -0,0 +1,116 @@
+# bench_parse.py
+# HTML 파서 백엔드 비교 (저장된 페이지 fixtures/ 사용)
+# - 백엔드별 추출 결과가 완전히 같은지 검증
+# - 기사 1건당 파싱 시간, 기사 1건 파싱 중 최대 메모리(tracemalloc), 프로세스 peak RSS
+#
+# 실행: python lambda1/bench/bench_parse.py [반복 횟수]
+import os
+import sys
+import glob
+import json
+import time
+import resource
+import subprocess
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import html_backend  # noqa: E402
+
+FIXTURE_DIR = os.path.join(HERE, "fixtures")
+
+
+def load_pages(prefix):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, f"{prefix}*.html"))):
+        # newline="" → \r\n 그대로 읽기 (실제 응답 본문과 동일하게)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+# =========================================================
+# 결과 동일성 검증
+# =========================================================
+def check_identical(backend):
+    failed = 0
+    for name, html in load_pages("list_page_"):
+        if html_backend.extract_list_hrefs(html, backend) != html_backend.extract_list_hrefs(html):
+            failed += 1
+            print(f"❌ [{backend}] 목록 링크 불일치: {name}")
+
+    for name, html in load_pages("article_"):
+        expected = html_backend.extract_article_parts(html)
+        got = html_backend.extract_article_parts(html, backend)
+        if got != expected:
+            failed += 1
+            keys = [k for k in expected if expected[k] != got[k]]
+            print(f"❌ [{backend}] 기사 필드 불일치: {name} {keys}")
+    return failed
+
+
+# =========================================================
+# 백엔드 1개 측정 (서브프로세스에서 실행 → RSS가 섞이지 않게)
+# =========================================================
+def run_worker(backend, repeat):
+    articles = load_pages("article_")
+
+    # 워밍업 (lxml 로드, 정규식 캐시 등)
+    for _, html in articles[:2]:
+        html_backend.extract_article_parts(html, backend)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in articles:
+            html_backend.extract_article_parts(html, backend)
+    parse_sec = (time.perf_counter() - start) / (repeat * len(articles))
+
+    peaks = []
+    for _, html in articles:
+        tracemalloc.start()
+        html_backend.extract_article_parts(html, backend)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "articles": len(articles),
+        "ms_per_article": parse_sec * 1000,
+        "peak_kb_per_article": max(peaks) / 1024,
+        "avg_peak_kb_per_article": sum(peaks) / len(peaks) / 1024,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def bench_backend(backend, repeat):
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", backend, str(repeat)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        print(json.dumps(run_worker(sys.argv[2], int(sys.argv[3]))))
+        sys.exit(0)
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    failed = 0
+    for backend in html_backend.BACKENDS[1:]:
+        failed += check_identical(backend)
+    print(f"백엔드 간 추출 결과 동일: {'OK' if failed == 0 else f'{failed}건 불일치'}")
+
+    print(f"{'backend':<12} {'ms/article':>10} {'peak KB/article':>16} {'max RSS MB':>11}")
+    for backend in html_backend.BACKENDS:
+        r = bench_backend(backend, repeat)
+        print(f"{r['backend']:<12} {r['ms_per_article']:>10.2f} "
+              f"{r['peak_kb_per_article']:>16.0f} {r['max_rss_mb']:>11.1f}")
+
+    print("※ peak KB는 tracemalloc 기준(파이썬 힙)이라 lxml의 C 메모리는 max RSS 쪽을 참고")
+
+    sys.exit(1 if failed else 0)
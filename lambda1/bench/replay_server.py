@@ -0,0 +1,97 @@
+# replay_server.py
+# 저장된 fixtures/ 페이지를 aitimes.com 과 같은 URL 구조로 돌려주는 로컬 HTTP 서버
+# - /news/articleList.html?...&page=N   → fixtures/list_page_N.html
+# - /news/articleView.html?idxno=N      → fixtures/article_N.html
+# - 없는 페이지는 404 (목록 페이지가 끝나면 크롤러가 수집을 멈춤)
+# - --latency-ms / --jitter-ms 로 응답 지연 흉내
+#
+# 단독 실행: python lambda1/bench/replay_server.py --port 8765 --latency-ms 80
+import os
+import sys
+import time
+import random
+import socket
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(HERE, "fixtures")
+
+
+def fixture_path(path: str):
+    parsed = urlparse(path)
+    query = parse_qs(parsed.query)
+
+    if parsed.path == "/news/articleList.html":
+        name = f"list_page_{query.get('page', ['1'])[0]}.html"
+    elif parsed.path == "/news/articleView.html":
+        name = f"article_{query.get('idxno', [''])[0]}.html"
+    else:
+        return None
+
+    full = os.path.join(FIXTURE_DIR, os.path.basename(name))
+    return full if os.path.exists(full) else None
+
+
+def make_handler(latency_ms: float = 0, jitter_ms: float = 0):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            # 헤더/본문이 따로 전송될 때 delayed ACK로 40ms씩 밀리는 것 방지
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self):
+            delay = latency_ms + (random.uniform(0, jitter_ms) if jitter_ms else 0)
+            if delay:
+                time.sleep(delay / 1000)
+
+            path = fixture_path(self.path)
+            if path is None:
+                body = b"not found"
+                self.send_response(404)
+            else:
+                with open(path, "rb") as f:
+                    body = f.read()
+                self.send_response(200)
+
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return ReplayHandler
+
+
+def start_server(port: int = 0, latency_ms: float = 0, jitter_ms: float = 0):
+    """
+    백그라운드 스레드로 서버 시작 → (server, base_url)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency_ms, jitter_ms))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.latency_ms, args.jitter_ms)
+    # 첫 줄은 base_url (bench_crawl.py가 읽어감)
+    print(base_url, flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
@@ -1,25 +1,34 @@
-from typing import List, Dict
+from typing import Iterator
 
-from aitimes_crawler import crawl_articles
+from aitimes_crawler import iter_articles
 
-def get_articles_for_db(target_count:int = 50):
-    raw_articles = crawl_articles(target_count = target_count)
 
-    cleaned_articles : list[dict] = []
+def to_db_row(a: dict) -> dict:
+    return {
+        "url": a["url"].strip(),
+        "category": a.get("category", "").strip(),
+        "title": a.get("title", "").strip(),
+        "content": a.get("content", "").strip(),
+        "article_date": a.get("article_date", None),  # datetime 그대로 유지
+        "source": a.get("source", "AITimes"),
+    }
 
-    for a in raw_articles:
+
+def iter_articles_for_db(target_count:int = 50, known_urls=None) -> Iterator[dict]:
+    """
+    크롤러가 기사 1개를 내보낼 때마다 바로 DB용 dict로 바꿔서 yield
+    """
+    for a in iter_articles(target_count = target_count, known_urls = known_urls):
         try:
-            cleaned_articles.append({
-                "url": a["url"].strip(),
-                "category": a.get("category", "").strip(),
-                "title": a.get("title", "").strip(),
-                "content": a.get("content", "").strip(),
-                "article_date": a.get("article_date", None),  # datetime 그대로 유지
-                "source": a.get("source", "AITimes"),
-            })
+            yield to_db_row(a)
         except Exception as e:
-            print("어댑터 정리 중 오류 발생 -> {e}")
+            print(f"어댑터 정리 중 오류 발생 -> {e}")
             continue
 
-    
-    return cleaned_articles
\ No newline at end of file
+
+def get_articles_for_db(target_count:int = 50, known_urls=None):
+    cleaned_articles : list[dict] = list(
+        iter_articles_for_db(target_count = target_count, known_urls = known_urls)
+    )
+
+    return cleaned_articles
@@ -1,76 +1,209 @@
 # db_module.py
 import os
-import mysql.connector
+import hashlib
 from mysql.connector import Error
 from dotenv import load_dotenv
 
+from db_pool import acquire_connection, pooled_connection, pool_stats
+
 # .env 파일 불러오기
 load_dotenv()
 
+
 def get_connection():
     """
     .env에 설정한 DB_HOST, DB_USER, DB_PASSWORD, DB_NAME으로
-    MySQL 커넥션을 만들어서 리턴하는 함수
-    """
-def get_connection():
-    """
-    .env에 설정한 값으로 MySQL 커넥션 생성
+    MySQL 커넥션을 가져오는 함수
+    (warm Lambda에서는 모듈 전역 풀의 커넥션을 재사용, with pooled_connection(conn)으로 감싸서 반납)
     """
     try:
-        conn = mysql.connector.connect(
-            host=os.getenv("DB_HOST"),
-            port=int(os.getenv("DB_PORT", "3306")),  # ← 포트 추가 (기본 3306)
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            database=os.getenv("DB_NAME")
-        )
-        if conn.is_connected():
-            print("✅ DB 연결 성공")
+        conn = acquire_connection()
+        print(f"✅ DB 연결 성공 (pool={pool_stats()})")
         return conn
-    except Error as e:
+    except (Error, RuntimeError) as e:
         print("❌ DB 연결 실패:", e)
         return None
 
 
-
-def insert_articles(articles: list[dict]):
+def fetch_known_urls(limit: int = 5000) -> set:
     """
-    기사 딕셔너리 리스트를 news_articles 테이블에 INSERT 하는 함수
-    (지금은 테스트용으로만 쓸 거라, 나중에 전처리 결과랑 연결하면 됨)
+    이미 news_articles에 저장된 기사 URL을 최신순으로 최대 limit개 가져옴
+    (증분 크롤링에서 이미 수집한 기사를 건너뛰는 용도)
     """
     conn = get_connection()
     if conn is None:
-        print("DB 연결 실패로 INSERT 불가")
-        return
-
-    sql = """
-    INSERT INTO news_articles
-    (url, title, content, article_date, source, category)
-    VALUES (%s, %s, %s, %s, %s, %s)
-    ON DUPLICATE KEY UPDATE
-        title = VALUES(title),
-        content = VALUES(content),
-        article_date = VALUES(article_date),
-        source = VALUES(source),
-        category = VALUES(category)
+        print("DB 연결 실패로 기존 URL 조회 불가")
+        return set()
+
+    with pooled_connection(conn):
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT url FROM news_articles ORDER BY id DESC LIMIT %s",
+            (limit,)
+        )
+        urls = {row[0] for row in cur.fetchall()}
+        cur.close()
+    return urls
+
+
+ARTICLE_COLUMNS = ("url", "title", "content", "article_date", "source", "category", "content_hash")
+
+INSERT_ARTICLE_SQL_HEAD = """
+INSERT INTO news_articles
+(url, title, content, article_date, source, category, content_hash)
+VALUES
+"""
+
+INSERT_ARTICLE_SQL_TAIL = """
+ON DUPLICATE KEY UPDATE
+    title = VALUES(title),
+    content = VALUES(content),
+    article_date = VALUES(article_date),
+    source = VALUES(source),
+    category = VALUES(category),
+    content_hash = VALUES(content_hash)
+"""
+
+# 한 번의 INSERT 문에 넣을 최대 행 수
+WRITE_CHUNK_SIZE = int(os.getenv("DB_WRITE_CHUNK_SIZE", "100"))
+
+
+def article_hash(a: dict) -> str:
+    """
+    기사 내용 해시 (url 제외 저장 컬럼 전체 기준)
     """
+    parts = [
+        a.get("title") or "",
+        a.get("content") or "",
+        str(a.get("article_date") or ""),
+        a.get("source") or "",
+        a.get("category") or "",
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _fetch_existing_hashes(cur, urls: list[str]) -> dict:
+    if not urls:
+        return {}
+    placeholders = ", ".join(["%s"] * len(urls))
+    cur.execute(
+        f"SELECT url, content_hash FROM news_articles WHERE url IN ({placeholders})",
+        tuple(urls)
+    )
+    return {row[0]: row[1] for row in cur.fetchall()}
 
+
+def _write_batch(conn, batch: list[dict], chunk_size: int = None) -> dict:
+    """
+    배치 1개를 upsert 하고 커밋
+    - 기존 해시와 같은 기사는 건너뜀
+    - 새 기사/바뀐 기사만 multi-row INSERT ... ON DUPLICATE KEY UPDATE
+    {"inserted", "updated", "unchanged"} 개수 반환
+    """
+    if chunk_size is None:
+        chunk_size = WRITE_CHUNK_SIZE
+
+    # 같은 URL이 배치 안에 여러 번 있으면 마지막 것 사용
+    by_url = {}
+    for a in batch:
+        by_url[a["url"]] = dict(a, content_hash=article_hash(a))
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
     cur = conn.cursor()
 
-    for a in articles:
-        cur.execute(sql, (
-            a["url"],
-            a["title"],
-            a["content"],
-            a["article_date"],
-            a["source"],
-            a["category"],
-        ))
+    all_urls = list(by_url)
+    rows = []
+    for start in range(0, len(all_urls), chunk_size):
+        urls = all_urls[start:start + chunk_size]
+        existing = _fetch_existing_hashes(cur, urls)
+
+        for url in urls:
+            a = by_url[url]
+            if url not in existing:
+                counts["inserted"] += 1
+            elif existing[url] != a["content_hash"]:
+                counts["updated"] += 1
+            else:
+                counts["unchanged"] += 1
+                continue
+            rows.append(tuple(a[c] for c in ARTICLE_COLUMNS))
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        values = ", ".join(["(" + ", ".join(["%s"] * len(ARTICLE_COLUMNS)) + ")"] * len(chunk))
+        params = [v for row in chunk for v in row]
+        cur.execute(INSERT_ARTICLE_SQL_HEAD + values + INSERT_ARTICLE_SQL_TAIL, params)
 
     conn.commit()
     cur.close()
-    conn.close()
-    print(f"✅ 총 {len(articles)}개 기사 INSERT 완료")
+    return counts
+
+
+def _add_counts(total: dict, counts: dict):
+    for k, v in counts.items():
+        total[k] = total.get(k, 0) + v
+
+
+def insert_articles(articles: list[dict], chunk_size: int = None) -> dict:
+    """
+    기사 딕셔너리 리스트를 news_articles 테이블에 upsert 하는 함수
+    {"inserted", "updated", "unchanged"} 개수 반환
+    """
+    conn = get_connection()
+    if conn is None:
+        print("DB 연결 실패로 INSERT 불가")
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    with pooled_connection(conn):
+        counts = _write_batch(conn, articles, chunk_size=chunk_size)
+    print(f"✅ 총 {len(articles)}개 기사 처리 완료 → {counts}")
+    return counts
+
+
+def _write_batch_pooled(batch: list[dict], chunk_size: int = None):
+    """
+    배치 1개 저장할 때만 풀에서 커넥션을 꺼내고 바로 반납
+    (크롤링하는 동안 커넥션을 잡고 있지 않음 → wait_timeout으로 끊기거나 풀 자리를 차지하지 않게)
+    DB 연결 실패면 None
+    """
+    conn = get_connection()
+    if conn is None:
+        return None
+    with pooled_connection(conn):
+        return _write_batch(conn, batch, chunk_size=chunk_size)
+
+
+def insert_articles_stream(articles, batch_size: int = 20, chunk_size: int = None) -> dict:
+    """
+    기사 iterator를 받아서 batch_size개 모일 때마다 upsert + COMMIT
+    - 메모리에는 배치 1개 분량만 유지
+    - 커넥션은 배치마다 풀에서 꺼내 쓰고 반납
+    - 중간에 Lambda가 타임아웃 나도 이미 커밋한 배치는 남음
+    {"inserted", "updated", "unchanged"} 누적 개수 반환
+    """
+    total = {"inserted": 0, "updated": 0, "unchanged": 0}
+    batch = []
+
+    for a in articles:
+        batch.append(a)
+        if len(batch) >= batch_size:
+            counts = _write_batch_pooled(batch, chunk_size=chunk_size)
+            if counts is None:
+                print("DB 연결 실패로 INSERT 중단")
+                return total
+            _add_counts(total, counts)
+            print(f"💾 배치 저장 → 누적 {total}")
+            batch = []
+
+    if batch:
+        counts = _write_batch_pooled(batch, chunk_size=chunk_size)
+        if counts is None:
+            print("DB 연결 실패로 INSERT 중단")
+            return total
+        _add_counts(total, counts)
+
+    print(f"✅ 기사 저장 완료 → {total}")
+    return total
 
 
 # 이 파일을 직접 실행했을 때만 테스트 해보는 용도
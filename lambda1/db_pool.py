@@ -0,0 +1,166 @@
+# db_pool.py
+# Lambda warm 컨테이너 사이에서 재사용되는 MySQL 커넥션 풀
+# - 모듈 전역에 커넥션을 들고 있다가 다음 호출에서 그대로 재사용 (핸드셰이크 생략)
+# - 꺼낼 때 ping으로 상태 확인, 끊겼으면 재연결
+# - 최대 개수(DB_POOL_MAX_SIZE) 제한, 다 쓰고 있으면 DB_POOL_TIMEOUT초 대기
+# - pool_stats()로 hit/miss 확인
+# ※ 각 Lambda 폴더가 따로 배포되므로 같은 파일을 폴더마다 복사해서 사용
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+import mysql.connector
+
+_lock = threading.Condition()
+_idle = []
+_size = 0
+_stats = {"hits": 0, "misses": 0, "reconnects": 0, "discarded": 0}
+
+
+def _count(key: str):
+    with _lock:
+        _stats[key] += 1
+
+
+def _max_size() -> int:
+    return int(os.getenv("DB_POOL_MAX_SIZE", "2"))
+
+
+def _new_connection():
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=os.getenv("DB_NAME"),
+    )
+
+
+def _is_healthy(conn) -> bool:
+    """
+    ping 실패 시 1번 재연결 시도
+    """
+    try:
+        conn.ping(reconnect=False)
+        return True
+    except Exception:
+        pass
+
+    try:
+        conn.ping(reconnect=True, attempts=1, delay=0)
+        _count("reconnects")
+        return True
+    except Exception:
+        return False
+
+
+def acquire_connection(timeout: float = None):
+    """
+    풀에서 커넥션 1개 꺼내기 (없으면 새로 생성)
+    """
+    global _size
+    if timeout is None:
+        timeout = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    deadline = time.monotonic() + timeout
+
+    while True:
+        with _lock:
+            if _idle:
+                conn = _idle.pop()
+            elif _size < _max_size():
+                _size += 1
+                conn = None
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(f"DB 커넥션 풀 대기 시간 초과 (max={_max_size()})")
+                _lock.wait(remaining)
+                continue
+
+        if conn is None:
+            try:
+                conn = _new_connection()
+            except Exception:
+                with _lock:
+                    _size -= 1
+                    _lock.notify()
+                raise
+            _count("misses")
+            return conn
+
+        if _is_healthy(conn):
+            _count("hits")
+            return conn
+
+        # 복구 안 되는 커넥션은 버리고 다시 시도
+        _discard(conn)
+
+
+def release_connection(conn):
+    """
+    다 쓴 커넥션을 풀에 반납 (커밋 안 된 트랜잭션은 롤백)
+    """
+    if conn is None:
+        return
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except Exception:
+        _discard(conn)
+        return
+
+    with _lock:
+        _idle.append(conn)
+        _lock.notify()
+
+
+def _discard(conn):
+    global _size
+    try:
+        conn.close()
+    except Exception:
+        pass
+    with _lock:
+        _size -= 1
+        _stats["discarded"] += 1
+        _lock.notify()
+
+
+@contextmanager
+def pooled_connection(conn=None):
+    """
+    with pooled_connection() as conn: ... → 정상 종료면 풀에 반납
+    예외가 나면 커넥션 상태를 알 수 없으므로 반납하지 않고 닫음 (풀 자리도 같이 반환)
+    conn: 이미 acquire_connection()으로 꺼낸 커넥션을 넘기면 그 커넥션을 관리
+    """
+    if conn is None:
+        conn = acquire_connection()
+    try:
+        yield conn
+    except BaseException:
+        _discard(conn)
+        raise
+    else:
+        release_connection(conn)
+
+
+def pool_stats() -> dict:
+    with _lock:
+        return dict(_stats, size=_size, idle=len(_idle), max_size=_max_size())
+
+
+def close_all():
+    """
+    풀에 있는 커넥션 모두 닫기 (로컬 테스트 종료 시 등)
+    """
+    global _size
+    with _lock:
+        conns = list(_idle)
+        _idle.clear()
+        _size -= len(conns)
+    for conn in conns:
+        try:
+            conn.close()
+        except Exception:
+            pass
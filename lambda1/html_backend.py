@@ -0,0 +1,166 @@
+# html_backend.py
+# 크롤러 HTML 파싱 백엔드
+# - "html.parser": BeautifulSoup + 표준 라이브러리 파서 (기존 방식, 기본값)
+# - "lxml": lxml.html로 파싱 후 필요한 노드만 XPath로 꺼냄 (pip install lxml)
+# 두 백엔드 모두 같은 원문 문자열(정리 전)을 돌려줘야 함 → bench/bench_parse.py로 검증
+import re
+
+from bs4 import BeautifulSoup
+
+BACKENDS = ("html.parser", "lxml")
+
+BODY_ID = "article-view-content-div"
+
+
+# ---------------------------------------------------------
+# BeautifulSoup (html.parser)
+# ---------------------------------------------------------
+def _bs4_list_hrefs(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [a.get("href") for a in soup.select(".altlist-subject a")]
+
+
+def _bs4_article_parts(html):
+    soup = BeautifulSoup(html, "html.parser")
+
+    section = soup.select_one(".section")
+    heading = soup.select_one(".heading")
+    date_tag = soup.select_one(".breadcrumbs li:nth-child(2)")
+    body_tag = soup.select_one(f"#{BODY_ID}")
+
+    return {
+        "category": section.get_text(strip=True) if section else "",
+        "title": heading.get_text(strip=True) if heading else "",
+        "date": date_tag.get_text(strip=True) if date_tag else "",
+        "body": body_tag.get_text(" ", strip=True) if body_tag else "",
+    }
+
+
+# ---------------------------------------------------------
+# lxml
+# ---------------------------------------------------------
+_lxml_html = None
+_lxml_xpaths = None
+
+# BeautifulSoup get_text()가 건너뛰는 태그들 (Script/Stylesheet/TemplateString/Ruby 문자열)
+_SKIP_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+
+# 태그 밖 텍스트 구간 (태그 안의 \r은 건드리지 않기 위해 분리)
+_TAG_RE = re.compile(r"(<[^>]*>)")
+
+
+def _class_xpath(cls):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+def _load_lxml():
+    global _lxml_html, _lxml_xpaths
+    if _lxml_html is None:
+        try:
+            import lxml.html
+            from lxml import etree
+        except ImportError:
+            raise RuntimeError("CRAWL_HTML_PARSER=lxml 을 쓰려면 lxml 패키지가 필요합니다.")
+
+        _lxml_xpaths = {
+            "list": etree.XPath(f"//*[{_class_xpath('altlist-subject')}]//a"),
+            "category": etree.XPath(f"(//*[{_class_xpath('section')}])[1]"),
+            "title": etree.XPath(f"(//*[{_class_xpath('heading')}])[1]"),
+            # .breadcrumbs li:nth-child(2) → 부모의 두 번째 자식 요소인 li
+            "date": etree.XPath(
+                f"(//*[{_class_xpath('breadcrumbs')}]//li[count(preceding-sibling::*) = 1])[1]"
+            ),
+            "body": etree.XPath(f"(//*[@id='{BODY_ID}'])[1]"),
+        }
+        _lxml_html = lxml.html
+    return _lxml_html
+
+
+def _preserve_carriage_returns(html):
+    """
+    libxml2는 본문 텍스트의 \\r\\n을 \\n으로 바꿔버려서 html.parser와 결과가 달라짐.
+    태그 밖 텍스트의 \\r만 문자 참조(&#13;)로 바꿔서 원문 그대로 살림.
+    """
+    if "\r" not in html:
+        return html
+    parts = _TAG_RE.split(html)
+    for i in range(0, len(parts), 2):
+        if "\r" in parts[i]:
+            parts[i] = parts[i].replace("\r", "&#13;")
+    return "".join(parts)
+
+
+def _lxml_strings(el, out):
+    """
+    BeautifulSoup의 get_text()와 같은 순서로 텍스트 조각 수집
+    (주석/처리명령/스크립트 내용 제외, tail은 부모 쪽 텍스트로 포함)
+    """
+    if isinstance(el.tag, str) and el.tag not in _SKIP_TEXT_TAGS:
+        if el.text:
+            out.append(el.text)
+        for child in el:
+            _lxml_strings(child, out)
+            if child.tail:
+                out.append(child.tail)
+    return out
+
+
+def _lxml_text(el, separator=""):
+    if el is None:
+        return ""
+    strings = (s.strip() for s in _lxml_strings(el, []))
+    return separator.join(s for s in strings if s)
+
+
+def _lxml_document(html):
+    lxml_html = _load_lxml()
+    if not html or not html.strip():
+        return None
+    return lxml_html.document_fromstring(_preserve_carriage_returns(html))
+
+
+def _first(xpath, doc):
+    found = xpath(doc)
+    return found[0] if found else None
+
+
+def _lxml_list_hrefs(html):
+    doc = _lxml_document(html)
+    if doc is None:
+        return []
+    return [a.get("href") for a in _lxml_xpaths["list"](doc)]
+
+
+def _lxml_article_parts(html):
+    doc = _lxml_document(html)
+    if doc is None:
+        return {"category": "", "title": "", "date": "", "body": ""}
+
+    return {
+        "category": _lxml_text(_first(_lxml_xpaths["category"], doc)),
+        "title": _lxml_text(_first(_lxml_xpaths["title"], doc)),
+        "date": _lxml_text(_first(_lxml_xpaths["date"], doc)),
+        "body": _lxml_text(_first(_lxml_xpaths["body"], doc), " "),
+    }
+
+
+# ---------------------------------------------------------
+# 공통 진입점
+# ---------------------------------------------------------
+def extract_list_hrefs(html, backend="html.parser"):
+    """
+    목록 페이지의 .altlist-subject a 링크(href) 목록
+    """
+    if backend == "lxml":
+        return _lxml_list_hrefs(html)
+    return _bs4_list_hrefs(html)
+
+
+def extract_article_parts(html, backend="html.parser"):
+    """
+    상세 페이지에서 정리 전 원문 텍스트 추출
+    {"category", "title", "date", "body"} – 없는 항목은 ""
+    """
+    if backend == "lxml":
+        return _lxml_article_parts(html)
+    return _bs4_article_parts(html)
@@ -0,0 +1,154 @@
+# http_cache.py
+# 크롤러용 디스크 HTTP 캐시
+# - URL별로 HTML 본문 + ETag/Last-Modified 저장
+# - 다음 요청 때 If-None-Match / If-Modified-Since 를 보내고 304면 캐시 본문 사용
+# - 디렉터리 전체 크기가 max_bytes를 넘으면 오래 안 쓴 파일부터 삭제
+#   (전체 크기는 처음 한 번만 스캔하고 이후 put마다 증감으로 추적 → 넘었을 때만 디렉터리 스캔)
+# - 본문/메타는 임시 파일에 쓴 뒤 os.replace → 쓰다가 죽어도 잘린 본문이 캐시에 남지 않음
+# - offline=True면 네트워크 없이 캐시에 있는 페이지만 재생 (테스트/리플레이용)
+import os
+import json
+import time
+import hashlib
+import threading
+
+
+class HttpCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 200 * 1024 * 1024, offline: bool = False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._total = None  # 캐시 본문 전체 크기 (첫 put 때 스캔)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # -----------------------------------------------------
+    # 내부 경로
+    # -----------------------------------------------------
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".html", base + ".json"
+
+    # -----------------------------------------------------
+    # 조회 / 저장
+    # -----------------------------------------------------
+    def get(self, url: str):
+        """
+        캐시에 있으면 {"body", "etag", "last_modified", "stored_at"} 반환, 없으면 None
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "r", encoding="utf-8") as f:
+                meta["body"] = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def put(self, url: str, body: str, etag: str = None, last_modified: str = None):
+        body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+        }
+        data = body.encode("utf-8")
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan()[1]
+            try:
+                old_size = os.path.getsize(body_path)
+            except OSError:
+                old_size = 0
+
+            # 본문 먼저 교체, 메타는 마지막 (메타가 있으면 본문도 완성된 상태)
+            _atomic_write(body_path, data)
+            _atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+            self._total += len(data) - old_size
+
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def touch(self, url: str):
+        """
+        304로 캐시가 재사용됐을 때 최근 사용 시각 갱신 (LRU 삭제 순서용)
+        """
+        for path in self._paths(url):
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+
+    def conditional_headers(self, cached: dict) -> dict:
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    # -----------------------------------------------------
+    # 용량 제한
+    # -----------------------------------------------------
+    def _scan(self):
+        """
+        (본문 파일 목록 [(mtime, size, path)], 전체 크기)
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".html"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        return entries, total
+
+    def _evict(self):
+        entries, total = self._scan()
+
+        # 오래 안 쓴 순서로 삭제
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            for p in (path, path[:-len(".html")] + ".json"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+        self._total = total
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def cache_from_env():
+    """
+    CRAWL_CACHE_DIR 가 설정돼 있으면 캐시 생성 (Lambda에서는 /tmp 경로 사용)
+    """
+    cache_dir = os.getenv("CRAWL_CACHE_DIR")
+    if not cache_dir:
+        return None
+    max_mb = int(os.getenv("CRAWL_CACHE_MAX_MB", "200"))
+    offline = os.getenv("CRAWL_CACHE_OFFLINE", "0") == "1"
+    return HttpCache(cache_dir, max_bytes=max_mb * 1024 * 1024, offline=offline)
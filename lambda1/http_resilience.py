@@ -0,0 +1,240 @@
+# http_resilience.py
+# 크롤러 HTTP 요청 안정화
+# - 적응형 토큰 버킷: 응답이 빠르면 속도를 조금씩 올리고, 느리거나 429/5xx면 절반으로 줄임
+# - 재시도: 지수 백오프 + 지터, Retry-After 헤더가 있으면 그 값을 따름
+# - 요청별 타임아웃 (connect, read)
+# - 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 요청 자체를 막음
+import os
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# 적응형 토큰 버킷
+# ---------------------------------------------------------
+class AdaptiveRateLimiter:
+    def __init__(self, rate: float = 5.0, min_rate: float = 0.5, max_rate: float = 20.0,
+                 burst: float = None, target_latency: float = 1.5):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.target_latency = target_latency
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """
+        토큰 1개 얻을 때까지 대기
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self, latency: float):
+        with self._lock:
+            if latency > self.target_latency:
+                # 서버가 느려지면 속도를 조금 줄임
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                # 문제 없으면 조금씩 올림 (additive increase)
+                self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def on_throttle(self, retry_after: float = None):
+        """
+        429/5xx 응답 → 속도 절반, Retry-After가 있으면 그 시간 동안 전체 요청 멈춤
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * 0.5)
+            self._tokens = min(self._tokens, 0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+
+# ---------------------------------------------------------
+# 서킷 브레이커
+# ---------------------------------------------------------
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started = None  # half-open 시험 요청이 나가 있으면 그 시작 시각
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        open 상태면 False. reset_timeout이 지나면 half-open으로 시험 요청 1개만 허용
+        (시험 요청 결과가 나올 때까지 나머지 호출은 계속 막음)
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+                # 이미 다른 호출이 시험 요청 중
+                return False
+            # half-open: 시험 요청 결과로 닫히거나 다시 열림
+            # (결과를 못 받고 reset_timeout이 또 지나면 다음 호출이 다시 시험)
+            self._probe_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probe_started is not None or self._failures >= self.failure_threshold:
+                # half-open 시험 요청이 실패하면 바로 다시 open
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+
+# ---------------------------------------------------------
+# 재시도 유틸
+# ---------------------------------------------------------
+def parse_retry_after(value) -> float:
+    """
+    Retry-After: 초 단위 숫자 또는 HTTP 날짜 → 대기 초 (없거나 이상하면 None)
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 20.0) -> float:
+    """
+    full jitter 지수 백오프: 0 ~ min(cap, base * 2^attempt)
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class HostGuard:
+    """
+    호스트 1개에 대한 rate limiter + circuit breaker + 재시도 설정 묶음
+    """
+
+    def __init__(self, limiter: AdaptiveRateLimiter, breaker: CircuitBreaker,
+                 max_retries: int = 3, timeout=(5.0, 15.0), max_retry_after: float = 60.0):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.max_retry_after = max_retry_after
+
+    def request(self, session, url, headers=None, slot=None):
+        """
+        session.get을 재시도/속도 제한/서킷 브레이커로 감싸서 실행
+        slot: 실제 요청 중에만 잡고 있을 컨텍스트 (호스트별 동시 요청 세마포어 등)
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"서킷 오픈 상태라 요청 생략: {url}")
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            retry_after = None
+
+            try:
+                # 지연 시간은 slot 대기를 빼고 실제 요청 시간만 (대기 시간까지 재면 서버가 빨라도 속도를 줄임)
+                if slot is not None:
+                    with slot:
+                        started = time.monotonic()
+                        res = session.get(url, headers=headers, timeout=self.timeout)
+                        latency = time.monotonic() - started
+                else:
+                    started = time.monotonic()
+                    res = session.get(url, headers=headers, timeout=self.timeout)
+                    latency = time.monotonic() - started
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                self.limiter.on_throttle()
+            except requests.RequestException:
+                # 잘못된 URL / 리다이렉트 초과 등: 재시도해도 같으므로 바로 실패 처리
+                self.breaker.record_failure()
+                raise
+            else:
+                if res.status_code not in RETRY_STATUS:
+                    self.limiter.on_success(latency)
+                    self.breaker.record_success()
+                    return res
+
+                last_error = requests.HTTPError(f"{res.status_code} 응답: {url}", response=res)
+                retry_after = parse_retry_after(res.headers.get("Retry-After"))
+                if retry_after is not None:
+                    retry_after = min(retry_after, self.max_retry_after)
+                self.limiter.on_throttle(retry_after)
+
+            if attempt == self.max_retries:
+                break
+
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            print(f"🔁 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}s 후): {url} – {last_error}")
+            time.sleep(delay)
+
+        self.breaker.record_failure()
+        raise last_error
+
+
+def guard_from_env() -> HostGuard:
+    limiter = AdaptiveRateLimiter(
+        rate=float(os.getenv("CRAWL_RATE", "5")),
+        min_rate=float(os.getenv("CRAWL_MIN_RATE", "0.5")),
+        max_rate=float(os.getenv("CRAWL_MAX_RATE", "20")),
+        target_latency=float(os.getenv("CRAWL_TARGET_LATENCY", "1.5")),
+    )
+    breaker = CircuitBreaker(
+        failure_threshold=int(os.getenv("CRAWL_BREAKER_THRESHOLD", "5")),
+        reset_timeout=float(os.getenv("CRAWL_BREAKER_COOLDOWN", "30")),
+    )
+    return HostGuard(
+        limiter,
+        breaker,
+        max_retries=int(os.getenv("CRAWL_MAX_RETRIES", "3")),
+        timeout=(
+            float(os.getenv("CRAWL_CONNECT_TIMEOUT", "5")),
+            float(os.getenv("CRAWL_READ_TIMEOUT", "15")),
+        ),
+    )
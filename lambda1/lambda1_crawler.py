@@ -2,8 +2,9 @@
 
 import os
 import json
-from crawler_adapter import get_articles_for_db
-from db_module import insert_articles
+from crawler_adapter import iter_articles_for_db
+from db_module import insert_articles_stream, fetch_known_urls
+from db_pool import pool_stats
 
 
 def lambda_handler(event=None, context=None):
@@ -16,21 +17,34 @@ def lambda_handler(event=None, context=None):
     # 환경변수에서 개수 가져오기 (없으면 기본 50)
     target_count = int(os.getenv("TARGET_COUNT", "50"))
 
-    print(f"[Lambda] 시작 - target_count = {target_count}")
+    # 증분 모드: 이미 DB에 있는 URL은 다시 크롤링하지 않음 (기본 ON)
+    incremental = os.getenv("INCREMENTAL_CRAWL", "1") == "1"
 
-    # 1) 크롤링 + 전처리 + 어댑터 정리
-    articles = get_articles_for_db(target_count=target_count)
-    print(f"[Lambda] 크롤링 완료 → {len(articles)}개 기사 수집")
+    print(f"[Lambda] 시작 - target_count = {target_count}, incremental = {incremental}")
 
-    if not articles:
+    known_urls = None
+    if incremental:
+        known_urls = fetch_known_urls(limit=int(os.getenv("KNOWN_URL_LIMIT", "5000")))
+        print(f"[Lambda] 기존 URL {len(known_urls)}개 로드")
+
+    # 1) 크롤링 + 전처리 + 어댑터 정리 (기사 단위로 흘려보냄)
+    articles = iter_articles_for_db(target_count=target_count, known_urls=known_urls)
+
+    # 2) DB 저장 – batch_size개 모일 때마다 바로 커밋
+    batch_size = int(os.getenv("DB_BATCH_SIZE", "20"))
+    counts = insert_articles_stream(articles, batch_size=batch_size)
+    count = counts["inserted"] + counts["updated"] + counts["unchanged"]
+
+    if count == 0:
         msg = "가져온 기사가 없습니다."
         print("[Lambda] " + msg)
         result = {"message": msg, "count": 0}
     else:
-        # 2) DB 저장
-        insert_articles(articles)
-        result = {"message": "크롤링 & DB 저장 완료", "count": len(articles)}
-        print(f"[Lambda] DB 저장 완료 → {len(articles)}개")
+        result = {"message": "크롤링 & DB 저장 완료", "count": count, **counts}
+        print(f"[Lambda] DB 저장 완료 → {count}개 (신규 {counts['inserted']}, "
+              f"변경 {counts['updated']}, 변경 없음 {counts['unchanged']})")
+
+    print(f"[Lambda] DB 커넥션 풀 → {pool_stats()}")
 
     # Lambda 리턴 형식 흉내
     return {
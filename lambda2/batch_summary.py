@@ -0,0 +1,343 @@
+# batch_summary.py
+# 밀린 기사 백필 / 야간 일괄 요약용 Batch 모드
+# - 동기 Chat Completions를 1건씩 부르는 대신, 요청을 JSONL 파일로 만들어 Batch API에 한 번에 제출
+# - 1) 요약 대상 기사 → JSONL 요청 파일
+#   2) 파일 업로드 + batch 생성
+#   3) batch id / 기사 정보를 상태 파일(SUMMARY_BATCH_STATE)에 저장
+#   4) 나중에 poll → 완료된 batch 결과를 parse_summary_output으로 파싱해 news_ai_meta에 저장
+#
+# 실행:
+#   python batch_summary.py submit --limit 2000
+#   python batch_summary.py poll
+# 로컬 테스트: python bench/openai_stub_server.py 띄우고 OPENAI_BASE_URL=<출력된 주소> 로 실행
+import os
+import json
+import base64
+import argparse
+from datetime import datetime
+
+from llm_client import get_client
+from llm_summary import (
+    build_summary_prompt,
+    build_chat_body,
+    parse_summary_output,
+)
+from near_dup import (
+    cluster_articles,
+    dedup_enabled,
+    dedup_threshold,
+    signature_band_keys,
+    match_known,
+    encode_signature,
+    decode_signature,
+)
+from db_module import (
+    claim_articles,
+    release_leases,
+    fetch_near_dup_candidates,
+    SummaryWriter,
+    WORKER_ID,
+)
+
+STATE_PATH = os.getenv("SUMMARY_BATCH_STATE", "summary_batches.json")
+BATCH_DIR = os.getenv("SUMMARY_BATCH_DIR", "batch_requests")
+COMPLETION_WINDOW = "24h"
+DONE_STATUSES = {"completed", "failed", "expired", "cancelled"}
+# batch 완료 창(24h)보다 조금 길게 lease를 잡아서 동기 요약 Lambda가 같은 기사를 가져가지 않게
+BATCH_LEASE_SEC = int(os.getenv("SUMMARY_BATCH_LEASE_SEC", str(26 * 3600)))
+
+
+# ---------------------------------------------------------
+# 상태 파일 (제출한 batch 목록)
+# ---------------------------------------------------------
+def load_state(path: str = STATE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {"batches": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: dict, path: str = STATE_PATH):
+    # 중간에 죽어도 상태 파일이 깨지지 않도록 임시 파일에 쓰고 교체
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def pending_article_ids(state: dict) -> set:
+    """
+    아직 결과를 받지 않은 batch에 들어간 기사 id (다시 제출하지 않음)
+    """
+    ids = set()
+    for batch in state["batches"]:
+        if not batch.get("ingested"):
+            ids.update(pending_ids_of(batch))
+    return ids
+
+
+def pending_ids_of(record: dict) -> list[int]:
+    ids = []
+    for rep_id, info in record["articles"].items():
+        ids.append(int(rep_id))
+        ids.extend(d["id"] for d in info["duplicates"])
+    return ids
+
+
+# ---------------------------------------------------------
+# 1) JSONL 요청 파일
+# ---------------------------------------------------------
+def custom_id_of(article_id) -> str:
+    return f"article-{article_id}"
+
+
+def article_id_of(custom_id: str) -> int:
+    return int(custom_id.split("-", 1)[1])
+
+
+def build_batch_line(article: dict) -> dict:
+    prompt = build_summary_prompt(article["title"], article["content"])
+    return {
+        "custom_id": custom_id_of(article["id"]),
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": build_chat_body(prompt),
+    }
+
+
+def write_batch_file(articles: list[dict], path: str) -> str:
+    dir_name = os.path.dirname(path)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for article in articles:
+            f.write(json.dumps(build_batch_line(article), ensure_ascii=False) + "\n")
+    return path
+
+
+# ---------------------------------------------------------
+# 2) Batch API 호출
+# ---------------------------------------------------------
+def upload_batch_file(path: str) -> str:
+    with open(path, "rb") as f:
+        content = f.read()  # 재시도 때 다시 보낼 수 있게 메모리에 읽어 둠
+    resp = get_client().request(
+        "POST", "/files",
+        data={"purpose": "batch"},
+        files={"file": (os.path.basename(path), content, "application/jsonl")},
+        timeout=(5, 120),
+    )
+    return resp.json()["id"]
+
+
+def create_batch(input_file_id: str) -> dict:
+    resp = get_client().request(
+        "POST", "/batches",
+        json={
+            "input_file_id": input_file_id,
+            "endpoint": "/v1/chat/completions",
+            "completion_window": COMPLETION_WINDOW,
+        },
+    )
+    return resp.json()
+
+
+def get_batch(batch_id: str) -> dict:
+    return get_client().request("GET", f"/batches/{batch_id}").json()
+
+
+def download_file(file_id: str) -> str:
+    return get_client().request("GET", f"/files/{file_id}/content", timeout=(5, 120)).text
+
+
+# ---------------------------------------------------------
+# submit / poll
+# ---------------------------------------------------------
+def link_known_duplicates(clusters: list[list[dict]]) -> tuple:
+    """
+    이미 요약한 대표 기사(sql/008 서명)와 거의 같은 묶음은 batch에 넣지 않고 바로 그 요약에 연결
+    → (batch로 요약할 묶음 목록, 연결한 기사 수)
+    """
+    known = fetch_near_dup_candidates(signature_band_keys(clusters))
+    matched, rest = match_known(clusters, {i: k["signature"] for i, k in known.items()}, dedup_threshold())
+    if not matched:
+        return rest, 0
+
+    writer = SummaryWriter(flush_size=200)
+    linked = []
+    for cluster, known_id in matched:
+        for article in cluster:
+            writer.add(article["id"], known[known_id]["summary"], article.get("category", ""),
+                       known[known_id]["keywords"], duplicate_of=known_id)
+            linked.append(article["id"])
+    writer.close()
+    # 저장 실패한 기사는 batch용 26시간 lease를 바로 반납 (저장된 기사는 is_summarized = 1 이라 영향 없음)
+    release_leases(linked)
+    print(f"[Batch] 기존 요약 기사에 연결 - 기사 {len(linked)}개 (요청 안 함)")
+    return rest, len(linked)
+
+
+def _encoded_signature(article: dict):
+    sig = article.get("signature")
+    return base64.b64encode(encode_signature(sig)).decode("ascii") if sig is not None else None
+
+
+def submit(limit: int = 1000) -> dict:
+    """
+    요약 안 된 기사 최대 limit개를 batch 1개로 제출하고 상태 파일에 기록
+    (거의 같은 기사는 대표 1건만 요청, 나머지는 결과 받을 때 연결)
+    """
+    state = load_state()
+    skip = pending_article_ids(state)
+
+    claimed = claim_articles(limit, lease_sec=BATCH_LEASE_SEC)
+    articles = [a for a in claimed if a["id"] not in skip]
+
+    # 결과를 아직 안 받은 batch에 이미 들어 있는 기사는 이번에 잡은 lease를 바로 반납
+    skipped = [a["id"] for a in claimed if a["id"] in skip]
+    if skipped:
+        release_leases(skipped)
+
+    if not articles:
+        print("[Batch] 제출할 기사가 없습니다.")
+        return {}
+
+    try:
+        if dedup_enabled():
+            clusters = cluster_articles(articles, threshold=dedup_threshold())
+            clusters, _ = link_known_duplicates(clusters)
+        else:
+            clusters = [[a] for a in articles]
+        representatives = [c[0] for c in clusters]
+        if not representatives:
+            print("[Batch] 모두 기존 요약 기사에 연결 - 제출할 요청 없음")
+            return {}
+
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = write_batch_file(representatives, os.path.join(BATCH_DIR, f"summary_{stamp}.jsonl"))
+
+        file_id = upload_batch_file(path)
+        batch = create_batch(file_id)
+
+        record = {
+            "batch_id": batch["id"],
+            "input_file_id": file_id,
+            "request_file": path,
+            "status": batch.get("status", "validating"),
+            "submitted_at": datetime.now().isoformat(),
+            "ingested": False,
+            "lease_owner": WORKER_ID,
+            # 대표 기사 id → topic 계산용 category + 같은 요약을 쓸 중복 기사들
+            # + 결과 저장 때 sql/008에 같이 넣을 MinHash 서명 (base64)
+            "articles": {
+                str(c[0]["id"]): {
+                    "category": c[0].get("category", ""),
+                    "duplicates": [{"id": d["id"], "category": d.get("category", "")} for d in c[1:]],
+                    "signature": _encoded_signature(c[0]),
+                }
+                for c in clusters
+            },
+        }
+        state["batches"].append(record)
+        save_state(state)
+    except Exception:
+        # 제출 실패 → 26시간 lease를 그대로 두면 그동안 아무도 요약 못 하므로 바로 반납
+        # (batch는 만들어졌는데 상태 파일 저장만 실패한 경우엔 결과가 와도 못 받으므로 역시 반납)
+        print(f"[Batch] ❌ 제출 실패 - 기사 {len(articles)}개 lease 반납")
+        release_leases([a["id"] for a in articles])
+        raise
+
+    print(f"[Batch] 제출 완료 - batch_id={batch['id']}, 요청 {len(representatives)}건 (기사 {len(articles)}개)")
+    return record
+
+
+def ingest_results(record: dict, output_text: str) -> dict:
+    """
+    batch 결과 JSONL → news_ai_meta 저장 + 요약 완료 표시 (SummaryWriter로 200건씩 한 트랜잭션)
+    실패한 요청은 건너뜀 (poll에서 lease를 반납하므로 다음 동기 실행이나 다음 batch에서 다시 처리됨)
+    """
+    counts = {"ok": 0, "failed": 0, "duplicates_linked": 0}
+    writer = SummaryWriter(flush_size=200)
+
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        article_id = article_id_of(item["custom_id"])
+        info = record["articles"].get(str(article_id))
+        response = item.get("response") or {}
+
+        if info is None or item.get("error") or response.get("status_code") != 200:
+            counts["failed"] += 1
+            print(f"[Batch] 요청 실패 - article_id={article_id}, error={item.get('error')}")
+            continue
+
+        raw = response["body"]["choices"][0]["message"]["content"]
+        summary, keywords = parse_summary_output(raw)
+
+        signature = info.get("signature")
+        if signature:
+            signature = decode_signature(base64.b64decode(signature))
+        writer.add(article_id, summary, info["category"], keywords, signature=signature)
+        counts["ok"] += 1
+
+        for dup in info["duplicates"]:
+            writer.add(dup["id"], summary, dup["category"], keywords, duplicate_of=article_id)
+            counts["duplicates_linked"] += 1
+
+    counts["write_failed"] = writer.close()["failed"]
+    return counts
+
+
+def poll() -> list[dict]:
+    """
+    아직 결과를 안 받은 batch 상태 확인 → 완료된 것만 결과 저장
+    """
+    state = load_state()
+    results = []
+
+    for record in state["batches"]:
+        if record.get("ingested"):
+            continue
+
+        batch = get_batch(record["batch_id"])
+        record["status"] = batch["status"]
+        print(f"[Batch] {record['batch_id']} 상태: {batch['status']} {batch.get('request_counts', '')}")
+
+        if batch["status"] not in DONE_STATUSES:
+            continue
+
+        counts = {"ok": 0, "failed": 0, "duplicates_linked": 0}
+        if batch.get("output_file_id"):
+            counts = ingest_results(record, download_file(batch["output_file_id"]))
+        if batch.get("error_file_id"):
+            errors = download_file(batch["error_file_id"])
+            counts["failed"] += sum(1 for line in errors.splitlines() if line.strip())
+        # 결과를 못 받은 기사(batch 실패/만료, error 파일 등)는 lease 반납
+        # (submit 했던 프로세스의 워커 id로 잡은 lease라서 owner 지정)
+        release_leases(pending_ids_of(record), owner=record.get("lease_owner"))
+
+        record["ingested"] = True
+        record["result"] = counts
+        # 결과 하나 받을 때마다 저장 (중간에 끊겨도 같은 batch를 두 번 저장하지 않게)
+        save_state(state)
+
+        print(f"[Batch] {record['batch_id']} 저장 완료: {counts}")
+        results.append({"batch_id": record["batch_id"], **counts})
+
+    save_state(state)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_submit = sub.add_parser("submit", help="요약 안 된 기사를 batch로 제출")
+    p_submit.add_argument("--limit", type=int, default=1000)
+    sub.add_parser("poll", help="제출한 batch 상태 확인 / 결과 저장")
+    args = parser.parse_args()
+
+    if args.command == "submit":
+        submit(args.limit)
+    else:
+        poll()
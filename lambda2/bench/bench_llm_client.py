@@ -0,0 +1,115 @@
+# bench_llm_client.py
+# LLM 호출 방식 비교 벤치마크 (openai_stub_server 상대, 실제 과금 없음)
+# - legacy: 호출마다 requests.post + 고정 sleep 재시도 (기존 방식)
+# - client: llm_client.LLMClient (keep-alive 세션 + Retry-After 따르는 지터 백오프)
+# - 총 시간, 호출 p50/p95, 실패 수, 재시도 수 출력
+#
+# 실행: python lambda2/bench/bench_llm_client.py --calls 200 --workers 8 --latency-ms 30 --throttle-every 10
+import os
+import sys
+import time
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+from openai_stub_server import start_server  # noqa: E402
+from llm_client import LLMClient  # noqa: E402
+
+BODY = {
+    "model": "gpt-4o-mini",
+    "messages": [{"role": "user", "content": "제목: 벤치마크 기사\n\n본문:\n" + "내용 " * 300}],
+    "temperature": 0.2,
+    "max_tokens": 700,
+}
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def legacy_call(base_url):
+    """
+    기존 llm_summary 방식: 매번 새 커넥션, 실패 시 0.5s 고정 대기 후 최대 3번
+    """
+    for attempt in range(3):
+        try:
+            resp = requests.post(f"{base_url}/chat/completions", json=BODY, timeout=30)
+            resp.raise_for_status()
+            return resp.json()["choices"][0]["message"]["content"], attempt
+        except Exception:
+            if attempt == 2:
+                raise
+            time.sleep(0.5)
+
+
+def run(mode, base_url, calls, workers):
+    client = LLMClient(base_url, api_key="stub", pool_size=workers)
+    latencies = []
+    retries = [0]
+    failed = [0]
+
+    def one(_):
+        t0 = time.perf_counter()
+        try:
+            if mode == "legacy":
+                _, attempt = legacy_call(base_url)
+                retries[0] += attempt
+            else:
+                client.chat(BODY)
+        except Exception:
+            failed[0] += 1
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(one, range(calls)))
+    elapsed = time.perf_counter() - t0
+
+    if mode == "client":
+        retries[0] = client.stats()["retries"]
+
+    return {
+        "mode": mode,
+        "calls": calls,
+        "elapsed_sec": round(elapsed, 3),
+        "calls_per_sec": round(calls / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "failed": failed[0],
+        "retries": retries[0],
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--latency-ms", type=float, default=30)
+    ap.add_argument("--throttle-every", type=int, default=10)
+    ap.add_argument("--json", action="store_true", help="결과를 JSON 한 줄씩 출력")
+    args = ap.parse_args()
+
+    for mode in ("legacy", "client"):
+        # 모드마다 서버를 새로 띄워서 429 주기가 같게
+        server, base_url = start_server(latency_ms=args.latency_ms, throttle_every=args.throttle_every)
+        result = run(mode, base_url, args.calls, args.workers)
+        server.shutdown()
+
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print("\n" + "=" * 60)
+            for k, v in result.items():
+                print(f"{k:>15}: {v}")
+    if not args.json:
+        print("=" * 60)
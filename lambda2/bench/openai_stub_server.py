@@ -0,0 +1,243 @@
+# openai_stub_server.py
+# OpenAI API 흉내 내는 로컬 서버 (요약 Lambda 테스트용, 실제 과금/네트워크 없음)
+# - POST /v1/chat/completions        → 요약 형식에 맞는 가짜 응답 (묶음 프롬프트면 기사별 '=== 기사 N ===' 구간)
+# - POST /v1/files (multipart)       → 업로드한 batch 입력 파일 보관
+# - POST /v1/batches                 → batch 생성, --batch-delay 초 뒤 completed
+# - GET  /v1/batches/{id}            → 상태 / output_file_id
+# - GET  /v1/files/{id}/content      → 결과 JSONL
+# - --fail-every N: N번째 요청마다 실패 응답 (batch는 해당 줄이 500 결과, 동기 호출은 500)
+# - --throttle-every N: N번째 chat 요청마다 429 + retry-after-ms / x-ratelimit-* 헤더
+# - --latency-ms: chat 응답 지연
+#
+# 단독 실행: python lambda2/bench/openai_stub_server.py --port 8766 --batch-delay 2
+import re
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+_PACKED_SECTION_RE = re.compile(r"^\[기사 (\d+)\]\s*\n제목:\s*(.*)$", re.MULTILINE)
+
+
+def fake_summary(prompt: str) -> str:
+    # 묶음 프롬프트([기사 1] ~ [기사 N]) → 기사 순서대로 헤더 붙인 구간
+    sections = _PACKED_SECTION_RE.findall(prompt)
+    if sections:
+        return "\n\n".join(f"=== 기사 {no} ===\n{_fake_single(title.strip())}" for no, title in sections)
+
+    match = re.search(r"제목:\s*(.*)", prompt)
+    return _fake_single(match.group(1).strip() if match else "기사")
+
+
+def _fake_single(title: str) -> str:
+    return (
+        "요약:\n"
+        f"- {title} 관련 내용입니다.\n"
+        "- 두 번째 요약 문장입니다.\n"
+        "- 세 번째 요약 문장입니다.\n"
+        "- 네 번째 요약 문장입니다.\n\n"
+        "키워드:\n- AI\n- 뉴스\n- 요약\n- 테스트\n- 스텁"
+    )
+
+
+def chat_response(body: dict) -> dict:
+    prompt = body["messages"][-1]["content"]
+    content = fake_summary(prompt)
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "model": body.get("model"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": len(prompt) // 2, "completion_tokens": len(content) // 2,
+                  "total_tokens": (len(prompt) + len(content)) // 2},
+    }
+
+
+class StubState:
+    def __init__(self, batch_delay: float, fail_every: int, throttle_every: int = 0,
+                 latency_ms: float = 0, throttle_ms: int = 200):
+        self.batch_delay = batch_delay
+        self.fail_every = fail_every
+        self.throttle_every = throttle_every
+        self.latency_ms = latency_ms
+        self.throttle_ms = throttle_ms
+        self.chat_requests = 0
+        self.files = {}
+        self.batches = {}
+        self.requests = 0
+        self._seq = 0
+        self.lock = threading.Lock()
+
+    def next_id(self, prefix):
+        with self.lock:
+            self._seq += 1
+            return f"{prefix}-stub{self._seq}"
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            return bool(self.fail_every) and self.requests % self.fail_every == 0
+
+    def should_throttle(self) -> bool:
+        with self.lock:
+            self.chat_requests += 1
+            return bool(self.throttle_every) and self.chat_requests % self.throttle_every == 0
+
+    def run_batch(self, batch_id):
+        """
+        입력 JSONL을 줄마다 처리해서 결과 파일 생성
+        """
+        batch = self.batches[batch_id]
+        lines = []
+        failed = 0
+        for line in self.files[batch["input_file_id"]].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            req = json.loads(line)
+            if self.should_fail():
+                failed += 1
+                lines.append({"id": self.next_id("req"), "custom_id": req["custom_id"],
+                              "response": {"status_code": 500, "body": {"error": {"message": "stub failure"}}},
+                              "error": None})
+            else:
+                lines.append({"id": self.next_id("req"), "custom_id": req["custom_id"],
+                              "response": {"status_code": 200, "body": chat_response(req["body"])},
+                              "error": None})
+        output_id = self.next_id("file")
+        self.files[output_id] = "\n".join(json.dumps(x, ensure_ascii=False) for x in lines).encode("utf-8")
+        batch["output_file_id"] = output_id
+        batch["request_counts"] = {"total": len(lines), "completed": len(lines) - failed, "failed": failed}
+
+
+def make_handler(state: StubState):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def _send(self, status, payload, content_type="application/json", headers=None):
+            body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> bytes:
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length)
+
+        def do_POST(self):
+            raw = self._body()
+
+            if self.path == "/v1/chat/completions":
+                if state.latency_ms:
+                    time.sleep(state.latency_ms / 1000)
+                if state.should_throttle():
+                    return self._send(429, {"error": {"message": "rate limited (stub)"}}, headers={
+                        "retry-after-ms": str(state.throttle_ms),
+                        "x-ratelimit-remaining-requests": "0",
+                        "x-ratelimit-reset-requests": f"{state.throttle_ms}ms",
+                    })
+                if state.should_fail():
+                    return self._send(500, {"error": {"message": "stub failure"}})
+                return self._send(200, chat_response(json.loads(raw)))
+
+            if self.path == "/v1/files":
+                # multipart/form-data 에서 file 파트만 꺼냄
+                msg = BytesParser(policy=default_policy).parsebytes(
+                    f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + raw
+                )
+                content = b""
+                for part in msg.iter_parts():
+                    if part.get_param("name", header="content-disposition") == "file":
+                        content = part.get_payload(decode=True)
+                file_id = state.next_id("file")
+                state.files[file_id] = content
+                return self._send(200, {"id": file_id, "object": "file", "bytes": len(content), "purpose": "batch"})
+
+            if self.path == "/v1/batches":
+                req = json.loads(raw)
+                if req.get("input_file_id") not in state.files:
+                    return self._send(400, {"error": {"message": "unknown input_file_id"}})
+                batch_id = state.next_id("batch")
+                state.batches[batch_id] = {
+                    "id": batch_id,
+                    "object": "batch",
+                    "endpoint": req.get("endpoint"),
+                    "input_file_id": req["input_file_id"],
+                    "status": "in_progress",
+                    "output_file_id": None,
+                    "error_file_id": None,
+                    "created_at": time.time(),
+                }
+                return self._send(200, state.batches[batch_id])
+
+            self._send(404, {"error": {"message": "not found"}})
+
+        def do_GET(self):
+            match = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+            if match:
+                batch = state.batches.get(match.group(1))
+                if batch is None:
+                    return self._send(404, {"error": {"message": "not found"}})
+                with state.lock:
+                    ready = time.time() - batch["created_at"] >= state.batch_delay
+                if ready and batch["status"] == "in_progress":
+                    state.run_batch(batch["id"])
+                    batch["status"] = "completed"
+                return self._send(200, batch)
+
+            match = re.fullmatch(r"/v1/files/([\w-]+)/content", self.path)
+            if match and match.group(1) in state.files:
+                return self._send(200, state.files[match.group(1)], "application/jsonl")
+
+            self._send(404, {"error": {"message": "not found"}})
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def start_server(port: int = 0, batch_delay: float = 0, fail_every: int = 0,
+                 throttle_every: int = 0, latency_ms: float = 0):
+    """
+    백그라운드 스레드로 서버 시작 → (server, base_url)  (base_url은 OPENAI_BASE_URL 값으로 사용)
+    """
+    state = StubState(batch_delay, fail_every, throttle_every, latency_ms)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    server.stub_state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--batch-delay", type=float, default=0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.batch_delay, args.fail_every,
+                                    args.throttle_every, args.latency_ms)
+    print(base_url, flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
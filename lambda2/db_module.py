@@ -0,0 +1,405 @@
+# db_module.py
+# Lambda #2 DB 모듈: 요약 대상 기사 작업 큐 + 요약 결과 저장
+# - 요약 안 된 기사를 lease(lease_owner, lease_expires_at)로 가져감
+#   · SELECT ... FOR UPDATE SKIP LOCKED 로 다른 워커가 가져가는 중인 행은 건너뜀
+#   · lease가 만료된 행(워커가 죽었거나 타임아웃)은 다시 가져갈 수 있음
+# - 여러 요약 Lambda를 동시에 돌려도 같은 기사를 두 번 요약하지 않음
+import os
+import time
+import socket
+import uuid
+import threading
+from collections import defaultdict
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+from db_pool import acquire_connection, pooled_connection, pool_stats
+from near_dup import band_keys, encode_signature, decode_signature
+
+# .env 파일 불러오기
+load_dotenv()
+
+# 기사 lease 유지 시간 (Lambda 최대 실행 시간 15분 기준)
+LEASE_SEC = int(os.getenv("SUMMARY_LEASE_SEC", "900"))
+
+# 요약 결과 배치 저장: 이 개수가 모이거나 이 시간이 지나면 한 트랜잭션으로 저장
+FLUSH_SIZE = int(os.getenv("SUMMARY_FLUSH_SIZE", "20"))
+FLUSH_INTERVAL_SEC = float(os.getenv("SUMMARY_FLUSH_SEC", "5"))
+
+# 이 프로세스(워커) 식별자 – warm 컨테이너에서는 같은 값 유지
+WORKER_ID = os.getenv("SUMMARY_WORKER_ID") or f"{socket.gethostname()[:32]}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def get_connection():
+    """
+    .env에 설정한 DB_HOST, DB_USER, DB_PASSWORD, DB_NAME으로
+    MySQL 커넥션을 가져오는 함수
+    (warm Lambda에서는 모듈 전역 풀의 커넥션을 재사용, with pooled_connection(conn)으로 감싸서 반납)
+    """
+    try:
+        conn = acquire_connection()
+        print(f"✅ DB 연결 성공 (pool={pool_stats()})")
+        return conn
+    except (Error, RuntimeError) as e:
+        print("❌ DB 연결 실패:", e)
+        return None
+
+
+def _in_placeholders(ids) -> str:
+    return ", ".join(["%s"] * len(ids))
+
+
+# ---------------------------------------------------------
+# 작업 큐 (lease)
+# ---------------------------------------------------------
+CLAIM_SELECT_SQL = """
+SELECT id
+FROM news_articles
+WHERE is_summarized = 0
+  AND duplicate_of IS NULL
+  AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+ORDER BY id
+LIMIT %s
+FOR UPDATE SKIP LOCKED
+"""
+
+
+def claim_articles(limit: int = 10, lease_sec: int = None) -> list[dict]:
+    """
+    요약 안 된 기사를 최대 limit개 가져가면서 lease 설정
+    - 가져간 행은 lease_expires_at 까지 다른 워커가 가져가지 않음
+    - 만료된 lease는 자동으로 다시 가져갈 수 있음 (죽은 워커 복구)
+    [{"id", "title", "content", "category"}] 반환
+    """
+    if lease_sec is None:
+        lease_sec = LEASE_SEC
+
+    conn = get_connection()
+    if conn is None:
+        print("DB 연결 실패로 요약 대상 조회 불가")
+        return []
+
+    with pooled_connection(conn):
+        cur = conn.cursor()
+        conn.start_transaction()
+        cur.execute(CLAIM_SELECT_SQL, (limit,))
+        ids = [row[0] for row in cur.fetchall()]
+
+        if ids:
+            cur.execute(
+                f"""
+                UPDATE news_articles
+                SET lease_owner = %s,
+                    lease_expires_at = NOW() + INTERVAL %s SECOND
+                WHERE id IN ({_in_placeholders(ids)})
+                """,
+                (WORKER_ID, lease_sec, *ids)
+            )
+        conn.commit()
+        cur.close()
+
+        if not ids:
+            return []
+
+        cur = conn.cursor(dictionary=True)
+        cur.execute(
+            f"""
+            SELECT id, title, content, category
+            FROM news_articles
+            WHERE id IN ({_in_placeholders(ids)})
+            ORDER BY id
+            """,
+            tuple(ids)
+        )
+        rows = cur.fetchall()
+        cur.close()
+
+    print(f"[DB] 요약 대상 {len(rows)}개 lease 획득 (worker={WORKER_ID}, {lease_sec}s)")
+    return rows
+
+
+def fetch_unsummarized_articles(limit: int = 10) -> list[dict]:
+    """
+    요약 안 된 기사 가져오기 (claim_articles와 같음, 가져간 기사는 lease 설정됨)
+    """
+    return claim_articles(limit)
+
+
+def release_leases(article_ids: list[int] = None, owner: str = None) -> int:
+    """
+    이 워커(owner 지정 시 그 워커)가 잡고 있는 lease 반납 (요약 실패 등으로 다른 워커가 바로 다시 처리하도록)
+    article_ids가 없으면 아직 요약 안 된 lease 전부
+    """
+    conn = get_connection()
+    if conn is None:
+        return 0
+
+    sql = """
+    UPDATE news_articles
+    SET lease_owner = NULL, lease_expires_at = NULL
+    WHERE lease_owner = %s AND is_summarized = 0
+    """
+    params = [owner or WORKER_ID]
+    if article_ids:
+        sql += f" AND id IN ({_in_placeholders(article_ids)})"
+        params.extend(article_ids)
+
+    with pooled_connection(conn):
+        cur = conn.cursor()
+        cur.execute(sql, tuple(params))
+        released = cur.rowcount
+        conn.commit()
+        cur.close()
+
+    if released:
+        print(f"[DB] lease {released}개 반납")
+    return released
+
+
+def reclaim_expired_leases() -> int:
+    """
+    만료된 lease 정리 (claim_articles도 만료된 행을 가져가지만, 몇 개가 죽은 워커 것이었는지 확인용)
+    """
+    conn = get_connection()
+    if conn is None:
+        return 0
+
+    with pooled_connection(conn):
+        cur = conn.cursor()
+        cur.execute(
+            """
+            UPDATE news_articles
+            SET lease_owner = NULL, lease_expires_at = NULL
+            WHERE is_summarized = 0
+              AND lease_expires_at IS NOT NULL
+              AND lease_expires_at < NOW()
+            """
+        )
+        reclaimed = cur.rowcount
+        conn.commit()
+        cur.close()
+
+    if reclaimed:
+        print(f"[DB] 만료된 lease {reclaimed}개 회수")
+    return reclaimed
+
+
+# ---------------------------------------------------------
+# 요약한 대표 기사 서명 (sql/008, 라운드/실행을 넘어서 거의 같은 기사 연결)
+# ---------------------------------------------------------
+_ER_NO_SUCH_TABLE = 1146
+# sql/008 적용 전이면 조회/저장 모두 끄고 라운드 안에서만 묶음 (경고는 1번만)
+_near_dup_state = {"enabled": True}
+
+
+def _near_dup_table_missing(e: Error) -> bool:
+    if getattr(e, "errno", None) != _ER_NO_SUCH_TABLE:
+        return False
+    if _near_dup_state["enabled"]:
+        print(f"[DB] ⚠️ 거의 같은 기사 서명 테이블 없음 (sql/008 미적용) → 라운드 안에서만 묶음: {e}")
+        _near_dup_state["enabled"] = False
+    return True
+
+
+def fetch_near_dup_candidates(keys) -> dict:
+    """
+    밴드 키가 하나라도 같은, 이미 요약한 대표 기사
+    {article_id: {"signature", "summary", "keywords"}} 반환 (서명 유사도 확인은 near_dup.match_known)
+    """
+    keys = list(keys)
+    if not keys or not _near_dup_state["enabled"]:
+        return {}
+
+    conn = get_connection()
+    if conn is None:
+        return {}
+
+    try:
+        with pooled_connection(conn):
+            cur = conn.cursor(dictionary=True)
+            cur.execute(
+                f"""
+                SELECT DISTINCT s.article_id, s.signature, m.summary, m.keywords
+                FROM news_near_dup_bands b
+                JOIN news_near_dup_signatures s ON s.article_id = b.article_id
+                JOIN news_ai_meta m ON m.article_id = s.article_id
+                WHERE b.band_key IN ({_in_placeholders(keys)})
+                """,
+                tuple(keys)
+            )
+            rows = cur.fetchall()
+            cur.close()
+    except Error as e:
+        if not _near_dup_table_missing(e):
+            raise
+        return {}
+
+    return {
+        row["article_id"]: dict(row, signature=decode_signature(row["signature"]))
+        for row in rows
+    }
+
+
+def _write_signatures(cur, rows: list[dict]):
+    """
+    대표 기사 서명 + 밴드 키 저장 (재요약이면 예전 밴드 키는 지우고 새로)
+    """
+    ids = [r["article_id"] for r in rows]
+    values = ", ".join(["(%s, %s)"] * len(rows))
+    cur.execute(
+        f"""
+        INSERT INTO news_near_dup_signatures (article_id, signature)
+        VALUES {values}
+        ON DUPLICATE KEY UPDATE signature = VALUES(signature)
+        """,
+        [v for r in rows for v in (r["article_id"], encode_signature(r["signature"]))]
+    )
+    cur.execute(f"DELETE FROM news_near_dup_bands WHERE article_id IN ({_in_placeholders(ids)})", tuple(ids))
+    bands = [(key, r["article_id"]) for r in rows for key in band_keys(r["signature"])]
+    cur.execute(
+        "INSERT IGNORE INTO news_near_dup_bands (band_key, article_id) VALUES "
+        + ", ".join(["(%s, %s)"] * len(bands)),
+        [v for band in bands for v in band]
+    )
+
+
+# ---------------------------------------------------------
+# 요약 결과 배치 저장 (news_ai_meta + 요약 완료 표시를 한 트랜잭션으로)
+# ---------------------------------------------------------
+UPSERT_META_SQL_HEAD = """
+INSERT INTO news_ai_meta (article_id, summary, topic, keywords)
+VALUES
+"""
+
+UPSERT_META_SQL_TAIL = """
+ON DUPLICATE KEY UPDATE
+    summary = VALUES(summary),
+    topic = VALUES(topic),
+    keywords = VALUES(keywords)
+"""
+
+
+def write_summary_batch(conn, rows: list[dict]):
+    """
+    요약 결과 여러 건을 한 트랜잭션으로 저장
+    - news_ai_meta multi-row upsert
+    - 중복 기사 duplicate_of 표시 (대표 기사별 UPDATE 1번)
+    - 대표 기사 서명/밴드 키 저장 (signature가 있는 행만, sql/008 없으면 건너뜀)
+    - news_articles 요약 완료 + lease 해제 (UPDATE ... WHERE id IN 1번)
+    중간에 실패하면 전체 롤백 → 요약 안 된 상태로 남아서 다음 실행에서 다시 처리
+    """
+    # 같은 기사가 두 번 들어오면 마지막 결과 사용
+    by_id = {r["article_id"]: r for r in rows}
+    ids = list(by_id)
+
+    cur = conn.cursor()
+    try:
+        conn.start_transaction()
+
+        values = ", ".join(["(%s, %s, %s, %s)"] * len(ids))
+        params = [v for i in ids for v in (i, by_id[i]["summary"], by_id[i]["topic"], by_id[i]["keywords"])]
+        cur.execute(UPSERT_META_SQL_HEAD + values + UPSERT_META_SQL_TAIL, params)
+
+        duplicates = defaultdict(list)
+        for i in ids:
+            if by_id[i].get("duplicate_of"):
+                duplicates[by_id[i]["duplicate_of"]].append(i)
+        for rep_id, dup_ids in duplicates.items():
+            cur.execute(
+                f"UPDATE news_articles SET duplicate_of = %s WHERE id IN ({_in_placeholders(dup_ids)})",
+                (rep_id, *dup_ids)
+            )
+
+        signed = [by_id[i] for i in ids if by_id[i].get("signature") is not None]
+        if signed and _near_dup_state["enabled"]:
+            try:
+                _write_signatures(cur, signed)
+            except Error as e:
+                # 테이블이 없으면 이 문장만 실패 (트랜잭션의 나머지는 그대로 커밋)
+                if not _near_dup_table_missing(e):
+                    raise
+
+        cur.execute(
+            f"""
+            UPDATE news_articles
+            SET is_summarized = 1, lease_owner = NULL, lease_expires_at = NULL
+            WHERE id IN ({_in_placeholders(ids)})
+            """,
+            tuple(ids)
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+class SummaryWriter:
+    """
+    요약 결과를 모아 두었다가 FLUSH_SIZE개가 모이거나 FLUSH_INTERVAL_SEC가 지나면 한 번에 저장
+    - 여러 스레드에서 add 해도 안전
+    - 시간 기준은 add 할 때 확인 → 실행 끝에 반드시 close()로 남은 것 저장
+    """
+
+    def __init__(self, flush_size: int = None, flush_interval: float = None):
+        self.flush_size = flush_size or FLUSH_SIZE
+        self.flush_interval = FLUSH_INTERVAL_SEC if flush_interval is None else flush_interval
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.stats = {"flushes": 0, "written": 0, "failed": 0}
+
+    def add(self, article_id: int, summary: str, topic: str, keywords: str, duplicate_of: int = None,
+            signature: tuple = None):
+        """
+        signature: 대표 기사 MinHash 서명 (있으면 sql/008 테이블에 같이 저장 → 다음 실행의 중복 기사 연결용)
+        """
+        with self._lock:
+            self._buffer.append({
+                "article_id": article_id,
+                "summary": summary,
+                "topic": topic,
+                "keywords": keywords,
+                "duplicate_of": duplicate_of,
+                "signature": signature,
+            })
+            due = len(self._buffer) >= self.flush_size \
+                or time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        모아 둔 결과 저장, 저장한 건수 반환 (실패하면 0, 해당 기사들은 요약 안 된 상태로 남음)
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+            if not rows:
+                return 0
+
+            conn = get_connection()
+            if conn is None:
+                self.stats["failed"] += len(rows)
+                print(f"[DB] DB 연결 실패로 요약 결과 {len(rows)}건 저장 못 함")
+                return 0
+
+            try:
+                with pooled_connection(conn):
+                    write_summary_batch(conn, rows)
+            except Error as e:
+                self.stats["failed"] += len(rows)
+                print(f"[DB] 요약 결과 {len(rows)}건 저장 실패 (롤백): {e}")
+                return 0
+
+            self.stats["flushes"] += 1
+            self.stats["written"] += len(rows)
+            print(f"[DB] 요약 결과 {len(rows)}건 저장 (트랜잭션 1번)")
+            return len(rows)
+
+    def close(self) -> dict:
+        self.flush()
+        return dict(self.stats)
@@ -0,0 +1,102 @@
+# deadline.py
+# 요약 Lambda 실행 시간 관리
+# - Lambda context의 남은 시간(get_remaining_time_in_millis)을 기준으로 마감 시각 계산
+#   (로컬 실행 등 context가 없으면 SUMMARY_LOCAL_DEADLINE_SEC 사용)
+# - 기사 1건 처리 시간을 EWMA로 추적해서, 마감 전에 끝낼 수 있는 만큼만 다음 라운드 배정
+# - LLM 호출은 remaining()을 재시도 포함 전체 시간 예산으로 받아서 마감을 넘기지 않음
+# - 체크포인트 파일: 평균 처리 시간 / 마지막 실행 결과 저장 → 다음 실행이 바로 정확한 예측으로 시작
+import os
+import json
+import time
+import threading
+
+MARGIN_SEC = float(os.getenv("SUMMARY_DEADLINE_MARGIN_SEC", "20"))  # 마지막 저장/lease 반납용 여유
+LOCAL_DEADLINE_SEC = float(os.getenv("SUMMARY_LOCAL_DEADLINE_SEC", "900"))
+CHECKPOINT_PATH = os.getenv("SUMMARY_CHECKPOINT_PATH", "/tmp/summary_checkpoint.json")
+DEFAULT_JOB_SEC = 8.0  # 측정값이 없을 때 요약 1건 예상 시간
+MIN_CALL_SEC = float(os.getenv("SUMMARY_MIN_CALL_SEC", "5"))  # 남은 시간이 이보다 짧으면 새 LLM 호출을 시작하지 않음
+
+
+class Deadline:
+    def __init__(self, remaining_sec: float, margin_sec: float = MARGIN_SEC):
+        self.margin_sec = margin_sec
+        self._ends_at = time.monotonic() + remaining_sec
+
+    @classmethod
+    def from_context(cls, context=None):
+        """
+        Lambda context가 있으면 실제 남은 시간, 없으면 로컬 기본값
+        """
+        getter = getattr(context, "get_remaining_time_in_millis", None)
+        if callable(getter):
+            return cls(getter() / 1000)
+        return cls(LOCAL_DEADLINE_SEC)
+
+    def remaining(self) -> float:
+        """
+        여유 시간(margin)을 뺀 실제로 쓸 수 있는 시간(초)
+        """
+        return self._ends_at - time.monotonic() - self.margin_sec
+
+    def fits(self, seconds: float) -> bool:
+        """
+        seconds 걸리는 작업을 지금 시작해도 마감 전에 끝나는지
+        """
+        return self.remaining() >= seconds
+
+    def wait_limit(self, call_sec: float = MIN_CALL_SEC) -> float:
+        """
+        호출 전에 기다려도 되는 최대 시간(초) (RPM/TPM 예산 대기 등, 기다린 뒤에도 call_sec 남게)
+        """
+        return self.remaining() - call_sec
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class JobTimer:
+    """
+    작업 1건 처리 시간 EWMA (여러 스레드에서 record 가능)
+    """
+
+    def __init__(self, initial: float = DEFAULT_JOB_SEC, alpha: float = 0.3):
+        self.avg = initial
+        self.alpha = alpha
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            if self.samples == 0:
+                self.avg = seconds
+            else:
+                self.avg = self.alpha * seconds + (1 - self.alpha) * self.avg
+            self.samples += 1
+
+    def waves_within(self, seconds: float) -> int:
+        """
+        seconds 안에 끝낼 수 있는 동시 실행 wave 수 (wave 1번 = 작업 1건 평균 시간)
+        """
+        if seconds <= 0:
+            return 0
+        return int(seconds // max(self.avg, 0.001))
+
+
+def load_checkpoint(path: str = CHECKPOINT_PATH) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(data: dict, path: str = CHECKPOINT_PATH):
+    if not path:
+        return
+    try:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[Lambda2] 체크포인트 저장 실패: {e}")
@@ -2,23 +2,44 @@
 
 import os
 import json
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from llm_summary import summarize_article, parse_summary_output
+from llm_summary import (
+    summarize_article,
+    parse_summary_output,
+    estimate_summary_tokens,
+    is_summary_cached,
+    summary_cache_stats,
+    compression_stats,
+    llm_stats,
+    reset_run_stats,
+    PACK_ENABLED,
+    pack_articles,
+    summarize_packed,
+    estimate_packed_tokens,
+)
+from rate_budget import budget_from_env
+from near_dup import cluster_articles, dedup_enabled, dedup_threshold, signature_band_keys, match_known
+from deadline import Deadline, JobTimer, load_checkpoint, save_checkpoint, DEFAULT_JOB_SEC, MIN_CALL_SEC
 from db_module import (
-    fetch_unsummarized_articles,
-    insert_news_ai_meta,
-    mark_article_summarized,
+    claim_articles,
+    release_leases,
+    reclaim_expired_leases,
+    fetch_near_dup_candidates,
+    SummaryWriter,
 )
 
 
-def process_one_article(article: dict):
+def process_one_article(article: dict, writer: SummaryWriter, raw: str = None, deadline: Deadline = None):
     """
     기사 1개에 대해:
-    - 요약 생성
+    - 요약 생성 (묶음 요약으로 raw를 이미 받았으면 생략, deadline 남은 시간 안에서만 LLM 호출)
     - summary/keywords 파싱
     - topic = category 로 설정
-    - news_ai_meta에 저장
-    - 원본 기사 is_summarized = 1 로 변경
+    - writer에 넘김 → news_ai_meta 저장 + 원본 기사 is_summarized = 1 을 배치로 한 트랜잭션에 처리
+    (summary, keywords) 반환
     """
     article_id = article["id"]
     title = article["title"]
@@ -28,7 +49,8 @@ def process_one_article(article: dict):
     print(f"[Lambda2] 기사 요약 시작 - id={article_id}, 제목={title[:30]}...")
 
     # 1) LLM 요약 호출
-    raw = summarize_article(title, content)
+    if raw is None:
+        raw = summarize_article(title, content, deadline)
 
     # 2) 파싱
     summary, keywords = parse_summary_output(raw)
@@ -36,43 +58,224 @@ def process_one_article(article: dict):
     # 3) topic = category (지금은 이렇게 사용)
     topic = category
 
-    # 4) 메타 테이블에 INSERT
-    insert_news_ai_meta(article_id, summary, topic, keywords)
-``
-    # 5) 원본 기사 플래그 변경
-    mark_article_summarized(article_id)
+    # 4) 메타 테이블 저장 + 원본 기사 플래그 변경 (모아서 한 번에, 대표 기사 서명도 같이)
+    writer.add(article_id, summary, topic, keywords, signature=article.get("signature"))
 
     print(f"[Lambda2] 요약 완료 - article_id={article_id}")
 
+    return summary, keywords
+
+
+def link_duplicates(writer: SummaryWriter, representative: dict, duplicates: list[dict],
+                    summary: str, keywords: str):
+    """
+    대표 기사의 요약을 중복 기사들에도 그대로 연결 (LLM 호출 없음)
+    - duplicate_of = 대표 기사 id (피드 export 때 중복 제외용)
+    """
+    for article in duplicates:
+        writer.add(article["id"], summary, article.get("category", ""), keywords,
+                   duplicate_of=representative["id"])
+        print(f"[Lambda2] 중복 기사 연결 - article_id={article['id']} → 대표 {representative['id']}")
+
+
+def link_known_duplicates(writer: SummaryWriter, clusters: list[list[dict]], threshold: float) -> tuple:
+    """
+    이전 라운드/실행에서 이미 요약한 대표 기사(sql/008 서명)와 거의 같은 묶음은
+    LLM 호출 없이 그 요약에 연결 (묶음 전체 duplicate_of = 기존 대표 id)
+    → (새로 요약할 묶음 목록, 연결한 기사 수)
+    """
+    known = fetch_near_dup_candidates(signature_band_keys(clusters))
+    matched, rest = match_known(clusters, {i: k["signature"] for i, k in known.items()}, threshold)
+
+    linked = 0
+    for cluster, known_id in matched:
+        for article in cluster:
+            writer.add(article["id"], known[known_id]["summary"], article.get("category", ""),
+                       known[known_id]["keywords"], duplicate_of=known_id)
+            print(f"[Lambda2] 기존 요약 기사에 연결 - article_id={article['id']} → 대표 {known_id}")
+        linked += len(cluster)
+    return rest, linked
+
+
+def summarize_concurrently(clusters: list[list[dict]], concurrency: int, budget, writer: SummaryWriter,
+                           deadline: Deadline = None, timer: JobTimer = None) -> int:
+    """
+    묶음(대표 기사 + 중복 기사들)을 최대 concurrency개씩 동시에 요약
+    - 대표 기사만 LLM 요약, 나머지는 그 요약에 연결
+    - SUMMARY_PACK=1 이면 짧은 대표 기사 여러 개를 요청 1번으로 요약 (형식 깨진 기사만 단건 재요청)
+    - 요청 전에 RPM/TPM 예산을 확보 (한도 넘으면 대기)
+    - 기사별로 따로 저장하므로 한 건이 실패해도 나머지는 계속 진행
+    - 마감까지 MIN_CALL_SEC도 안 남았으면 아직 시작 안 한 작업은 건너뜀 (lease 반납 후 다음 실행에서 처리)
+    - 예산 대기도 MIN_CALL_SEC 남을 때까지만, 그 안에 자리가 안 나면 건너뜀 (마찬가지로 lease 반납)
+    - 시작한 작업의 LLM 호출도 타임아웃 / 재시도 대기를 deadline 남은 시간으로 제한
+    처리된 기사 수(중복 포함) 반환
+    """
+    by_rep = {c[0]["id"]: c for c in clusters}
+    representatives = [c[0] for c in clusters]
+    if PACK_ENABLED:
+        jobs = pack_articles(representatives)
+    else:
+        jobs = [[a] for a in representatives]
+
+    def run(job):
+        if deadline is not None and not deadline.fits(MIN_CALL_SEC):
+            return 0
+        wait_limit = deadline.wait_limit() if deadline is not None else None
+        started = time.monotonic()
+
+        if len(job) == 1:
+            rep = job[0]
+            # 캐시에 있는 요약은 LLM을 부르지 않으므로 예산도 쓰지 않음
+            if not is_summary_cached(rep["title"], rep["content"]):
+                if not budget.acquire(estimate_summary_tokens(rep["title"], rep["content"]), timeout=wait_limit):
+                    print(f"[Lambda2] 예산 대기 중 마감 임박 → 건너뜀 - article_id={rep['id']}")
+                    return 0
+            raws = {}
+        else:
+            if not budget.acquire(estimate_packed_tokens(job), timeout=wait_limit):
+                print(f"[Lambda2] 예산 대기 중 마감 임박 → 건너뜀 - article_id={[a['id'] for a in job]}")
+                return 0
+            raws = summarize_packed(job, budget, deadline)
+            print(f"[Lambda2] 묶음 요약 - 기사 {len(job)}개 요청 1번 (성공 {len(raws)}개)")
+
+        done = 0
+        for rep in job:
+            if len(job) > 1 and rep["id"] not in raws:
+                print(f"[Lambda2] 요약 실패 - article_id={rep['id']}")
+                continue
+            try:
+                summary, keywords = process_one_article(rep, writer, raws.get(rep["id"]), deadline)
+                cluster = by_rep[rep["id"]]
+                link_duplicates(writer, rep, cluster[1:], summary, keywords)
+                done += len(cluster)
+            except Exception as e:
+                print(f"[Lambda2] 요약 중 오류 - article_id={rep['id']}, error={e}")
+
+        if timer is not None:
+            timer.record(time.monotonic() - started)
+        return done
+
+    processed = 0
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = {pool.submit(run, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                processed += future.result()
+            except Exception as e:
+                print(f"[Lambda2] 요약 중 오류 - article_id={[a['id'] for a in job]}, error={e}")
+
+    return processed
+
 
 def lambda_handler(event=None, context=None):
     """
     Lambda #2 엔트리 포인트 (로컬에서도 이걸 호출)
-    - 요약 안 된 기사들 가져와서 최대 N개만 처리
+    - 남은 실행 시간 안에 끝낼 수 있는 만큼 라운드 단위로 기사를 가져와 요약
+      (최근 작업 1건 평균 시간 기준으로 남은 시간에 들어가는 만큼만 배정)
+    - 마감(SUMMARY_DEADLINE_MARGIN_SEC 여유) 전에 새 작업 배정을 멈추고 결과 저장 / lease 반납
+    - MAX_SUMMARY_PER_RUN > 0 이면 그 개수에서도 멈춤 (0이면 시간 되는 만큼)
+    - SUMMARY_CONCURRENCY개까지 동시에 LLM 호출 (SUMMARY_RPM / SUMMARY_TPM 한도 안에서)
     """
-    max_count = int(os.getenv("MAX_SUMMARY_PER_RUN", "10"))  # 한 번에 10개만
+    max_count = int(os.getenv("MAX_SUMMARY_PER_RUN", "0"))
+    concurrency = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+    round_size = int(os.getenv("SUMMARY_ROUND_SIZE", str(concurrency * 2)))
 
-    print(f"[Lambda2] 시작 - 최대 {max_count}개 기사 요약 예정")
+    deadline = Deadline.from_context(context)
+    reset_run_stats()  # 통계는 이번 실행분만
+    checkpoint = load_checkpoint()
+    timer = JobTimer(initial=checkpoint.get("avg_job_sec", DEFAULT_JOB_SEC))
 
-    articles = fetch_unsummarized_articles(limit=max_count)
-    print(f"[Lambda2] 요약 대상 기사 수: {len(articles)}")
+    print(f"[Lambda2] 시작 - 남은 시간 {deadline.remaining():.0f}s, 최대 {max_count if max_count else '∞'}개 "
+          f"(동시 {concurrency}개, 라운드 {round_size}개, 예상 {timer.avg:.1f}s/건)")
 
-    processed = 0
+    # 죽은 워커가 잡고 있던 기사 회수
+    reclaimed = reclaim_expired_leases()
+
+    writer = SummaryWriter()
+    budget = budget_from_env()
+    totals = {"claimed": 0, "processed": 0, "llm_articles": 0, "duplicates_linked": 0,
+              "known_duplicates_linked": 0, "rounds": 0}
+    stop_reason = "queue_empty"
+
+    while True:
+        limit = round_size if not max_count else min(round_size, max_count - totals["claimed"])
+        if limit <= 0:
+            stop_reason = "max_count"
+            break
+
+        # 남은 시간에 들어가는 wave 수만큼으로 라운드 크기 줄임, 1 wave도 안 되면 종료
+        limit = min(limit, timer.waves_within(deadline.remaining()) * concurrency)
+        if limit <= 0:
+            stop_reason = "deadline"
+            print(f"[Lambda2] 마감 임박 - 남은 {deadline.remaining():.0f}s < 예상 {timer.avg:.1f}s/건")
+            break
+
+        # 요약 대상 lease 획득 (다른 워커와 겹치지 않음, 이번 실행이 끝날 때까지만 유지)
+        lease_sec = int(deadline.remaining() + deadline.margin_sec) + 60
+        articles = claim_articles(limit, lease_sec=lease_sec)
+        if not articles:
+            break
+        totals["claimed"] += len(articles)
+        totals["rounds"] += 1
+
+        # 거의 같은 기사는 묶어서 대표 1건만 요약 (NEAR_DUP_ENABLED=0 이면 끔)
+        # + 이미 요약한 대표 기사와 거의 같으면 그 요약에 바로 연결
+        known_linked = 0
+        if dedup_enabled():
+            clusters = cluster_articles(articles, threshold=dedup_threshold())
+            clusters, known_linked = link_known_duplicates(writer, clusters, dedup_threshold())
+        else:
+            clusters = [[a] for a in articles]
+        totals["llm_articles"] += len(clusters)
+        totals["duplicates_linked"] += len(articles) - len(clusters)
+        totals["known_duplicates_linked"] += known_linked
+
+        totals["processed"] += known_linked
+        totals["processed"] += summarize_concurrently(clusters, concurrency, budget, writer, deadline, timer)
+        writer.flush()
+        print(f"[Lambda2] 라운드 {totals['rounds']} 완료 - 누적 {totals['processed']}개, "
+              f"남은 시간 {deadline.remaining():.0f}s, 평균 {timer.avg:.1f}s/건")
+
+        if len(articles) < limit:
+            # 큐에 남은 기사가 없음
+            break
+
+    write_stats = writer.close()
+
+    # 실패/미처리 기사는 lease를 바로 반납해서 다음 실행(다른 워커 포함)이 다시 가져가게
+    released = release_leases()
+
+    # 다음 실행이 측정된 처리 시간으로 바로 시작하도록 체크포인트 저장
+    save_checkpoint({
+        "avg_job_sec": round(timer.avg, 3),
+        "updated_at": datetime.now().isoformat(),
+        "last_run": dict(totals, stop_reason=stop_reason, released=released),
+    })
 
-    for article in articles:
-        try:
-            process_one_article(article)
-            processed += 1
-        except Exception as e:
-            print(f"[Lambda2] 요약 중 오류 - article_id={article['id']}, error={e}")
+    cache_stats = summary_cache_stats()
+    body_stats = compression_stats()
+    call_stats = llm_stats()
 
     result = {
         "message": "요약 Lambda 실행 완료",
-        "processed": processed,
-        "target": max_count,
+        **totals,
+        "stop_reason": stop_reason,
+        "leases_reclaimed": reclaimed,
+        "leases_released": released,
+        "db_writes": write_stats,
+        "summary_cache": cache_stats,
+        "body_compression": body_stats,
+        "llm": call_stats,
     }
 
-    print(f"[Lambda2] 최종 처리 개수: {processed}/{max_count}")
+    print(f"[Lambda2] 최종 처리 개수: {totals['processed']}/{totals['claimed']} (종료 사유: {stop_reason})")
+    print(f"[Lambda2] DB 저장: {write_stats}")
+    print(f"[Lambda2] 요약 캐시: {cache_stats}")
+    print(f"[Lambda2] 본문 압축: {body_stats['compressed']}/{body_stats['articles']}건, "
+          f"프롬프트 토큰 {body_stats['tokens_saved']}개 절약")
+    print(f"[Lambda2] LLM 호출: {call_stats}")
 
     return {
         
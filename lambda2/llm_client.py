@@ -0,0 +1,262 @@
+# llm_client.py
+# OpenAI 호환 LLM HTTP 클라이언트 (요약 Lambda / 이미지 프롬프트 Lambda 공용)
+# - requests.Session 1개를 모듈 전역에서 재사용 (keep-alive, 커넥션 풀) → warm 호출마다 TLS 핸드셰이크 생략
+# - 429/5xx/연결 오류는 지수 백오프 + full jitter로 재시도
+#   서버가 Retry-After / retry-after-ms / x-ratelimit-reset-* 헤더를 주면 그 시간을 따름
+# - 호출별 지연 시간, 토큰 사용량(usage) 누적 → stats() (warm 컨테이너에서는 핸들러 시작 시 reset_stats())
+# ※ 각 Lambda 폴더가 따로 배포되므로 같은 파일을 폴더마다 복사해서 사용
+import os
+import re
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNIT = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class LLMError(Exception):
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------------------------------------------------
+# 서버 대기 시간 힌트
+# ---------------------------------------------------------
+def _parse_duration(value: str):
+    """
+    x-ratelimit-reset-* 형식("1s", "6m0s", "20ms") → 초
+    """
+    parts = _DURATION_RE.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(n) * _DURATION_UNIT[u] for n, u in parts)
+
+
+def retry_hint(headers) -> float:
+    """
+    응답 헤더에서 재시도까지 기다릴 시간(초) 추출, 없으면 None
+    """
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000
+        except ValueError:
+            pass
+
+    value = (headers.get("Retry-After") or "").strip()
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+                if when.tzinfo is None:
+                    when = when.replace(tzinfo=timezone.utc)
+                return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+
+    # 429에서 요청 수/토큰 수 한도 중 막힌 쪽이 풀리는 시간
+    resets = []
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        remaining = headers.get(name.replace("reset", "remaining"))
+        reset = _parse_duration(headers.get(name))
+        if reset is not None and remaining is not None and remaining.strip() == "0":
+            resets.append(reset)
+    return max(resets) if resets else None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 20.0) -> float:
+    """
+    full jitter 지수 백오프: 0 ~ min(cap, base * 2^attempt)
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _cap_timeout(timeout, seconds: float):
+    """
+    (connect, read) 또는 숫자 타임아웃을 seconds 이하로 줄임
+    """
+    seconds = max(seconds, 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(min(t, seconds) if t is not None else seconds for t in timeout)
+    return min(timeout, seconds) if timeout is not None else seconds
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+# ---------------------------------------------------------
+# 클라이언트
+# ---------------------------------------------------------
+class LLMClient:
+    def __init__(self, base_url: str, api_key: str = None, max_retries: int = 3,
+                 timeout=(5.0, 60.0), pool_size: int = 10, max_wait: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.max_wait = max_wait
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._stats = {
+            "calls": 0, "retries": 0, "errors": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0,
+        }
+
+    def _headers(self, extra=None) -> dict:
+        headers = {}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def _record(self, latency: float, usage: dict = None, retries: int = 0, error: bool = False):
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["retries"] += retries
+            self._stats["errors"] += int(error)
+            self._latencies.append(latency)
+            for k in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                self._stats[k] += int((usage or {}).get(k) or 0)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        base_url + path 로 요청 (재시도 포함), 성공한 Response 반환
+        재시도 대상이 아닌 4xx나 재시도 소진 시 LLMError
+        """
+        return self._send(method, path, **kwargs)[0]
+
+    def _send(self, method: str, path: str, max_time: float = None, **kwargs):
+        """
+        request 본체 → (Response, 파싱한 JSON 또는 None)
+        usage 집계용으로 파싱한 JSON을 같이 돌려줘서 chat()에서 다시 파싱하지 않음
+        max_time: 재시도/대기까지 포함한 전체 시간 예산(초)
+          → 시도마다 타임아웃을 남은 시간 이하로 줄이고, 대기 후 남는 시간이 없으면 재시도하지 않음
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        headers = self._headers(kwargs.pop("headers", None))
+        timeout = kwargs.pop("timeout", self.timeout)
+
+        started = time.monotonic()
+        ends_at = started + max_time if max_time is not None else None
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            hint = None
+            attempt_timeout = timeout
+            if ends_at is not None:
+                left = ends_at - time.monotonic()
+                if left <= 0:
+                    last_error = last_error or LLMError("시간 예산 초과로 요청 생략")
+                    break
+                # read 타임아웃은 소켓 read 1번 기준이라 대략적인 상한
+                attempt_timeout = _cap_timeout(timeout, left)
+            try:
+                res = self.session.request(method, url, headers=headers, timeout=attempt_timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = LLMError(f"연결 오류: {e}")
+            else:
+                if res.status_code < 400:
+                    data = None
+                    if "json" in (res.headers.get("Content-Type") or ""):
+                        try:
+                            data = res.json()
+                        except ValueError:
+                            data = None
+                    usage = data.get("usage") if isinstance(data, dict) else None
+                    self._record(time.monotonic() - started, usage, retries=attempt)
+                    return res, data
+
+                last_error = LLMError(f"{res.status_code}: {res.text[:300]}", status=res.status_code)
+                if res.status_code not in RETRY_STATUS:
+                    break
+                hint = retry_hint(res.headers)
+
+            if attempt == self.max_retries:
+                break
+
+            delay = min(hint, self.max_wait) if hint is not None else backoff_delay(attempt)
+            if ends_at is not None and time.monotonic() + delay >= ends_at:
+                print(f"[LLM] 남은 시간 안에 재시도 불가 ({delay:.2f}s 대기 필요): {last_error}")
+                break
+            print(f"[LLM] 재시도 {attempt + 1}/{self.max_retries} ({delay:.2f}s 후): {last_error}")
+            time.sleep(delay)
+
+        self._record(time.monotonic() - started, retries=attempt, error=True)
+        raise last_error
+
+    def chat(self, body: dict, max_time: float = None) -> dict:
+        """
+        Chat Completions 호출 → 응답 JSON (max_time: 재시도 포함 전체 시간 예산, 초)
+        """
+        res, data = self._send("POST", "/chat/completions", max_time=max_time, json=body)
+        return data if data is not None else res.json()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            latencies = list(self._latencies)
+        stats["p50_ms"] = round(_percentile(latencies, 50) * 1000, 1)
+        stats["p95_ms"] = round(_percentile(latencies, 95) * 1000, 1)
+        return stats
+
+    def reset_stats(self):
+        """
+        통계 초기화 (클라이언트는 warm 호출 사이에 재사용되므로 핸들러 시작 시 호출 → 이번 실행분만 집계)
+        """
+        with self._lock:
+            self._latencies = []
+            for k in self._stats:
+                self._stats[k] = 0
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    """
+    모듈 전역 클라이언트 (warm 컨테이너에서 커넥션 재사용)
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient(
+                base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+                api_key=os.getenv("OPENAI_API_KEY"),
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+                timeout=(
+                    float(os.getenv("LLM_CONNECT_TIMEOUT", "5")),
+                    float(os.getenv("LLM_READ_TIMEOUT", "60")),
+                ),
+                pool_size=int(os.getenv("LLM_POOL_SIZE", "10")),
+            )
+        return _client
+
+
+def set_client(client: LLMClient):
+    global _client
+    with _client_lock:
+        _client = client
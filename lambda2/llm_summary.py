@@ -1,8 +1,13 @@
 import os
-import time
-import requests
+import re
+import threading
 from typing import Tuple
 
+from rate_budget import estimate_tokens
+from summary_cache import cache_from_env, summary_cache_key
+from precompress import compress_body, BODY_TOKEN_BUDGET
+from llm_client import get_client
+
 MODEL_NAME = "gpt-4o-mini"
 TEMPERATURE = 0.2
 MAX_TOKENS = 700
@@ -38,6 +43,107 @@ SUMMARY_PROMPT = """
 """
 
 
+# 짧은 기사 여러 개를 한 요청에 묶을 때 쓰는 프롬프트 (지시문은 한 번만)
+PACKED_SUMMARY_PROMPT = """
+당신은 뉴스 요약 전문가입니다.
+
+아래에 [기사 1] ~ [기사 {count}] 로 구분된 기사 {count}개가 있습니다.
+각 기사마다 따로:
+
+1) 기사 핵심 내용을 4문장으로 요약해 주세요.
+2) 기사 핵심 키워드 5개를 bullet 형식으로 출력해 주세요.
+
+기사 순서대로, 각 기사 결과 앞에 '=== 기사 번호 ===' 줄을 붙여 '텍스트'로만 출력하세요. JSON 금지.
+
+예시 출력:
+=== 기사 1 ===
+요약:
+- 문장1
+- 문장2
+- 문장3
+- 문장4
+
+키워드:
+- 키워드1
+- 키워드2
+- 키워드3
+- 키워드4
+- 키워드5
+
+=== 기사 2 ===
+요약:
+...
+
+{articles}
+"""
+
+PACKED_ARTICLE_SECTION = """[기사 {no}]
+제목: {title}
+
+본문:
+{body}
+"""
+
+_PACKED_HEADER_RE = re.compile(r"^\s*=+\s*기사\s*(\d+)\s*=+\s*$", re.MULTILINE)
+
+# 묶음 요청 설정: SUMMARY_PACK=1 일 때만 사용
+PACK_ENABLED = os.getenv("SUMMARY_PACK", "0") == "1"
+PACK_ARTICLE_TOKENS = int(os.getenv("SUMMARY_PACK_ARTICLE_TOKENS", "800"))  # 이보다 짧은 본문만 묶음
+PACK_MAX_TOKENS = int(os.getenv("SUMMARY_PACK_TOKENS", "4000"))            # 묶음 1개 프롬프트 토큰 상한
+PACK_MAX_ARTICLES = int(os.getenv("SUMMARY_PACK_MAX_ARTICLES", "6"))
+
+
+# 요약 결과 캐시 (SUMMARY_CACHE_PATH, set_summary_cache로 교체 가능)
+_summary_cache = cache_from_env()
+
+
+def set_summary_cache(cache):
+    """
+    요약 캐시 지정 (None이면 캐시 끔)
+    """
+    global _summary_cache
+    _summary_cache = cache
+
+
+def summary_cache_stats() -> dict:
+    return _summary_cache.stats() if _summary_cache else {}
+
+
+# 본문 압축으로 아낀 프롬프트 토큰 (LLM을 실제로 부른 건만 집계)
+_compression_stats = {"articles": 0, "compressed": 0, "tokens_before": 0, "tokens_after": 0}
+_compression_lock = threading.Lock()
+
+
+def _record_compression(content: str, body: str):
+    before = estimate_tokens(content)
+    after = estimate_tokens(body)
+    with _compression_lock:
+        _compression_stats["articles"] += 1
+        _compression_stats["compressed"] += int(after < before)
+        _compression_stats["tokens_before"] += before
+        _compression_stats["tokens_after"] += after
+
+
+def compression_stats() -> dict:
+    with _compression_lock:
+        stats = dict(_compression_stats)
+    stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+    return stats
+
+
+def reset_run_stats():
+    """
+    요약 캐시 / 본문 압축 / LLM 호출 통계 초기화
+    모듈 전역이라 warm 컨테이너에서 이전 실행분까지 쌓이므로 핸들러 시작 시 호출
+    """
+    if _summary_cache:
+        _summary_cache.reset_stats()
+    with _compression_lock:
+        for k in _compression_stats:
+            _compression_stats[k] = 0
+    get_client().reset_stats()
+
+
 def _get_api_key() -> str:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -45,50 +151,93 @@ def _get_api_key() -> str:
     return api_key
 
 
-def _call_openai_chat(prompt: str) -> str:
+def build_chat_body(prompt: str, max_tokens: int = MAX_TOKENS) -> dict:
     """
-    OpenAI Chat Completions HTTP API를 직접 호출하는 함수.
+    Chat Completions 요청 body (동기 호출 / batch 요청 공용)
     """
-    api_key = _get_api_key()
-
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-    json_body = {
+    return {
         "model": MODEL_NAME,
         "messages": [
             {"role": "user", "content": prompt}
         ],
         "temperature": TEMPERATURE,
-        "max_tokens": MAX_TOKENS,
+        "max_tokens": max_tokens,
     }
 
-    resp = requests.post(url, headers=headers, json=json_body, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
 
+def _call_openai_chat(prompt: str, max_tokens: int = MAX_TOKENS, deadline=None) -> str:
+    """
+    OpenAI Chat Completions HTTP API 호출 (공용 LLM 클라이언트: keep-alive 세션 + 재시도)
+    deadline이 있으면 남은 시간(deadline.remaining())을 타임아웃 + 재시도 대기 전체 예산으로 사용
+    """
+    _get_api_key()
+    max_time = deadline.remaining() if deadline is not None else None
+    if max_time is not None and max_time <= 0:
+        raise RuntimeError("마감 시간이 지나 LLM 호출 생략")
+    data = get_client().chat(build_chat_body(prompt, max_tokens), max_time=max_time)
     return data["choices"][0]["message"]["content"]
 
 
-def summarize_article(title: str, content: str) -> str:
+def llm_stats() -> dict:
+    """
+    LLM 호출 통계 (호출 수, 재시도, p50/p95 지연, 토큰 사용량)
+    """
+    return get_client().stats()
+
+
+def _prompt_body(title: str, content: str) -> str:
+    """
+    프롬프트에 넣을 본문: 토큰 예산(SUMMARY_BODY_TOKENS)을 넘으면 중요한 문장만 추려서 사용
+    """
+    return compress_body(content or "", BODY_TOKEN_BUDGET, title or "")
+
+
+def build_summary_prompt(title: str, content: str) -> str:
+    return SUMMARY_PROMPT.format(title=title, body=_prompt_body(title, content))
+
+
+def _cache_key(title: str, content: str) -> str:
+    return summary_cache_key(
+        title, _prompt_body(title, content), SUMMARY_PROMPT, MODEL_NAME, TEMPERATURE, MAX_TOKENS
+    )
+
+
+def is_summary_cached(title: str, content: str) -> bool:
+    return bool(_summary_cache) and _summary_cache.contains(_cache_key(title, content))
+
+
+def estimate_summary_tokens(title: str, content: str) -> int:
+    """
+    요약 요청 1건이 쓸 토큰 수 추정 (프롬프트 + 최대 출력 토큰)
+    """
+    return estimate_tokens(build_summary_prompt(title, content)) + MAX_TOKENS
+
+
+def summarize_article(title: str, content: str, deadline=None) -> str:
     """
     기사 제목/본문을 받아 LLM 요약(raw text)을 반환.
+    같은 입력(+같은 프롬프트/모델 설정)으로 만든 요약이 캐시에 있으면 LLM 호출 생략.
+    deadline: 있으면 LLM 호출(재시도 포함)이 남은 시간 안에서 끝나도록 제한
     """
-    if len(content) > 8000:
-        content = content[:8000]
+    cache = _summary_cache
+    key = _cache_key(title, content) if cache else None
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
 
-    prompt = SUMMARY_PROMPT.format(title=title, body=content)
+    prompt = build_summary_prompt(title, content)
+    _record_compression(content, _prompt_body(title, content))
 
-    for attempt in range(3):
-        try:
-            raw = _call_openai_chat(prompt)
-            return raw
-        except Exception as e:
-            if attempt == 2:
-                raise RuntimeError(f"요약 생성 실패: {e}")
-            time.sleep(0.5)
+    # 재시도(백오프 / Retry-After)는 LLM 클라이언트가 처리
+    try:
+        raw = _call_openai_chat(prompt, deadline=deadline)
+    except Exception as e:
+        raise RuntimeError(f"요약 생성 실패: {e}")
+
+    if cache:
+        cache.put(key, raw)
+    return raw
 
 
 def parse_summary_output(raw_text: str) -> Tuple[str, str]:
@@ -118,3 +267,116 @@ def parse_summary_output(raw_text: str) -> Tuple[str, str]:
     keywords_str = ", ".join(keyword_lines)
 
     return summary_str, keywords_str
+
+
+# ---------------------------------------------------------
+# 짧은 기사 묶음 요약 (packed prompt)
+# ---------------------------------------------------------
+def is_packable(title: str, content: str) -> bool:
+    return estimate_tokens(_prompt_body(title, content)) <= PACK_ARTICLE_TOKENS
+
+
+def build_packed_prompt(articles: list[dict]) -> str:
+    sections = [
+        PACKED_ARTICLE_SECTION.format(no=no, title=a["title"], body=_prompt_body(a["title"], a["content"]))
+        for no, a in enumerate(articles, start=1)
+    ]
+    return PACKED_SUMMARY_PROMPT.format(count=len(articles), articles="\n".join(sections))
+
+
+def estimate_packed_tokens(articles: list[dict]) -> int:
+    return estimate_tokens(build_packed_prompt(articles)) + MAX_TOKENS * len(articles)
+
+
+def pack_articles(articles: list[dict]) -> list[list[dict]]:
+    """
+    순서를 유지하면서 짧은 기사끼리 묶음 (프롬프트 토큰 PACK_MAX_TOKENS, 기사 PACK_MAX_ARTICLES개 이하)
+    긴 기사 / 캐시에 이미 있는 기사는 1개짜리 묶음으로 둠
+    """
+    groups = []
+    current = []
+    current_tokens = estimate_tokens(PACKED_SUMMARY_PROMPT)
+
+    for a in articles:
+        if not is_packable(a["title"], a["content"]) or is_summary_cached(a["title"], a["content"]):
+            groups.append([a])
+            continue
+
+        tokens = estimate_tokens(PACKED_ARTICLE_SECTION) + estimate_tokens(a["title"]) \
+            + estimate_tokens(_prompt_body(a["title"], a["content"]))
+        if current and (current_tokens + tokens > PACK_MAX_TOKENS or len(current) >= PACK_MAX_ARTICLES):
+            groups.append(current)
+            current = []
+            current_tokens = estimate_tokens(PACKED_SUMMARY_PROMPT)
+        current.append(a)
+        current_tokens += tokens
+
+    if current:
+        groups.append(current)
+    return groups
+
+
+def split_packed_output(raw_text: str) -> dict:
+    """
+    묶음 응답 → {기사 번호(1부터): 해당 구간 raw text}
+    """
+    sections = {}
+    matches = list(_PACKED_HEADER_RE.finditer(raw_text))
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(raw_text)
+        no = int(m.group(1))
+        if no not in sections:
+            sections[no] = raw_text[m.end():end].strip()
+    return sections
+
+
+def _is_well_formed(section: str) -> bool:
+    summary, keywords = parse_summary_output(section)
+    return bool(summary) and bool(keywords)
+
+
+def summarize_packed(articles: list[dict], budget=None, deadline=None) -> dict:
+    """
+    짧은 기사 여러 개를 한 번에 요약 → {article id: raw text}
+    - 각 구간은 parse_summary_output으로 그대로 파싱 가능한 형식
+    - 구간이 없거나 형식이 깨진 기사만 summarize_article(단건 호출)로 다시 요약
+      (budget이 있으면 단건 요청마다 RPM/TPM 예산 확보 후 호출, 묶음 요청 예산은 호출하는 쪽에서 확보)
+      (deadline이 있으면 예산 대기는 deadline.wait_limit()까지, 그 안에 자리가 안 나면 그 기사는 건너뜀)
+    - deadline: 묶음 / 단건 요청 모두 남은 시간 안에서만 (재시도 포함)
+    - 단건 재시도까지 실패한 기사는 결과에 없음
+    """
+    if len(articles) == 1:
+        a = articles[0]
+        return {a["id"]: summarize_article(a["title"], a["content"], deadline)}
+
+    prompt = build_packed_prompt(articles)
+    for a in articles:
+        _record_compression(a["content"], _prompt_body(a["title"], a["content"]))
+
+    try:
+        raw = _call_openai_chat(prompt, max_tokens=MAX_TOKENS * len(articles), deadline=deadline)
+        sections = split_packed_output(raw)
+    except Exception as e:
+        print(f"[LLM] 묶음 요약 실패, 기사별로 다시 요청: {e}")
+        sections = {}
+
+    results = {}
+    for no, a in enumerate(articles, start=1):
+        section = sections.get(no)
+        if section and _is_well_formed(section):
+            results[a["id"]] = section
+            if _summary_cache:
+                _summary_cache.put(_cache_key(a["title"], a["content"]), section)
+            continue
+
+        try:
+            if budget is not None and not is_summary_cached(a["title"], a["content"]):
+                wait_limit = deadline.wait_limit() if deadline is not None else None
+                if not budget.acquire(estimate_summary_tokens(a["title"], a["content"]), timeout=wait_limit):
+                    print(f"[LLM] 예산 대기 중 마감 임박 → 단건 요약 건너뜀 - article_id={a['id']}")
+                    continue
+            results[a["id"]] = summarize_article(a["title"], a["content"], deadline)
+        except Exception as e:
+            print(f"[LLM] 단건 요약도 실패 - article_id={a['id']}, error={e}")
+
+    return results
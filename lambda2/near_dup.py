@@ -0,0 +1,201 @@
+# near_dup.py
+# 거의 같은 기사(통신사 전재, 후속 보도 등) 묶기
+# - 본문을 글자 5-gram 집합(shingle)으로 바꾸고 MinHash 서명 생성
+# - LSH(밴드 단위 버킷)로 후보 쌍만 찾아서 비교 → 기사 수가 늘어도 전체 쌍 비교 안 함
+# - 추정 Jaccard 유사도가 threshold 이상이면 같은 묶음 (union-find)
+# - 요약한 대표 기사의 서명/밴드 키는 DB(sql/008)에 남겨서 다음 라운드/실행의 기사도 같은 대표에 연결
+import os
+import re
+import struct
+import hashlib
+from collections import defaultdict
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 16  # 밴드당 4행 → 유사도 0.5 근처부터 후보가 잡힘
+_EMPTY = 1 << 58  # h >> 6 (64비트 해시를 구간 번호 6비트만큼 민 값)보다 항상 큼
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set:
+    """
+    공백을 정리한 본문 → 글자 k-gram 64비트 해시 집합 (한국어는 단어보다 글자 단위가 안정적)
+    """
+    text = re.sub(r"\s+", " ", text or "").strip()
+    if len(text) <= k:
+        grams = [text] if text else []
+    else:
+        grams = (text[i:i + k] for i in range(len(text) - k + 1))
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+        for g in grams
+    }
+
+
+def minhash(shingle_set: set) -> tuple:
+    """
+    one-permutation MinHash: 해시 1번으로 NUM_PERM개 구간(bin)별 최솟값을 구함
+    (순열 NUM_PERM개를 각각 돌리는 것보다 수십 배 빠름)
+    빈 구간은 오른쪽으로 가장 가까운 값으로 채움 (rotation densification)
+    """
+    bins = [_EMPTY] * NUM_PERM
+    for h in shingle_set:
+        i = h % NUM_PERM
+        v = h >> 6
+        if v < bins[i]:
+            bins[i] = v
+
+    if _EMPTY in bins and any(v != _EMPTY for v in bins):
+        filled = list(bins)
+        for i in range(NUM_PERM):
+            j = i
+            while bins[j] == _EMPTY:
+                j = (j + 1) % NUM_PERM
+            filled[i] = bins[j]
+        bins = filled
+    return tuple(bins)
+
+
+def article_signature(article: dict):
+    """
+    기사 본문 MinHash 서명 (본문이 비어 있으면 None)
+    """
+    content = article.get("content") or ""
+    return minhash(shingles(content)) if content.strip() else None
+
+
+def encode_signature(sig: tuple) -> bytes:
+    # 값이 58비트 이하 → 8바이트씩 NUM_PERM * 8 = 512바이트
+    return struct.pack(f"<{NUM_PERM}Q", *sig)
+
+
+def decode_signature(data: bytes) -> tuple:
+    return struct.unpack(f"<{NUM_PERM}Q", bytes(data))
+
+
+def band_keys(sig: tuple, bands: int = BANDS) -> list[int]:
+    """
+    밴드별 (밴드 번호, 값들) → 64비트 정수 키 (DB 버킷, 키가 하나라도 같으면 후보)
+    """
+    rows = NUM_PERM // bands
+    keys = []
+    for i in range(bands):
+        band = struct.pack(f"<H{rows}Q", i, *sig[i * rows:(i + 1) * rows])
+        # >> 1: MySQL BIGINT(부호 있음) 범위에 맞춤
+        keys.append(int.from_bytes(hashlib.blake2b(band, digest_size=8).digest(), "little") >> 1)
+    return keys
+
+
+def estimate_similarity(sig_a: tuple, sig_b: tuple) -> float:
+    same = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return same / len(sig_a)
+
+
+class LSHIndex:
+    """
+    MinHash 서명을 밴드로 나눠 버킷에 넣고, 같은 버킷에 한 번이라도 걸린 키만 후보로 반환
+    """
+
+    def __init__(self, bands: int = BANDS):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    def _band_keys(self, sig):
+        for i in range(self.bands):
+            yield i, sig[i * self.rows:(i + 1) * self.rows]
+
+    def candidates(self, sig) -> set:
+        found = set()
+        for i, band in self._band_keys(sig):
+            found.update(self._buckets[i].get(band, ()))
+        return found
+
+    def add(self, key, sig):
+        for i, band in self._band_keys(sig):
+            self._buckets[i][band].append(key)
+
+
+def cluster_articles(articles: list[dict], threshold: float = 0.8) -> list[list[dict]]:
+    """
+    기사 목록 → 묶음 목록. 각 묶음의 첫 번째가 대표 기사(id가 가장 작은 = 먼저 수집된 기사)
+    본문이 비어 있는 기사는 묶지 않음
+    """
+    parent = list(range(len(articles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    index = LSHIndex()
+    signatures = []
+
+    for i, article in enumerate(articles):
+        sig = article_signature(article)
+        signatures.append(sig)
+        if sig is None:
+            continue
+
+        for j in index.candidates(sig):
+            if estimate_similarity(sig, signatures[j]) >= threshold:
+                parent[find(i)] = find(j)
+        index.add(i, sig)
+
+    groups = defaultdict(list)
+    for i, article in enumerate(articles):
+        groups[find(i)].append(article)
+
+    clusters = []
+    for members in groups.values():
+        members.sort(key=lambda a: a["id"])
+        clusters.append(members)
+    clusters.sort(key=lambda c: c[0]["id"])
+    return clusters
+
+
+def signature_band_keys(clusters: list[list[dict]]) -> set:
+    """
+    묶음 대표 기사마다 서명을 계산해 rep["signature"]에 붙이고 (요약 저장 때 같이 저장)
+    DB에서 이미 요약한 대표 기사 후보를 찾을 밴드 키 전체 반환
+    """
+    keys = set()
+    for cluster in clusters:
+        rep = cluster[0]
+        rep["signature"] = article_signature(rep)
+        if rep["signature"] is not None:
+            keys.update(band_keys(rep["signature"]))
+    return keys
+
+
+def match_known(clusters: list[list[dict]], known: dict, threshold: float = 0.8):
+    """
+    signature_band_keys 다음에 호출: 대표 기사를 이미 요약한 대표 기사 서명(known: {article_id: 서명})과 비교
+    → ([(묶음, 가장 비슷한 기존 대표 id)], 새로 요약할 묶음 목록) / 유사도가 같으면 id가 작은 쪽
+    (재요약으로 다시 들어온 기사는 자기 자신의 예전 서명과는 비교하지 않음)
+    """
+    matched, rest = [], []
+    for cluster in clusters:
+        rep = cluster[0]
+        sig = rep.get("signature")
+        best_id, best_sim = None, 0.0
+        if sig is not None:
+            for known_id in sorted(known):
+                if known_id == rep["id"]:
+                    continue
+                sim = estimate_similarity(sig, known[known_id])
+                if sim >= threshold and sim > best_sim:
+                    best_id, best_sim = known_id, sim
+        if best_id is None:
+            rest.append(cluster)
+        else:
+            matched.append((cluster, best_id))
+    return matched, rest
+
+
+def dedup_enabled() -> bool:
+    return os.getenv("NEAR_DUP_ENABLED", "1") == "1"
+
+
+def dedup_threshold() -> float:
+    return float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
@@ -0,0 +1,114 @@
+# precompress.py
+# 요약 전에 본문을 토큰 예산 안으로 줄이는 추출식 압축
+# - clean_article_body가 문장마다 줄바꿈으로 나눠 둔 본문을 문장 단위로 점수 매김
+#   · 위치: 앞부분(리드) 문장 우선, 마지막 문장 약간 가산
+#   · 키워드 밀도: 제목/본문에 자주 나오는 단어를 많이 담은 문장 우선
+#   · 중복: 이미 고른 문장과 단어가 많이 겹치면 감점
+# - 점수 높은 순으로 예산(SUMMARY_BODY_TOKENS)이 찰 때까지 고르고, 원래 순서대로 다시 이어 붙임
+# - 예산 안에 들어오는 본문은 그대로 사용
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+from rate_budget import estimate_tokens
+
+BODY_TOKEN_BUDGET = int(os.getenv("SUMMARY_BODY_TOKENS", "3000"))
+
+_WORD_RE = re.compile(r"[가-힣]{2,}|[A-Za-z][A-Za-z0-9]+|\d+")
+
+# 한국어 조사/어미만 달라지는 경우를 줄이기 위해 흔한 끝 글자 제거
+_JOSA_RE = re.compile(r"(은|는|이|가|을|를|의|에|에서|으로|로|와|과|도|만|이다|했다|한다|하는|했으며)$")
+
+
+def _words(text: str) -> list[str]:
+    out = []
+    for w in _WORD_RE.findall(text.lower()):
+        stem = _JOSA_RE.sub("", w) if len(w) > 2 else w
+        out.append(stem)
+    return out
+
+
+def _truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    문장 하나가 예산보다 길 때: 앞에서부터 예산만큼 자름
+    """
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def score_sentences(sentences: list[str], title: str = "") -> list[float]:
+    words_per = [_words(s) for s in sentences]
+    freq = Counter(w for ws in words_per for w in set(ws))
+    title_words = set(_words(title))
+    n = len(sentences)
+
+    scores = []
+    for i, ws in enumerate(words_per):
+        if not ws:
+            scores.append(0.0)
+            continue
+
+        # 키워드 밀도: 여러 문장에 나오는 단어(=기사 주제어) 비중 + 제목 단어 가산
+        density = sum(freq[w] - 1 for w in ws) / len(ws) / max(n - 1, 1)
+        title_hit = len(title_words.intersection(ws)) / len(title_words) if title_words else 0.0
+
+        # 위치: 첫 문장 1.0 에서 점점 감소, 마지막 문장은 결론/전망인 경우가 많아 조금 가산
+        position = 1.0 / (1 + i * 0.3)
+        if n > 2 and i == n - 1:
+            position += 0.2
+
+        scores.append(position + density + title_hit)
+    return scores
+
+
+@lru_cache(maxsize=256)
+def compress_body(content: str, budget: int = BODY_TOKEN_BUDGET, title: str = "") -> str:
+    """
+    본문을 토큰 예산 안으로 압축 (같은 입력이면 항상 같은 결과 → 요약 캐시 키에 그대로 사용 가능)
+    """
+    content = content or ""
+    if estimate_tokens(content) <= budget:
+        return content
+
+    sentences = [s.strip() for s in content.split("\n") if s.strip()]
+    if len(sentences) <= 1:
+        return _truncate_to_tokens(content, budget)
+
+    scores = score_sentences(sentences, title)
+    word_sets = [set(_words(s)) for s in sentences]
+    costs = [estimate_tokens(s) + 1 for s in sentences]  # +1: 줄바꿈
+
+    chosen = []
+    chosen_words = set()
+    used = 0
+    remaining = set(range(len(sentences)))
+
+    while remaining:
+        # 중복 감점: 이미 고른 문장들과 단어가 겹치는 비율만큼 점수 깎음
+        def adjusted(i):
+            ws = word_sets[i]
+            overlap = len(ws & chosen_words) / len(ws) if ws else 1.0
+            return scores[i] * (1 - 0.7 * overlap)
+
+        best = max(remaining, key=lambda i: (adjusted(i), -i))
+        remaining.discard(best)
+
+        if used + costs[best] > budget:
+            # 예산 초과 문장은 건너뛰고 더 짧은 다음 후보 시도
+            continue
+
+        chosen.append(best)
+        chosen_words |= word_sets[best]
+        used += costs[best]
+
+    if not chosen:
+        return _truncate_to_tokens(sentences[0], budget)
+
+    return "\n".join(sentences[i] for i in sorted(chosen))
@@ -0,0 +1,76 @@
+# rate_budget.py
+# LLM 호출 속도 예산 (분당 요청 수 RPM + 분당 토큰 수 TPM)
+# - 최근 60초 동안 보낸 요청/토큰을 기록해 두고, 한도를 넘으면 자리가 날 때까지 대기
+# - 여러 스레드가 동시에 acquire 해도 안전
+import os
+import time
+import threading
+from collections import deque
+
+WINDOW_SEC = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 보수적인 토큰 수 추정
+    (영문/숫자 약 4글자당 1토큰, 한글 등 비ASCII는 글자당 1토큰으로 넉넉히)
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_count = len(text) - non_ascii
+    return ascii_count // 4 + non_ascii + 1
+
+
+class RateBudget:
+    def __init__(self, rpm: int = 500, tpm: int = 200000):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._events = deque()  # (시각, 토큰 수)
+        self._tokens_in_window = 0
+        self._lock = threading.Condition()
+
+    def _expire(self, now):
+        while self._events and now - self._events[0][0] >= WINDOW_SEC:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def _wait_time(self, now, tokens) -> float:
+        """
+        지금 보내도 되면 0, 아니면 가장 오래된 기록이 빠질 때까지 남은 시간
+        """
+        if not self._events:
+            return 0.0
+        too_many_requests = len(self._events) >= self.rpm
+        too_many_tokens = self._tokens_in_window + tokens > self.tpm
+        if not too_many_requests and not too_many_tokens:
+            return 0.0
+        return max(0.01, WINDOW_SEC - (now - self._events[0][0]))
+
+    def acquire(self, tokens: int = 0, timeout: float = None) -> bool:
+        """
+        요청 1건(예상 토큰 tokens) 보낼 자리가 날 때까지 대기 후 기록 → True
+        timeout: 최대 대기 시간(초), 그 안에 자리가 안 나면 기록 없이 False (None이면 무제한 대기)
+        """
+        ends_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                wait = self._wait_time(now, tokens)
+                if wait <= 0:
+                    self._events.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return True
+                if ends_at is not None:
+                    if now >= ends_at:
+                        return False
+                    wait = min(wait, ends_at - now)
+                self._lock.wait(wait)
+
+
+def budget_from_env() -> RateBudget:
+    return RateBudget(
+        rpm=int(os.getenv("SUMMARY_RPM", "500")),
+        tpm=int(os.getenv("SUMMARY_TPM", "200000")),
+    )
@@ -0,0 +1,104 @@
+# summary_cache.py
+# LLM 요약 결과 캐시 (sqlite 파일)
+# - 키: (정규화한 제목, 프롬프트에 실제로 들어간 본문, 프롬프트 버전, 모델, temperature, max_tokens) 해시
+#   → SUMMARY_PROMPT나 MODEL_NAME이 바뀌면 키가 달라져서 예전 결과는 자동으로 안 쓰임
+# - 같은 기사를 다시 넣거나 실패 후 재실행해도 LLM을 다시 부르지 않음
+# - Lambda에서는 /tmp 경로 사용 (warm 컨테이너 동안 유지), 로컬에서는 원하는 경로 지정
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+def normalize_title(title: str) -> str:
+    return re.sub(r"\s+", " ", (title or "")).strip()
+
+
+def summary_cache_key(title: str, body: str, prompt: str, model: str,
+                      temperature: float, max_tokens: int) -> str:
+    payload = json.dumps(
+        {
+            "title": normalize_title(title),
+            "body": body or "",
+            "prompt_version": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summary_cache (
+                cache_key TEXT PRIMARY KEY,
+                raw_output TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT raw_output FROM summary_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            self._stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def contains(self, key: str) -> bool:
+        """
+        통계에 영향 없이 존재 여부만 확인
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM summary_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def put(self, key: str, raw_output: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summary_cache (cache_key, raw_output, created_at) VALUES (?, ?, ?)",
+                (key, raw_output, time.time()),
+            )
+            self._conn.commit()
+            self._stats["writes"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            hit_rate = self._stats["hits"] / lookups if lookups else 0.0
+            return dict(self._stats, hit_rate=round(hit_rate, 3))
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"hits": 0, "misses": 0, "writes": 0}
+
+
+def cache_from_env():
+    """
+    SUMMARY_CACHE_PATH (기본 /tmp/summary_cache.sqlite3), 빈 값이면 캐시 끔
+    """
+    path = os.getenv("SUMMARY_CACHE_PATH", "/tmp/summary_cache.sqlite3")
+    if not path:
+        return None
+    return SummaryCache(path)
@@ -1,26 +1,23 @@
 import os, json
 import boto3
-import mysql.connector
 from datetime import datetime, timezone, timedelta
 
+from db_pool import acquire_connection, pooled_connection, pool_stats
+
 s3 = boto3.client("s3")
 KST = timezone(timedelta(hours=9))
 
 
 def get_conn():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        port=int(os.getenv("DB_PORT", "3306")),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        database=os.getenv("DB_NAME"),
-    )
+    # warm 컨테이너에서는 풀에 남아 있는 커넥션 재사용 (with pooled_connection(conn)으로 반납)
+    return acquire_connection()
 
 
 def fetch_kst_8am_window_summarized(limit=200):
     """
     KST 기준 08:00 ~ 다음날 08:00 윈도우에서 '요약 완료' 기사만 가져옴
     기준: article_date
+    (Lambda #2가 중복으로 묶은 기사(duplicate_of 있음)는 대표 기사만 내보냄)
     """
     now = datetime.now(KST)
     today_8 = now.replace(hour=8, minute=0, second=0, microsecond=0)
@@ -34,9 +31,6 @@ def fetch_kst_8am_window_summarized(limit=200):
         end = today_8 + timedelta(days=1)
         window_date = start.date().isoformat()
 
-    conn = get_conn()
-    cur = conn.cursor(dictionary=True)
-
     sql = """
     SELECT
       a.id, a.title, a.category, a.article_date, a.url,
@@ -44,20 +38,22 @@ def fetch_kst_8am_window_summarized(limit=200):
     FROM news_articles a
     LEFT JOIN news_ai_meta m ON m.article_id = a.id
     WHERE a.is_summarized = 1
+      AND a.duplicate_of IS NULL
       AND a.article_date >= %s AND a.article_date < %s
     ORDER BY a.article_date DESC, a.id DESC
     LIMIT %s
     """
 
-    cur.execute(sql, (
-        start.strftime("%Y-%m-%d %H:%M:%S"),
-        end.strftime("%Y-%m-%d %H:%M:%S"),
-        limit
-    ))
-    rows = cur.fetchall()
-
-    cur.close()
-    conn.close()
+    conn = get_conn()
+    with pooled_connection(conn):
+        cur = conn.cursor(dictionary=True)
+        cur.execute(sql, (
+            start.strftime("%Y-%m-%d %H:%M:%S"),
+            end.strftime("%Y-%m-%d %H:%M:%S"),
+            limit
+        ))
+        rows = cur.fetchall()
+        cur.close()
 
     return rows, window_date, start, end
 
@@ -142,6 +138,7 @@ def lambda_handler(event, context):
     # 1) DB에서 “KST 08시 윈도우” 요약 완료 기사 가져오기
     rows, date_str, start, end = fetch_kst_8am_window_summarized(limit=limit)
     rows = normalize_rows(rows)
+    print(f"[DB POOL] {pool_stats()}")
 
     # 2) 날짜별 스냅샷 파일(영구 누적)
     payload_daily = {
@@ -8,6 +8,8 @@ from datetime import datetime, timezone, timedelta
 import boto3
 import requests
 
+from llm_client import get_client
+
 # =========================================================
 # Clients / Const
 # =========================================================
@@ -16,7 +18,6 @@ KST = timezone(timedelta(hours=9))
 
 STABILITY_URL = "https://api.stability.ai/v2beta/stable-image/generate/core"
 STABILITY_BALANCE_URL = "https://api.stability.ai/v1/user/balance"
-OPENAI_URL = "https://api.openai.com/v1/chat/completions"
 
 # =========================================================
 # Utils
@@ -82,7 +83,7 @@ def assert_stability_credit_ok():
 # OpenAI Prompt
 # =========================================================
 def openai_make_prompt(title_kr: str, summary_kr: str) -> str:
-    api_key = _env("OPENAI_API_KEY", required=True)
+    _env("OPENAI_API_KEY", required=True)
     model = _env("OPENAI_MODEL", "gpt-4o-mini")
 
     system = (
@@ -120,22 +121,14 @@ Guidelines:
         "max_tokens": int(_env("OPENAI_MAX_TOKENS", "220")),
     }
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-
-    for attempt in range(3):
-        try:
-            r = requests.post(OPENAI_URL, headers=headers, json=payload, timeout=30)
-            if r.status_code != 200:
-                raise RuntimeError(f"[OPENAI_ERROR] {r.status_code}: {r.text[:300]}")
-            return r.json()["choices"][0]["message"]["content"].strip()[:1200]
-        except Exception as e:
-            print(f"[OPENAI] attempt={attempt+1} failed: {e}")
-            time.sleep(0.7 * (attempt + 1))
+    # keep-alive 세션 재사용 + 429/5xx는 Retry-After 따르는 지터 백오프 (llm_client)
+    try:
+        data = get_client().chat(payload)
+    except Exception as e:
+        print(f"[OPENAI] failed: {e}")
+        raise RuntimeError(f"OpenAI prompt failed: {e}")
 
-    raise RuntimeError("OpenAI prompt failed")
+    return data["choices"][0]["message"]["content"].strip()[:1200]
 
 # =========================================================
 # Stability Image Generation
@@ -215,6 +208,8 @@ def put_png_to_s3(bucket: str, key: str, png_bytes: bytes):
 # Lambda Handler
 # =========================================================
 def lambda_handler(event, context):
+    get_client().reset_stats()  # warm 컨테이너: LLM 통계는 이번 실행분만
+
     # 🔒 전체 실행 전에 크레딧 1회만 체크 (중복 호출 제거)
     credits = assert_stability_credit_ok()
     print(f"[CREDITS] Stability credits available: {credits}")
@@ -282,6 +277,7 @@ def lambda_handler(event, context):
                 "skipped_existing": skipped,
                 "count": len([r for r in results if r.get("s3_key") and not r.get("skipped")]),
                 "results": results,
+                "llm": get_client().stats(),
             },
             ensure_ascii=False,
         ),
@@ -0,0 +1,4 @@
+-- 001_news_articles_content_hash.sql
+-- 기사 내용 해시 컬럼 추가 (Lambda #1 bulk upsert에서 변경 없는 기사는 UPDATE 생략)
+ALTER TABLE news_articles
+  ADD COLUMN content_hash CHAR(64) NULL AFTER category;
@@ -0,0 +1,6 @@
+-- 002_news_articles_duplicate_of.sql
+-- 거의 같은 기사 묶음 표시 (Lambda #2가 대표 기사 id를 기록, Lambda #3 피드 export에서 제외)
+-- 기록: lambda2/db_module.py write_summary_batch (SummaryWriter가 요약 결과와 같은 트랜잭션으로 UPDATE)
+ALTER TABLE news_articles
+  ADD COLUMN duplicate_of BIGINT NULL AFTER content_hash,
+  ADD INDEX idx_news_articles_duplicate_of (duplicate_of);
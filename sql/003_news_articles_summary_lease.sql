@@ -0,0 +1,8 @@
+-- 003_news_articles_summary_lease.sql
+-- 요약 작업 큐 lease 컬럼 (Lambda #2 여러 개가 동시에 돌아도 같은 기사를 중복 요약하지 않게)
+-- - lease_owner: 기사를 가져간 워커 id
+-- - lease_expires_at: 이 시각이 지나도 요약 완료가 안 되면 (워커가 죽은 것으로 보고) 다른 워커가 다시 가져감
+ALTER TABLE news_articles
+  ADD COLUMN lease_owner VARCHAR(64) NULL AFTER is_summarized,
+  ADD COLUMN lease_expires_at DATETIME NULL AFTER lease_owner,
+  ADD INDEX idx_news_articles_summary_queue (is_summarized, lease_expires_at, id);
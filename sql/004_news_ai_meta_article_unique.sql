@@ -0,0 +1,5 @@
+-- 004_news_ai_meta_article_unique.sql
+-- 기사당 요약 1행 보장 (Lambda #2 배치 저장에서 INSERT ... ON DUPLICATE KEY UPDATE 로 재실행해도 중복 행이 안 생기게)
+-- ※ 이미 같은 article_id 행이 여러 개 있으면 먼저 정리한 뒤 적용
+ALTER TABLE news_ai_meta
+  ADD UNIQUE KEY uq_news_ai_meta_article_id (article_id);
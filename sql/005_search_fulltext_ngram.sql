@@ -0,0 +1,17 @@
+-- 005_search_fulltext_ngram.sql
+-- /search 용 FULLTEXT 인덱스 (ngram 파서: 한국어처럼 띄어쓰기만으로 단어를 못 나누는 텍스트용)
+-- - 테이블이 다르면 한 인덱스로 묶을 수 없어서 제목 / 요약+키워드 두 개로 생성
+-- - ngram 길이는 서버 변수 ngram_token_size (기본 2) → 1글자 검색어는 crud에서 LIKE로 처리
+-- - ngram 파서는 InnoDB 기본 불용어("a", "i", "en", "is", "to" ...)가 들어 있는 ngram을 통째로 버림
+--   → "AI"(ai), "OpenAI"(op, pe, en, na, ai) 같은 검색어가 0건이 되므로 불용어를 끄고 인덱스 생성
+--   (불용어 설정은 인덱스를 만들 때 값이 인덱스에 고정됨 → 같은 세션에서 ALTER 전에 SET)
+-- ※ 이미 불용어를 켠 채로 005를 적용했다면 두 인덱스를 DROP 한 뒤 이 파일을 다시 실행
+--   ALTER TABLE news_articles DROP INDEX ft_news_articles_title;
+--   ALTER TABLE news_ai_meta DROP INDEX ft_news_ai_meta_summary_keywords;
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+ALTER TABLE news_articles
+  ADD FULLTEXT INDEX ft_news_articles_title (title) WITH PARSER ngram;
+
+ALTER TABLE news_ai_meta
+  ADD FULLTEXT INDEX ft_news_ai_meta_summary_keywords (summary, keywords) WITH PARSER ngram;
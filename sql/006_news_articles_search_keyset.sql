@@ -0,0 +1,5 @@
+-- 006_news_articles_search_keyset.sql
+-- /search 커서 페이지네이션용 인덱스 (ORDER BY article_date DESC, id DESC + 커서 조건)
+-- - LIKE 검색이 인덱스 순서대로 읽다가 한 페이지(limit+1건)를 채우면 바로 멈춤 (전체 정렬 없음)
+ALTER TABLE news_articles
+  ADD INDEX idx_news_articles_search_keyset (is_summarized, article_date, id);
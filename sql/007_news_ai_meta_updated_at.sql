@@ -0,0 +1,10 @@
+-- 007_news_ai_meta_updated_at.sql
+-- 요약 행 변경 시각 (재요약으로 ON DUPLICATE KEY UPDATE 될 때도 id는 그대로라서 id만으로는 변경을 못 봄)
+-- - FastAPI 메모리 색인이 updated_at 워터마크 이후 행을 다시 읽어 재요약 반영
+-- - 검색 결과 캐시 데이터 버전에 MAX(updated_at) 사용
+-- ※ 기존 행은 created_at 값으로 채움
+ALTER TABLE news_ai_meta
+  ADD COLUMN updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+  ADD INDEX idx_news_ai_meta_updated_at (updated_at, id);
+
+UPDATE news_ai_meta SET updated_at = COALESCE(created_at, updated_at);
@@ -0,0 +1,19 @@
+-- 008_news_near_dup_signatures.sql
+-- 요약한 대표 기사의 MinHash 서명 + LSH 밴드 키 (lambda2/near_dup.py)
+-- - 라운드(SUMMARY_ROUND_SIZE) / 실행이 달라도 새로 가져간 기사를 이미 요약한 대표 기사와 비교
+--   → 거의 같으면 LLM 호출 없이 그 요약에 연결 (news_articles.duplicate_of = 기존 대표 id)
+-- - 기록: lambda2/db_module.py write_summary_batch (요약 결과와 같은 트랜잭션)
+-- - 조회: 밴드 키가 하나라도 같은 대표 기사 → 서명으로 유사도 확인
+-- ※ 적용 전에 요약된 기사는 서명이 없어서 비교 대상이 아님 (적용 전에는 라운드 안에서만 묶음)
+CREATE TABLE news_near_dup_signatures (
+  article_id BIGINT NOT NULL PRIMARY KEY,
+  signature VARBINARY(512) NOT NULL,
+  created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE news_near_dup_bands (
+  band_key BIGINT NOT NULL,
+  article_id BIGINT NOT NULL,
+  PRIMARY KEY (band_key, article_id),
+  INDEX idx_news_near_dup_bands_article_id (article_id)
+);